@@ -0,0 +1,235 @@
+# core_engine/admission.py
+from __future__ import annotations
+
+import contextvars
+import inspect
+import threading
+import time
+from contextlib import asynccontextmanager, contextmanager
+from functools import wraps
+from typing import Any, AsyncIterator, Callable, Dict, FrozenSet, Iterator, Tuple
+
+# 파이프라인 앞단 admission control / load shedding.
+# 단계(stage)마다 동시 실행 수(concurrency)와 대기열 길이(max_queue)를 두고,
+# 한도를 넘는 요청은 스레드를 쌓지 않고 즉시 Rejected(retry_after) 로 돌려보낸다.
+
+# stage -> (concurrency, max_queue)
+DEFAULT_LIMITS: Dict[str, Tuple[int, int]] = {
+    "run": (4, 16),
+    "qmand": (8, 32),
+    "qgen": (8, 32),
+    "stratos": (8, 32),
+    "export": (2, 8),
+}
+DEFAULT_MAX_WAIT = 5.0  # 대기열에서 기다리는 최대 시간(초)
+
+# 지금 실행 흐름(스레드/asyncio 태스크)이 이미 잡고 있는 게이트.
+# 같은 게이트를 다시 만나면(HTTP /run 게이트 → run_once) 슬롯을 두 번 잡지 않고 통과한다.
+_HELD: contextvars.ContextVar[FrozenSet[int]] = contextvars.ContextVar("kai_admission_held", default=frozenset())
+
+
+class Rejected(Exception):
+    def __init__(self, stage: str, reason: str, retry_after: float):
+        super().__init__(f"[{stage}] rejected: {reason} (retry after {retry_after:.1f}s)")
+        self.stage = stage
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class StageGate:
+    def __init__(self, name: str, concurrency: int, max_queue: int, max_wait: float = DEFAULT_MAX_WAIT):
+        self.name = name
+        self.concurrency = max(1, int(concurrency))
+        self.max_queue = max(0, int(max_queue))
+        self.max_wait = max_wait
+        self._sem = threading.BoundedSemaphore(self.concurrency)
+        self._lock = threading.Lock()
+        self.active = 0
+        self.waiting = 0
+        self.admitted = 0
+        self.rejected = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+        self._service_ewma = 0.0  # 평균 처리 시간 추정 (retry-after 힌트용)
+
+    def _retry_after(self) -> float:
+        per_slot = self._service_ewma or 1.0
+        return round(max(1.0, per_slot * (self.waiting + 1) / self.concurrency), 1)
+
+    def _reject(self, reason: str) -> Rejected:
+        with self._lock:
+            self.rejected += 1
+            return Rejected(self.name, reason, self._retry_after())
+
+    def _enqueue(self) -> None:
+        with self._lock:
+            full = self.waiting >= self.max_queue
+            if not full:
+                self.waiting += 1
+        if full:
+            raise self._reject("queue full")
+
+    def _dequeue(self, ok: bool) -> None:
+        with self._lock:
+            self.waiting -= 1
+        if not ok:
+            raise self._reject("queue wait timeout")
+
+    def _enter(self, waited: float) -> float:
+        with self._lock:
+            self.active += 1
+            self.admitted += 1
+            self.wait_total += waited
+            self.wait_max = max(self.wait_max, waited)
+        return time.perf_counter()
+
+    def _exit(self, t1: float) -> None:
+        took = time.perf_counter() - t1
+        with self._lock:
+            self.active -= 1
+            a = 0.2
+            self._service_ewma = took if not self._service_ewma else (a * took + (1 - a) * self._service_ewma)
+        self._sem.release()
+
+    @contextmanager
+    def admit(self) -> Iterator[None]:
+        held = _HELD.get()
+        if id(self) in held:  # 바깥에서 이미 이 게이트를 통과함
+            yield
+            return
+        # 빈 슬롯이 있으면 바로 통과
+        if self._sem.acquire(blocking=False):
+            waited = 0.0
+        else:
+            self._enqueue()
+            t0 = time.perf_counter()
+            ok = self._sem.acquire(timeout=self.max_wait)
+            waited = time.perf_counter() - t0
+            self._dequeue(ok)
+
+        t1 = self._enter(waited)
+        token = _HELD.set(held | {id(self)})
+        try:
+            yield
+        finally:
+            _HELD.reset(token)
+            self._exit(t1)
+
+    @asynccontextmanager
+    async def aadmit(self) -> AsyncIterator[None]:
+        """admit 의 async 판. 대기는 스레드에서 하므로 이벤트 루프를 막지 않는다."""
+        import asyncio  # CLI 시작 경로에서 asyncio 를 읽지 않도록 지연
+
+        held = _HELD.get()
+        if id(self) in held:
+            yield
+            return
+        if self._sem.acquire(blocking=False):
+            waited = 0.0
+        else:
+            self._enqueue()
+            t0 = time.perf_counter()
+            fut = asyncio.get_running_loop().run_in_executor(None, lambda: self._sem.acquire(timeout=self.max_wait))
+            try:
+                ok = await asyncio.shield(fut)
+            except asyncio.CancelledError:
+                # 스레드 쪽 acquire 는 취소되지 않으므로, 나중에 잡히면 바로 돌려준다
+                fut.add_done_callback(lambda f: f.cancelled() or f.exception() or not f.result() or self._sem.release())
+                with self._lock:
+                    self.waiting -= 1
+                raise
+            waited = time.perf_counter() - t0
+            self._dequeue(ok)
+
+        t1 = self._enter(waited)
+        token = _HELD.set(held | {id(self)})
+        try:
+            yield
+        finally:
+            _HELD.reset(token)
+            self._exit(t1)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "concurrency": self.concurrency,
+                "max_queue": self.max_queue,
+                "active": self.active,
+                "queue_depth": self.waiting,
+                "admitted": self.admitted,
+                "rejected": self.rejected,
+                "wait_avg_ms": round(self.wait_total / self.admitted * 1000, 2) if self.admitted else 0.0,
+                "wait_max_ms": round(self.wait_max * 1000, 2),
+            }
+
+
+class AdmissionController:
+    def __init__(self, limits: Dict[str, Tuple[int, int]] | None = None, max_wait: float = DEFAULT_MAX_WAIT):
+        merged = dict(DEFAULT_LIMITS)
+        merged.update(limits or {})
+        self.gates: Dict[str, StageGate] = {
+            name: StageGate(name, c, q, max_wait) for name, (c, q) in merged.items()
+        }
+
+    def gate(self, stage: str) -> StageGate:
+        g = self.gates.get(stage)
+        if g is None:
+            raise KeyError(f"unknown admission stage: {stage}")
+        return g
+
+    def admit(self, stage: str):
+        return self.gate(stage).admit()
+
+    def aadmit(self, stage: str):
+        return self.gate(stage).aadmit()
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        return {name: g.stats() for name, g in self.gates.items()}
+
+
+def parse_limits(spec: str) -> Dict[str, Tuple[int, int]]:
+    """'run=4:16,qmand=8' -> {"run": (4, 16), "qmand": (8, 8*4)}"""
+    out: Dict[str, Tuple[int, int]] = {}
+    for part in (spec or "").split(","):
+        part = part.strip()
+        if not part:
+            continue
+        name, _, val = part.partition("=")
+        conc, _, queue = val.partition(":")
+        c = int(conc)
+        out[name.strip()] = (c, int(queue) if queue else c * 4)
+    return out
+
+
+CONTROLLER = AdmissionController()
+
+
+def configure(limits: Dict[str, Tuple[int, int]] | None = None, max_wait: float = DEFAULT_MAX_WAIT) -> AdmissionController:
+    """프로세스 기본 컨트롤러 교체 (서비스 시작 시)"""
+    global CONTROLLER
+    CONTROLLER = AdmissionController(limits, max_wait)
+    return CONTROLLER
+
+
+def admitted(stage: str) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+    """
+    함수 호출을 기본 컨트롤러의 stage 게이트 뒤에 둔다 (호출 시점의 CONTROLLER — configure() 뒤에도 유효).
+    코루틴 함수면 aadmit 으로 감싼다. 게이트 없는 원본은 fn.__wrapped__.
+    """
+    def deco(fn: Callable[..., Any]) -> Callable[..., Any]:
+        if inspect.iscoroutinefunction(fn):
+            @wraps(fn)
+            async def awrapper(*args: Any, **kwargs: Any) -> Any:
+                async with CONTROLLER.aadmit(stage):
+                    return await fn(*args, **kwargs)
+            return awrapper
+
+        @wraps(fn)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            with CONTROLLER.admit(stage):
+                return fn(*args, **kwargs)
+        return wrapper
+    return deco
+
+
+__all__ = ["AdmissionController", "StageGate", "Rejected", "CONTROLLER", "configure", "admitted", "parse_limits", "DEFAULT_LIMITS"]
@@ -0,0 +1,193 @@
+# core_engine/aio.py
+from __future__ import annotations
+
+import asyncio
+import functools
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Tuple, TypeVar
+
+from core_engine.admission import admitted
+from core_engine.deadline import Deadline
+
+# 비동기 파이프라인 API.
+# 이벤트 루프 하나로 수백 개의 전략 요청을 동시에 돌릴 수 있도록,
+# 블로킹 파일 I/O(config 로드, trace/출력 JSON, 리포트 파일)는 크기 제한 스레드 풀(IO_EXECUTOR)로 넘기고
+# 디스크를 안 타는 계산(QMAND 라우팅, QGEN 템플릿, STRATOS 휴리스틱)은 루프에서 바로 실행한다.
+# 동기 API(run_qmand_pipeline, run_once 등)는 그대로 두며, 같은 본체 함수를 공유한다.
+#
+#   strategy, evaluation, out_dir = await arun_once("finsetreport", "성장 전략")
+#   paths = await aexport_reports(strategy, evaluation, out_dir, "all")
+
+T = TypeVar("T")
+
+IO_THREADS = int(os.environ.get("KAI_IO_THREADS") or 32)
+IO_EXECUTOR = ThreadPoolExecutor(max_workers=IO_THREADS, thread_name_prefix="kai_io")
+
+
+async def run_io(fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """블로킹 함수를 IO_EXECUTOR 에서 실행하고 결과를 await. 풀이 차 있으면 풀 대기열에서 순서를 기다린다."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(IO_EXECUTOR, functools.partial(fn, *args, **kwargs))
+
+
+# ---------- 엔진 ----------
+@admitted("qmand")
+async def arun_qmand_pipeline(
+    domain: str,
+    user_input: Any,
+    *,
+    language: str = "ko-KR",
+    cfg: Dict[str, Any] | None = None,
+    routing: Any = None,
+    deadline: Deadline | None = None,
+) -> Dict[str, Any]:
+    from core_engine.qmand_engine import build_qmand_payload, load_domain_config, write_qmand_trace
+
+    if cfg is None:
+        cfg = await run_io(load_domain_config, domain)
+    payload = build_qmand_payload(domain, user_input, cfg, language=language, routing=routing)
+    await run_io(write_qmand_trace, payload, deadline)
+    return payload
+
+
+async def arun_qgen_pipeline(
+    domain: str,
+    qmand_or_text: Dict[str, Any] | str,
+    *,
+    cfg: Dict[str, Any] | None = None,
+    deadline: Deadline | None = None,
+) -> Dict[str, Any]:
+    from core_engine.qgen_engine import _load_domain_config, run_qgen_pipeline
+
+    if cfg is None:
+        cfg = await run_io(_load_domain_config, domain)
+    return run_qgen_pipeline(domain, qmand_or_text, cfg=cfg, deadline=deadline)
+
+
+async def aevaluate_strategy(domain: str, strategy: Any, *, cfg: Dict[str, Any] | None = None,
+                             deadline: Deadline | None = None) -> Any:
+    from core_engine.stratos_evaluator import _load_domain_config, evaluate_strategy
+
+    if cfg is None:
+        cfg = await run_io(_load_domain_config, domain)
+    return evaluate_strategy(domain, strategy, cfg=cfg, deadline=deadline)
+
+
+async def asave_strategy(domain: str, strategy: Any, evaluation: Any, base_dir: str = "output", *,
+                         out_dir: str | None = None, quiet: bool = False,
+                         deadline: Deadline | None = None) -> str:
+    from core_engine.save_strategy import save_strategy
+
+    return await run_io(save_strategy, domain, strategy, evaluation, base_dir,
+                        out_dir=out_dir, quiet=quiet, deadline=deadline)
+
+
+# ---------- export ----------
+async def aexport_report(fmt: str, strategy: Any, evaluation: Any, out_dir: str, **kwargs: Any) -> str:
+    """포맷 하나 내보내기. 백엔드 로드(reportlab 임포트 포함)와 렌더링/쓰기 모두 IO_EXECUTOR 에서."""
+    from tools.export_report import get_exporter
+
+    def _export() -> str:
+        return get_exporter(fmt)(strategy, evaluation, out_dir, **kwargs)
+
+    return await run_io(_export)
+
+
+async def aexport_reports(strategy: Any, evaluation: Any, out_dir: str, export: str | None,
+                          **kwargs: Any) -> List[str]:
+    """선택된 포맷들을 동시에 내보내고 생성된 경로 목록 반환 (건너뛴 포맷 제외, 포맷 순서 유지)."""
+    from core_engine.pipeline import export_formats
+
+    paths = await asyncio.gather(*(aexport_report(fmt, strategy, evaluation, out_dir, **kwargs)
+                                   for fmt in export_formats(export)))
+    return [p for p in paths if p]
+
+
+# ---------- 파이프라인 ----------
+@admitted("run")
+async def arun_once(
+    domain: str,
+    user_input: str,
+    *,
+    cfg: Dict[str, Any] | None = None,
+    out_dir: str | None = None,
+    quiet: bool = False,
+    deadline: Deadline | None = None,
+) -> Tuple[Dict[str, Any], Any, str]:
+    """QGEN → STRATOS → SAVE (run_once 의 async 판, 같은 "run" 게이트)"""
+    strategy = await arun_qgen_pipeline(domain, user_input, cfg=cfg, deadline=deadline)
+    evaluation = await aevaluate_strategy(domain, strategy, cfg=cfg, deadline=deadline)
+    out_dir = await asave_strategy(domain, strategy, evaluation, out_dir=out_dir, quiet=quiet, deadline=deadline)
+    return strategy, evaluation, out_dir
+
+
+async def aiter_stages(
+    domain: str,
+    user_input: str,
+    *,
+    cfg: Dict[str, Any] | None = None,
+    routing: Any = None,
+    export: str | None = None,
+    out_dir: str | None = None,
+    quiet: bool = True,
+    deadline: Deadline | None = None,
+) -> AsyncIterator[Dict[str, Any]]:
+    """iter_stages 의 async 판. 이벤트 형식 동일."""
+    from core_engine.pipeline import export_formats
+    from core_engine.save_strategy import _to_jsonable
+
+    t0 = time.perf_counter()
+
+    def _ev(event: str, data: Any) -> Dict[str, Any]:
+        return {"event": event, "data": data, "elapsed_ms": round((time.perf_counter() - t0) * 1000, 1)}
+
+    qmand = await arun_qmand_pipeline(domain, user_input, cfg=cfg, routing=routing, deadline=deadline)
+    yield _ev("qmand", qmand)
+    strategy = await arun_qgen_pipeline(domain, qmand, cfg=cfg, deadline=deadline)
+    yield _ev("qgen", strategy)
+    evaluation = await aevaluate_strategy(domain, strategy, cfg=cfg, deadline=deadline)
+    yield _ev("stratos", _to_jsonable(evaluation))
+    out_dir = await asave_strategy(domain, strategy, evaluation, out_dir=out_dir, quiet=quiet, deadline=deadline)
+    yield _ev("save", {"out_dir": out_dir})
+    for fmt in export_formats(export):
+        path = await aexport_report(fmt, strategy, evaluation, out_dir, quiet=quiet, deadline=deadline)
+        if path:
+            yield _ev("export", {"format": fmt, "path": path})
+        else:
+            yield _ev("export", {"format": fmt, "path": None, "skipped": "deadline"})
+    yield _ev("done", {"out_dir": out_dir})
+
+
+async def arun_many(requests: List[Dict[str, Any]], *, export: Optional[str] = None,
+                    concurrency: int = 256, quiet: bool = True) -> List[Dict[str, Any]]:
+    """
+    [{"domain", "input", "out_dir"?, "deadline_s"?}, ...] 을 한 이벤트 루프에서 동시에 실행.
+    concurrency 는 동시에 진행 중인 요청 수 상한. 입력 순서대로 결과(또는 error) 반환.
+    호출자가 concurrency 로 직접 묶는 배치 API 라 "run" 게이트는 거치지 않는다 (arun_once.__wrapped__).
+    """
+    sem = asyncio.Semaphore(max(1, concurrency))
+
+    async def _one(req: Dict[str, Any]) -> Dict[str, Any]:
+        async with sem:
+            deadline = Deadline(req["deadline_s"]) if req.get("deadline_s") is not None else None
+            try:
+                strategy, evaluation, out_dir = await arun_once.__wrapped__(
+                    req["domain"], req["input"], cfg=req.get("cfg"), out_dir=req.get("out_dir"),
+                    quiet=quiet, deadline=deadline,
+                )
+                exports = await aexport_reports(strategy, evaluation, out_dir, export, quiet=quiet, deadline=deadline)
+                return {"status": "ok", "strategy": strategy, "evaluation": evaluation,
+                        "out_dir": out_dir, "exports": exports}
+            except Exception as e:
+                return {"status": "error", "error": f"{type(e).__name__}: {e}"}
+
+    return list(await asyncio.gather(*(_one(r) for r in requests)))
+
+
+__all__ = [
+    "IO_EXECUTOR", "run_io",
+    "arun_qmand_pipeline", "arun_qgen_pipeline", "aevaluate_strategy", "asave_strategy",
+    "aexport_report", "aexport_reports", "arun_once", "aiter_stages", "arun_many",
+]
@@ -0,0 +1,238 @@
+# core_engine/batch_runner.py
+from __future__ import annotations
+
+import json
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from uuid import uuid4
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from core_engine.deadline import Deadline
+
+# 워커 프로세스별 상태 (initializer 에서 한 번만 채움).
+# 도메인 config 는 여기 두지 않고 항목마다 domain_registry 에서 읽는다 (버전별 캐시라 싸고,
+# 상주 워커(job_queue work_loop)도 save_domain_config 뒤 새 config 로 돈다).
+_WORKER_READY = False
+_WORKER_EXPORT: Optional[str] = None
+
+
+# ------------------------------------------------------------
+# 입력 로드
+# ------------------------------------------------------------
+def _item_from_record(rec: Any, default_domain: str, fallback_id: str) -> Dict[str, Any]:
+    if isinstance(rec, dict):
+        text = rec.get("input") or rec.get("user_input") or rec.get("text") or ""
+        return {
+            "id": str(rec.get("id") or fallback_id),
+            "domain": rec.get("domain") or default_domain,
+            "input": str(text).strip(),
+        }
+    return {"id": fallback_id, "domain": default_domain, "input": str(rec).strip()}
+
+
+def load_batch_inputs(path: str, default_domain: str) -> List[Dict[str, Any]]:
+    """
+    배치 입력 로드:
+    - 디렉터리: *.txt 파일 하나당 입력 하나 (id = 파일명 stem, 이름순)
+    - JSONL: 한 줄당 문자열 또는 {"id","domain","input"|"user_input"|"text"}
+    """
+    p = Path(path)
+    if not p.exists():
+        raise FileNotFoundError(f"batch input not found: {p}")
+
+    items: List[Dict[str, Any]] = []
+    if p.is_dir():
+        for f in sorted(p.glob("*.txt")):
+            items.append(_item_from_record(f.read_text(encoding="utf-8"), default_domain, f.stem))
+        return items
+
+    with p.open("r", encoding="utf-8") as f:
+        for lineno, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                rec = json.loads(line)
+            except json.JSONDecodeError as e:
+                raise ValueError(f"{p}:{lineno}: invalid JSON ({e})")
+            items.append(_item_from_record(rec, default_domain, f"line{lineno}"))
+    return items
+
+
+# ------------------------------------------------------------
+# 워커
+# ------------------------------------------------------------
+def _worker_cfg(domain: str) -> Optional[Dict[str, Any]]:
+    """도메인 현재 config (domain_registry 캐시). 없거나 검증 실패면 None: 엔진이 직접 읽고 기본값으로 폴백"""
+    from core_engine import domain_registry
+    try:
+        return domain_registry.get(domain).cfg
+    except (FileNotFoundError, RuntimeError):
+        return None
+
+
+def _init_worker(domains: List[str], export: Optional[str]) -> None:
+    """워커 시작 시 1회: 도메인 config 워밍 + 무거운 모듈 임포트"""
+    global _WORKER_EXPORT, _WORKER_READY
+    from core_engine import rate_limit
+    rate_limit.set_default_priority(rate_limit.BATCH)  # provider 한도 대기열에서 대화형 요청보다 뒤로
+    import core_engine.pipeline  # noqa: F401  (pydantic/스키마 임포트 워밍)
+
+    for d in domains:
+        _worker_cfg(d)
+    _WORKER_EXPORT = export
+    _WORKER_READY = True
+    from core_engine.pipeline import export_formats
+    from tools.export_report import get_exporter
+    for fmt in export_formats(export):
+        get_exporter(fmt)  # 쓰는 백엔드만 미리 로드
+
+
+def _safe_name(s: str) -> str:
+    return re.sub(r"[^0-9A-Za-z_.-]+", "_", s)[:40] or "item"
+
+
+def _run_item(job: Dict[str, Any]) -> Dict[str, Any]:
+    from core_engine.pipeline import run_once, export_reports
+
+    domain = job["domain"]
+    out_dir = job["out_dir"]
+    rec: Dict[str, Any] = {
+        "index": job["index"],
+        "id": job["id"],
+        "domain": domain,
+        "input": job["input"],
+        "out_dir": out_dir,
+    }
+    t0 = time.perf_counter()
+    deadline = Deadline(job["deadline_s"]) if job.get("deadline_s") is not None else None
+    try:
+        if not _WORKER_READY:
+            _init_worker([domain], _WORKER_EXPORT)
+        strategy, evaluation, out_dir = run_once(
+            domain, job["input"], cfg=_worker_cfg(domain), out_dir=out_dir, quiet=True, deadline=deadline
+        )
+        export = job["export"] if "export" in job else _WORKER_EXPORT
+        rec["exports"] = export_reports(strategy, evaluation, out_dir, export, quiet=True, deadline=deadline)
+        rec["title"] = strategy.get("title", "")
+        rec["score"] = getattr(evaluation, "score", None)
+        rec["status"] = "ok"
+    except Exception as e:
+        rec["status"] = "error"
+        rec["error"] = f"{type(e).__name__}: {e}"
+    rec["elapsed_ms"] = round((time.perf_counter() - t0) * 1000, 1)
+    return rec
+
+
+# ------------------------------------------------------------
+# 배치 실행
+# ------------------------------------------------------------
+def _iter_results(jobs: List[Dict[str, Any]], domains: List[str], export: Optional[str],
+                  workers: int) -> Iterator[Dict[str, Any]]:
+    if workers <= 1:
+        _init_worker(domains, export)
+        for job in jobs:
+            yield _run_item(job)
+        return
+    chunk = max(1, len(jobs) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(domains, export)) as pool:
+        # map 은 입력 순서대로 결과를 돌려준다
+        yield from pool.map(_run_item, jobs, chunksize=chunk)
+
+
+def _iter_pipelined(jobs: List[Dict[str, Any]], domains: List[str], export: Optional[str],
+                    stages: Dict[str, Tuple[int, int]]) -> Iterator[Dict[str, Any]]:
+    """
+    단계 파이프라인으로 실행: qgen → stratos → save 는 이 프로세스의 스레드, export 는 프로세스 풀.
+    항목 N 의 export 와 항목 N+1 의 생성이 겹친다. 결과는 입력 순서대로.
+    """
+    from core_engine.stage_pipeline import StagePipeline, kai_stages
+
+    _init_worker(domains, None)  # 생성 단계용 config 만 (export 백엔드는 export 프로세스에서 로드)
+    pipe = StagePipeline(kai_stages(stages, export_processes=bool(export)),
+                         process_initializer=_init_worker, initargs=([], export))
+    items = ({**j, "cfg": _worker_cfg(j["domain"]), "export": export, "t0": time.perf_counter()} for j in jobs)
+    with pipe:
+        for item in pipe.map(items):
+            rec: Dict[str, Any] = {k: item[k] for k in ("index", "id", "domain", "input", "out_dir")}
+            if "error" in item:
+                rec["status"] = "error"
+                rec["error"] = item["error"]
+                rec["failed_stage"] = item.get("failed_stage")
+            else:
+                rec["exports"] = item.get("exports", [])
+                rec["title"] = item["strategy"].get("title", "")
+                rec["score"] = getattr(item["evaluation"], "score", None)
+                rec["status"] = "ok"
+            rec["stage_ms"] = item.get("stage_ms", {})
+            rec["elapsed_ms"] = round((time.perf_counter() - item["t0"]) * 1000, 1)
+            yield rec
+
+
+def run_batch(
+    items: List[Dict[str, Any]],
+    *,
+    export: Optional[str] = None,
+    workers: Optional[int] = None,
+    base_dir: str = "output",
+    quiet: bool = False,
+    deadline_s: Optional[float] = None,
+    stages: Optional[Dict[str, Tuple[int, int]]] = None,
+) -> str:
+    """
+    items 를 워커 풀에서 run_once(+export) 실행. deadline_s 는 항목당 시간 예산.
+    stages 를 주면 단계 파이프라인으로 실행 ({단계: (워커 수, 큐 크기)}, 빈 dict 는 기본값).
+    결과는 <base_dir>/batch_<ts>_<id>/results.jsonl 에 입력 순서대로, 요약은 manifest.json 에 기록.
+    배치 디렉터리 경로 반환.
+    """
+    workers = workers or os.cpu_count() or 1
+    # 같은 초에 시작한 배치끼리 results.jsonl/manifest 를 덮어쓰지 않도록 짧은 ID 부착 (service._request_out_dir 와 같은 방식)
+    batch_dir = os.path.join(base_dir, f"batch_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{uuid4().hex[:6]}")
+    os.makedirs(batch_dir, exist_ok=False)
+
+    jobs = [
+        {**it, "index": i, "deadline_s": deadline_s,
+         "out_dir": os.path.join(batch_dir, f"{i:05d}_{_safe_name(it['id'])}")}
+        for i, it in enumerate(items)
+    ]
+    domains = sorted({j["domain"] for j in jobs})
+
+    started = datetime.now().isoformat(timespec="seconds")
+    t0 = time.perf_counter()
+    counts = {"ok": 0, "error": 0}
+    results_path = os.path.join(batch_dir, "results.jsonl")
+    with open(results_path, "w", encoding="utf-8") as f:
+        results = (_iter_pipelined(jobs, domains, export, stages) if stages is not None
+                   else _iter_results(jobs, domains, export, workers))
+        for rec in results:
+            counts[rec["status"]] += 1
+            f.write(json.dumps(rec, ensure_ascii=False) + "\n")
+            if not quiet:
+                mark = "✓" if rec["status"] == "ok" else "✗"
+                print(f"  {mark} [{rec['index']:05d}] {rec['id']} ({rec['elapsed_ms']}ms)")
+
+    manifest = {
+        "started_at": started,
+        "elapsed_s": round(time.perf_counter() - t0, 3),
+        "workers": workers,
+        "mode": "pipelined" if stages is not None else "pool",
+        "stages": stages,
+        "export": export,
+        "deadline_s": deadline_s,
+        "domains": domains,
+        "total": len(jobs),
+        "ok": counts["ok"],
+        "error": counts["error"],
+        "results": "results.jsonl",
+    }
+    with open(os.path.join(batch_dir, "manifest.json"), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    return batch_dir
+
+
+__all__ = ["load_batch_inputs", "run_batch"]
@@ -0,0 +1,155 @@
+# core_engine/config_cache.py
+from __future__ import annotations
+
+import os
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from core_engine import config_snapshot
+
+# 도메인 config 공용 로더/캐시. QMAND/QGEN/STRATOS 엔진과 서비스/워커가 모두 이것을 쓴다.
+# 경로는 프로젝트 루트 기준(CWD 무관). 도메인당 한 번만 YAML 을 파싱하고,
+# 파일 inode/mtime/size 가 바뀌면 다음 조회 때 다시 읽는다 (재시작 없이 hot-reload).
+# 파싱은 내용 해시가 맞는 바이너리 스냅샷(config_snapshot)이 있으면 그것을, 없으면 YAML 을 읽고
+# 스냅샷을 새로 쓴다 (PyYAML 은 폴백일 때만 임포트).
+# stats() 로 hit / load / reload / missing / snapshot 횟수를 볼 수 있다.
+
+_ROOT = Path(__file__).resolve().parent.parent
+_LOCK = threading.Lock()
+_ENTRIES: Dict[str, "_Entry"] = {}
+_STATS: Dict[str, int] = {"hits": 0, "loads": 0, "reloads": 0, "missing": 0, "snapshot": 0, "yaml": 0}
+
+
+def _count(key: str) -> None:
+    with _LOCK:
+        _STATS[key] += 1
+
+
+class _Entry:
+    __slots__ = ("path", "stamp", "cfg", "version", "digest", "derived")
+
+    def __init__(self, path: Path, stamp: tuple, cfg: Dict[str, Any], version: int, digest: str):
+        self.path = path
+        self.stamp = stamp
+        self.cfg = cfg
+        self.version = version
+        self.digest = digest  # config.yaml 내용 sha256
+        self.derived: Dict[str, Any] = {}
+
+
+def config_path(domain: str) -> Path:
+    return _ROOT / "domains" / domain / "config.yaml"
+
+
+def list_domains() -> List[str]:
+    base = _ROOT / "domains"
+    if not base.is_dir():
+        return []
+    return sorted(p.name for p in base.iterdir() if (p / "config.yaml").is_file())
+
+
+def _fstamp(st: os.stat_result) -> tuple:
+    return (st.st_ino, st.st_mtime_ns, st.st_size)
+
+
+def _stamp(p: Path) -> tuple:
+    return _fstamp(p.stat())
+
+
+def _parse(domain: str, raw: bytes, digest: str) -> Dict[str, Any]:
+    # _LOCK 안에서 호출
+    cfg = config_snapshot.load_snapshot(domain, digest)
+    if cfg is not None:
+        _STATS["snapshot"] += 1
+        return cfg
+    import yaml
+    cfg = yaml.safe_load(raw) or {}
+    _STATS["yaml"] += 1
+    try:
+        config_snapshot.write_snapshot(domain, digest, cfg)
+    except (RuntimeError, OSError):
+        pass  # 검증 실패/쓰기 불가: 스냅샷 없이 계속 (다음에도 YAML)
+    return cfg
+
+
+def _get_entry(domain: str) -> _Entry:
+    p = config_path(domain)
+    try:
+        stamp = _stamp(p)
+    except FileNotFoundError:
+        _count("missing")
+        raise FileNotFoundError(f"config not found: {p}")
+    e = _ENTRIES.get(domain)
+    if e is not None and e.stamp == stamp:
+        _count("hits")
+        return e
+    with _LOCK:
+        e = _ENTRIES.get(domain)
+        if e is not None and e.stamp == stamp:
+            _STATS["hits"] += 1
+            return e
+        # stamp 는 읽은 바로 그 파일에서 (config_store 는 rename 으로 교체하므로 열린 파일은 한 버전 전체)
+        with p.open("rb") as f:
+            stamp = _fstamp(os.fstat(f.fileno()))
+            raw = f.read()
+        digest = config_snapshot.content_hash(raw)
+        cfg = _parse(domain, raw, digest)
+        _STATS["reloads" if e is not None else "loads"] += 1
+        version = (e.version + 1) if e is not None else 1
+        e = _Entry(p, stamp, cfg, version, digest)
+        _ENTRIES[domain] = e
+        return e
+
+
+def get_domain_config(domain: str) -> Dict[str, Any]:
+    """캐시된 도메인 config. 파일이 바뀌었으면 다시 읽고, 없으면 FileNotFoundError. (반환 dict 는 수정하지 말 것)"""
+    return _get_entry(domain).cfg
+
+
+def load_or_default(domain: str, default: Callable[[str], Dict[str, Any]]) -> Dict[str, Any]:
+    """get_domain_config, 파일이 없으면 default(domain) (엔진별 폴백)"""
+    try:
+        return _get_entry(domain).cfg
+    except FileNotFoundError:
+        return default(domain)
+
+
+def get_derived(domain: str, key: str, build: Callable[[Dict[str, Any]], Any]) -> Any:
+    """config 에서 파생된 값(컴파일된 키워드 등)을 config 버전 단위로 캐시."""
+    e = _get_entry(domain)
+    if key not in e.derived:
+        e.derived[key] = build(e.cfg)
+    return e.derived[key]
+
+
+def config_version(domain: str) -> int:
+    """현재 캐시된 config 의 버전 (파일이 바뀌어 다시 읽을 때마다 +1)"""
+    return _get_entry(domain).version
+
+
+def cache_info() -> Dict[str, Any]:
+    return {
+        d: {"path": str(e.path), "version": e.version, "sha256": e.digest[:16], "derived": sorted(e.derived)}
+        for d, e in _ENTRIES.items()
+    }
+
+
+def stats() -> Dict[str, int]:
+    """
+    조회 카운터: hits(캐시 그대로), loads(첫 파싱), reloads(파일 변경으로 재파싱), missing(파일 없음),
+    snapshot / yaml (파싱 시 스냅샷을 썼는지, YAML 로 폴백했는지)
+    """
+    with _LOCK:
+        return dict(_STATS)
+
+
+def clear(domain: Optional[str] = None) -> None:
+    with _LOCK:
+        if domain is None:
+            _ENTRIES.clear()
+        else:
+            _ENTRIES.pop(domain, None)
+
+
+__all__ = ["get_domain_config", "load_or_default", "get_derived", "config_version", "stats", "list_domains", "config_path", "cache_info", "clear"]
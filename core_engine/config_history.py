@@ -0,0 +1,242 @@
+# core_engine/config_history.py
+from __future__ import annotations
+
+import bisect
+import hashlib
+import json
+import os
+import re
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+from core_engine import config_cache
+
+# 도메인 config 이력 저장소.
+#   domains/<domain>/config_history/blobs/<sha256>.yaml   내용 주소 blob (같은 내용은 한 번만 저장)
+#   domains/<domain>/config_history/index.jsonl           시각 순: {ts, epoch, version, hash, weights_delta}
+# blob 해시는 config_version 을 뺀 내용으로 계산한다 (가중치가 그대로면 버전만 올라도 새 blob 없음).
+# weights_delta 는 바로 앞 시각 항목 대비 변화 (지워진 키는 null). 보통은 끝에 append 하고,
+# 과거 시각을 끼워 넣을 때(migrate_legacy)만 바로 뒤 항목의 delta 를 다시 계산해 인덱스를 통째로 다시 쓴다.
+# 조회는 인덱스를 한 번 읽어(파일 크기/mtime 이 바뀌면 다시) 시각 배열에 이분 탐색 → O(log n), 버전은 dict.
+# (config_version 은 시각 순으로 단조롭지 않다: 마이그레이션된 예전 복사본은 모두 0)
+#   config_at("finsetreport", "2025-08-10T07:25:00Z")   그 시각에 유효하던 config
+#   weights_at("finsetreport", when) / entry_at_version(domain, 3)
+
+When = Union[str, float, int, datetime]
+
+_LEGACY_RE = re.compile(r"^config_(\d{8}_\d{6})\.yaml$")
+_LOCK = threading.Lock()
+_INDEX_CACHE: Dict[str, "_Index"] = {}
+_BLOB_CACHE: Dict[str, Dict[str, Any]] = {}
+
+
+def history_dir(domain: str) -> Path:
+    return config_cache.config_path(domain).parent / "config_history"
+
+
+def _index_path(domain: str) -> Path:
+    return history_dir(domain) / "index.jsonl"
+
+
+def _blob_path(domain: str, digest: str) -> Path:
+    return history_dir(domain) / "blobs" / f"{digest}.yaml"
+
+
+def _epoch(when: When) -> float:
+    if isinstance(when, (int, float)):
+        return float(when)
+    if isinstance(when, str):
+        when = datetime.fromisoformat(when.replace("Z", "+00:00"))
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return when.timestamp()
+
+
+def _iso(epoch: float) -> str:
+    return datetime.fromtimestamp(epoch, timezone.utc).isoformat(timespec="seconds").replace("+00:00", "Z")
+
+
+def _blob_bytes(cfg: Dict[str, Any]) -> bytes:
+    import yaml
+    body = {k: v for k, v in cfg.items() if k != "config_version"}
+    return yaml.safe_dump(body, allow_unicode=True, sort_keys=False).encode("utf-8")
+
+
+def _weights(cfg: Dict[str, Any]) -> Dict[str, float]:
+    return {k: float(v) for k, v in (cfg.get("stratos_weights") or {}).items()}
+
+
+# ---------- 인덱스 ----------
+def _delta(prev: Dict[str, float], cur: Dict[str, float]) -> Dict[str, Optional[float]]:
+    """prev -> cur 변화. 지워진 키는 None (tombstone)"""
+    out: Dict[str, Optional[float]] = {k: v for k, v in cur.items() if prev.get(k) != v}
+    out.update({k: None for k in prev if k not in cur})
+    return out
+
+
+class _Index:
+    __slots__ = ("stamp", "entries", "epochs", "by_version", "weights")
+
+    def __init__(self, stamp: tuple, entries: List[Dict[str, Any]]):
+        self.stamp = stamp
+        self.entries = entries
+        self.epochs = [e["epoch"] for e in entries]
+        # 같은 버전이 여럿이면 시각이 가장 늦은 항목
+        self.by_version = {int(e.get("version") or 0): i for i, e in enumerate(entries)}
+        # weights_delta 를 누적해 각 시점의 전체 가중치를 미리 계산 (조회는 O(log n))
+        self.weights: List[Dict[str, float]] = []
+        cur: Dict[str, float] = {}
+        for e in entries:
+            cur = dict(cur)
+            for k, v in (e.get("weights_delta") or {}).items():
+                if v is None:
+                    cur.pop(k, None)
+                else:
+                    cur[k] = v
+            self.weights.append(cur)
+
+
+def _load_index(domain: str) -> _Index:
+    p = _index_path(domain)
+    try:
+        st = p.stat()
+        stamp = (st.st_mtime_ns, st.st_size)
+    except FileNotFoundError:
+        stamp = (0, 0)
+    idx = _INDEX_CACHE.get(domain)
+    if idx is not None and idx.stamp == stamp:
+        return idx
+    entries: List[Dict[str, Any]] = []
+    if stamp != (0, 0):
+        with p.open("r", encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if line:
+                    entries.append(json.loads(line))
+    entries.sort(key=lambda e: e["epoch"])  # append 순서 = 시간 순서지만 마이그레이션 대비
+    idx = _Index(stamp, entries)
+    _INDEX_CACHE[domain] = idx
+    return idx
+
+
+def entries(domain: str) -> List[Dict[str, Any]]:
+    return list(_load_index(domain).entries)
+
+
+# ---------- 기록 ----------
+def record(domain: str, cfg: Dict[str, Any], *, when: Optional[When] = None) -> Dict[str, Any]:
+    """
+    cfg 를 이력에 추가 (blob 은 없을 때만 쓰고, 인덱스에 한 줄 append — when 이 마지막 항목보다 이르면
+    시각 순 자리에 끼워 넣는다). 추가된 인덱스 항목 반환. config_store.save_domain_config 가 writer 잠금 안에서 호출한다.
+    """
+    from core_engine.config_store import atomic_write_bytes, file_lock
+
+    raw = _blob_bytes(cfg)
+    digest = hashlib.sha256(raw).hexdigest()
+    blob = _blob_path(domain, digest)
+    if not blob.exists():
+        atomic_write_bytes(blob, raw)
+
+    p = _index_path(domain)
+    p.parent.mkdir(parents=True, exist_ok=True)
+    # 인덱스 잠금: save_domain_config(writer 잠금 안) 와 migrate_legacy 가 다른 프로세스에서 겹쳐도 한 줄도 잃지 않게
+    with _LOCK, file_lock(p.with_name(p.name + ".lock")):
+        idx = _load_index(domain)
+        epoch = round(_epoch(when) if when is not None else datetime.now(timezone.utc).timestamp(), 3)
+        pos = bisect.bisect_right(idx.epochs, epoch)
+        new_w = _weights(cfg)
+        entry = {
+            "ts": _iso(epoch),
+            "epoch": epoch,
+            "version": int(cfg.get("config_version") or 0),
+            "hash": digest,
+            "weights_delta": _delta(idx.weights[pos - 1] if pos else {}, new_w),
+        }
+        if pos == len(idx.entries):
+            with p.open("a", encoding="utf-8") as f:
+                f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+        else:
+            # 과거 시각: 바로 뒤 항목의 delta 를 새 항목 기준으로 다시 계산 (누적 재생이 그 뒤 가중치를 그대로 재현하게)
+            rows = list(idx.entries)
+            rows[pos:pos + 1] = [entry, {**rows[pos], "weights_delta": _delta(new_w, idx.weights[pos])}]
+            atomic_write_bytes(p, "".join(json.dumps(e, ensure_ascii=False) + "\n" for e in rows).encode("utf-8"))
+    return entry
+
+
+# ---------- 조회 ----------
+def _pos_at(idx: _Index, when: When) -> int:
+    i = bisect.bisect_right(idx.epochs, _epoch(when)) - 1
+    if i < 0:
+        raise LookupError(f"no config recorded at or before {when}")
+    return i
+
+
+def entry_at(domain: str, when: When) -> Dict[str, Any]:
+    """when 시각에 유효하던 이력 항목 (그 이전 마지막 기록)"""
+    idx = _load_index(domain)
+    return idx.entries[_pos_at(idx, when)]
+
+
+def entry_at_version(domain: str, version: int) -> Dict[str, Any]:
+    """config_version 이 version 인 (같은 버전이 여럿이면 시각이 가장 늦은) 항목"""
+    idx = _load_index(domain)
+    i = idx.by_version.get(int(version))
+    if i is None:
+        raise LookupError(f"config_version {version} not in history of {domain}")
+    return idx.entries[i]
+
+
+def weights_at(domain: str, when: When) -> Dict[str, float]:
+    idx = _load_index(domain)
+    return dict(idx.weights[_pos_at(idx, when)])
+
+
+def load_blob(domain: str, digest: str) -> Dict[str, Any]:
+    cfg = _BLOB_CACHE.get(digest)
+    if cfg is None:
+        import yaml
+        cfg = yaml.safe_load(_blob_path(domain, digest).read_bytes()) or {}
+        _BLOB_CACHE[digest] = cfg
+    return cfg
+
+
+def config_at(domain: str, when: When) -> Dict[str, Any]:
+    """when 시각에 유효하던 config 전체 (config_version 포함). 반환 dict 는 수정하지 말 것."""
+    e = entry_at(domain, when)
+    return {**load_blob(domain, e["hash"]), "config_version": e["version"]}
+
+
+# ---------- 마이그레이션 ----------
+def migrate_legacy(domain: str, *, prune: bool = False) -> List[Dict[str, Any]]:
+    """
+    예전 방식의 전체 복사본(config_history/config_YYYYmmdd_HHMMSS.yaml, UTC)을 blob + 인덱스로 옮긴다.
+    이미 인덱스에 있는 시각은 건너뛴다. prune=True 면 옮긴 원본 파일을 지운다.
+    """
+    import yaml
+
+    d = history_dir(domain)
+    if not d.is_dir():
+        return []
+    known = set(_load_index(domain).epochs)
+    added: List[Dict[str, Any]] = []
+    for p in sorted(d.glob("config_*.yaml")):
+        m = _LEGACY_RE.match(p.name)
+        if not m:
+            continue
+        epoch = datetime.strptime(m.group(1), "%Y%m%d_%H%M%S").replace(tzinfo=timezone.utc).timestamp()
+        if round(epoch, 3) not in known:
+            cfg = yaml.safe_load(p.read_bytes()) or {}
+            added.append(record(domain, cfg, when=epoch))
+        if prune:
+            p.unlink()
+    return added
+
+
+__all__ = [
+    "record", "entries", "entry_at", "entry_at_version", "weights_at", "config_at",
+    "load_blob", "migrate_legacy", "history_dir",
+]
@@ -0,0 +1,89 @@
+# core_engine/config_snapshot.py
+from __future__ import annotations
+
+import hashlib
+import marshal
+import os
+import re
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+# 도메인 config 바이너리 스냅샷.
+# PyYAML 순수 파이썬 로더는 콜드 스타트에서 느리므로, 검증을 통과한 config.yaml 의 파싱 결과를
+# marshal 로 저장해 두고 다음 실행에서는 YAML 대신 이것을 읽는다.
+# 스냅샷 파일 이름에 YAML 내용의 sha256 이 들어가므로, YAML 이 바뀌면 자동으로 무효(→ YAML 폴백).
+#   output/_cache/config/<domain>-<sha256 앞 16자>.snap
+# 생성: tools/validate_config.py (명시적 컴파일), weight_tuner.save_config, 그리고 YAML 폴백 후 자동.
+
+ROOT = Path(__file__).resolve().parent.parent
+SNAPSHOT_DIR = ROOT / "output" / "_cache" / "config"
+_FORMAT = 1
+_MAGIC = b"KAICFG"
+
+
+def content_hash(raw: bytes) -> str:
+    return hashlib.sha256(raw).hexdigest()
+
+
+def snapshot_path(domain: str, digest: str) -> Path:
+    return SNAPSHOT_DIR / f"{domain}-{digest[:16]}.snap"
+
+
+def load_snapshot(domain: str, digest: str) -> Optional[Dict[str, Any]]:
+    """내용 해시가 맞는 스냅샷이 있으면 config dict, 없거나 깨졌으면 None."""
+    try:
+        data = snapshot_path(domain, digest).read_bytes()
+    except OSError:
+        return None
+    if not data.startswith(_MAGIC):
+        return None
+    try:
+        rec = marshal.loads(data[len(_MAGIC):])
+    except (EOFError, ValueError, TypeError):
+        return None
+    if not isinstance(rec, dict) or rec.get("format") != _FORMAT or rec.get("sha256") != digest:
+        return None
+    return rec.get("cfg")
+
+
+def write_snapshot(domain: str, digest: str, cfg: Dict[str, Any], *, validate: bool = True) -> Optional[Path]:
+    """
+    검증(DomainConfig) 후 스냅샷 기록 (임시 파일 + rename). 같은 도메인의 옛 스냅샷은 지운다.
+    검증 실패면 쓰지 않고 RuntimeError.
+    """
+    if validate:
+        from schemas.domain_config import validate_config_dict
+        validate_config_dict(cfg, domain)
+    try:
+        body = marshal.dumps({"format": _FORMAT, "sha256": digest, "domain": domain, "cfg": cfg})
+    except ValueError:
+        return None  # marshal 불가 타입(YAML 태그 등) — 스냅샷 없이 YAML 로 계속
+    path = snapshot_path(domain, digest)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    tmp.write_bytes(_MAGIC + body)
+    os.replace(tmp, path)
+    # "fin-*.snap" 은 "fin-set-<sha>.snap" 도 잡으므로 이 도메인 이름 형식만 정확히 맞춘다
+    own = re.compile(re.escape(domain) + r"-[0-9a-f]{16}\.snap")
+    for old in path.parent.glob(f"{domain}-*.snap"):
+        if old != path and own.fullmatch(old.name):
+            try:
+                old.unlink()
+            except OSError:
+                pass
+    return path
+
+
+def compile_domain(domain: str, config_path: Path) -> Path:
+    """config.yaml 을 파싱·검증해 스냅샷 생성. 스냅샷 경로 반환."""
+    import yaml
+
+    raw = config_path.read_bytes()
+    cfg = yaml.safe_load(raw) or {}
+    path = write_snapshot(domain, content_hash(raw), cfg)
+    if path is None:
+        raise RuntimeError(f"{config_path}: config contains values that cannot be snapshotted")
+    return path
+
+
+__all__ = ["content_hash", "snapshot_path", "load_snapshot", "write_snapshot", "compile_domain", "SNAPSHOT_DIR"]
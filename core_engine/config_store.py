@@ -0,0 +1,114 @@
+# core_engine/config_store.py
+from __future__ import annotations
+
+import os
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional
+
+from core_engine import config_cache
+
+# 도메인 config 쓰기 (튜너/관리 도구용).
+# - 같은 디렉터리의 임시 파일에 쓰고 fsync 후 os.replace → 읽는 쪽은 잠금 없이 항상 이전 또는 새 파일 전체를 본다
+# - 쓸 때마다 config_version 을 1씩 올린다 (단조 증가). 엔진은 이 값을 EvalReport.config_version 에 남긴다
+# - 쓰는 쪽끼리는 config.yaml.lock 으로 직렬화 (다른 프로세스의 튜너와 겹쳐도 버전이 꼬이지 않게)
+# - 같은 잠금 안에서 config_history 에 (시각, 버전, 내용 해시, 가중치 변화) 를 남긴다
+
+
+class ConfigConflict(RuntimeError):
+    """expected_version 과 현재 파일 버전이 다를 때 (다른 writer 가 먼저 씀)"""
+
+
+def config_version_of(cfg: Optional[Dict[str, Any]]) -> int:
+    try:
+        return int((cfg or {}).get("config_version") or 0)
+    except (TypeError, ValueError):
+        return 0
+
+
+@contextmanager
+def _writer_lock(path: Path) -> Iterator[None]:
+    with file_lock(path.with_name(path.name + ".lock")):
+        yield
+
+
+@contextmanager
+def file_lock(lock_path: Path) -> Iterator[None]:
+    """프로세스 간 배타 잠금 (fcntl.flock, Windows 는 msvcrt). 잠금 파일은 지우지 않는다."""
+    with open(lock_path, "a+b") as f:
+        try:
+            import fcntl
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        except ImportError:  # Windows
+            import msvcrt
+            f.seek(0)
+            while True:
+                try:
+                    msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    time.sleep(0.05)
+        yield  # 파일을 닫으면 잠금도 풀린다
+
+
+def atomic_write_bytes(path: Path, data: bytes) -> None:
+    """임시 파일 + fsync + os.replace. 디렉터리 fsync 는 가능한 플랫폼에서만."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    with open(tmp, "wb") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    for attempt in range(20):
+        try:
+            os.replace(tmp, path)
+            break
+        except PermissionError:  # Windows: 다른 프로세스가 잠깐 열고 있음
+            if attempt == 19:
+                raise
+            time.sleep(0.05)
+    try:
+        dfd = os.open(path.parent, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(dfd)
+    except OSError:
+        pass
+    finally:
+        os.close(dfd)
+
+
+def save_domain_config(domain: str, cfg: Dict[str, Any], *, expected_version: Optional[int] = None,
+                       history: bool = True) -> int:
+    """
+    cfg 를 domains/<domain>/config.yaml 에 원자적으로 쓰고 새 config_version 을 반환.
+    expected_version 을 주면 현재 파일 버전이 같을 때만 쓴다 (아니면 ConfigConflict).
+    cfg["config_version"] 은 새 버전으로 갱신된다. history=True 면 config_history 에도 기록.
+    """
+    import yaml
+    from core_engine import config_snapshot
+
+    path = config_cache.config_path(domain)
+    with _writer_lock(path):
+        current = 0
+        if path.exists():
+            current = config_version_of(yaml.safe_load(path.read_bytes()))
+        if expected_version is not None and expected_version != current:
+            raise ConfigConflict(f"{path}: version is {current}, expected {expected_version}")
+        cfg["config_version"] = current + 1
+        raw = yaml.safe_dump(cfg, allow_unicode=True, sort_keys=False).encode("utf-8")
+        atomic_write_bytes(path, raw)
+        try:
+            # 다음 읽기가 YAML 파싱 없이 바로 새 버전을 보도록
+            config_snapshot.write_snapshot(domain, config_snapshot.content_hash(raw), cfg)
+        except (RuntimeError, OSError):
+            pass
+        if history:
+            from core_engine import config_history
+            config_history.record(domain, cfg)
+    return cfg["config_version"]
+
+
+__all__ = ["save_domain_config", "atomic_write_bytes", "file_lock", "config_version_of", "ConfigConflict"]
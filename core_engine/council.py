@@ -1,18 +1,22 @@
 # core_engine/council.py
 from __future__ import annotations
 import json
-from typing import List, Dict, Any
+from typing import List
+
+def is_valid_candidate(text: str) -> bool:
+    """council 이 받아들이는 후보: "title" 이 있는 JSON 객체 (quorum 집계 기준)"""
+    try:
+        obj = json.loads(text)
+    except Exception:
+        return False
+    return isinstance(obj, dict) and "title" in obj
 
 def pick_first_valid_json(candidates: List[str]) -> str:
     for t in candidates:
-        try:
-            obj = json.loads(t)
-            if isinstance(obj, dict) and "title" in obj:
-                return t
-        except Exception:
-            continue
+        if is_valid_candidate(t):
+            return t
     return ""
 
 def simple_council_merge(texts: List[str]) -> str:
     # 지금은 "첫 유효 JSON" 규칙. 필요하면 다수결/평균 등으로 고도화
-    return pick_first_valid_json(texts) or (texts[0] if texts else "")
\ No newline at end of file
+    return pick_first_valid_json(texts) or (texts[0] if texts else "")
@@ -0,0 +1,64 @@
+# core_engine/deadline.py
+from __future__ import annotations
+
+import math
+import time
+from typing import Optional
+
+# 요청 단위 시간 예산.
+# 엔트리포인트에서 만들어 QMAND → QGEN → STRATOS → SAVE → EXPORT 로 전달하고,
+# 각 단계는 남은 시간을 보고 비싼 작업(PDF 렌더링, LLM 호출 등)을 건너뛰거나 잘라낸다.
+
+
+class DeadlineExceeded(TimeoutError):
+    def __init__(self, stage: str, overrun: float = 0.0):
+        super().__init__(f"[{stage}] deadline exceeded (+{overrun * 1000:.0f}ms)")
+        self.stage = stage
+
+
+class Deadline:
+    __slots__ = ("budget", "_at")
+
+    def __init__(self, budget_s: Optional[float] = None):
+        self.budget = budget_s
+        self._at = (time.monotonic() + budget_s) if budget_s is not None else math.inf
+
+    @classmethod
+    def after(cls, seconds: Optional[float]) -> "Deadline":
+        return cls(seconds)
+
+    def remaining(self) -> float:
+        """남은 시간(초). 예산이 없으면 inf."""
+        return max(0.0, self._at - time.monotonic())
+
+    def expired(self) -> bool:
+        return time.monotonic() >= self._at
+
+    def near(self, margin_s: float) -> bool:
+        """남은 시간이 margin_s 미만이면 True (비싼 단계는 건너뛸 것)"""
+        return self.remaining() < margin_s
+
+    def timeout(self, cap: Optional[float] = None) -> Optional[float]:
+        """블로킹 호출용 timeout 값. 예산도 cap 도 없으면 None(무제한)."""
+        rem = self.remaining()
+        if cap is not None:
+            rem = min(rem, cap)
+        return None if math.isinf(rem) else rem
+
+    def check(self, stage: str) -> None:
+        over = time.monotonic() - self._at
+        if over >= 0:
+            raise DeadlineExceeded(stage, over)
+
+    def __repr__(self) -> str:
+        return f"Deadline(budget={self.budget}, remaining={self.remaining():.3f})"
+
+
+NO_DEADLINE = Deadline(None)
+
+
+def ensure(deadline: Optional[Deadline]) -> Deadline:
+    return deadline if deadline is not None else NO_DEADLINE
+
+
+__all__ = ["Deadline", "DeadlineExceeded", "NO_DEADLINE", "ensure"]
@@ -0,0 +1,106 @@
+# core_engine/domain_registry.py
+from __future__ import annotations
+
+import threading
+from typing import Any, Dict, List
+
+from core_engine import config_cache
+from core_engine.example_index import ExampleIndex, index_for
+from core_engine.keyword_matcher import KeywordMatcher
+
+# 멀티 도메인 레지스트리.
+# 시작 시 domains/*/config.yaml 을 모두 찾아 DomainConfig 로 검증하고,
+# 도메인별로 요청마다 다시 만들 필요 없는 상태(정규화된 constraints, 가중치, 컴파일된 라우팅 키워드, 예시 색인)를 들고 있다.
+# 상태는 config_cache 의 파생값으로 저장되므로 config 파일이 바뀌면 다음 조회 때 다시 만들어진다.
+#
+#   preload()                       # 서비스/워커 시작 시 1회
+#   st = get("finsetreport")        # DomainState
+#   run_qmand_pipeline(st.name, text, cfg=st.cfg, routing=st.routing)
+
+
+class DomainState:
+    __slots__ = ("name", "version", "cfg", "config", "constraints", "weights", "routing", "examples")
+
+    def __init__(self, name: str, version: int, cfg: Dict[str, Any], config: Any,
+                 constraints: Dict[str, str], weights: Dict[str, float],
+                 routing: KeywordMatcher, examples: ExampleIndex):
+        self.name = name
+        self.version = version
+        self.cfg = cfg                  # 엔진에 넘기는 원본 dict (수정하지 말 것)
+        self.config = config            # 검증된 schemas.domain_config.DomainConfig
+        self.constraints = constraints  # 문자열 값으로 정규화 + 기본값
+        self.weights = weights          # 합 1 로 정규화된 stratos 가중치
+        self.routing = routing          # compile_routing_keywords 결과 (KeywordMatcher)
+        self.examples = examples        # few-shot 예시 n-gram 색인 (autoprompt.build_prompt_bundle)
+
+    def __repr__(self) -> str:
+        return f"DomainState({self.name!r}, version={self.version})"
+
+
+_LOCK = threading.Lock()
+_ERRORS: Dict[str, str] = {}
+
+
+def _build(domain: str, cfg: Dict[str, Any]) -> DomainState:
+    from schemas.domain_config import validate_config_dict
+    from core_engine.qmand_engine import compile_routing_keywords
+    from core_engine.qgen_engine import _normalize_constraints
+    from core_engine.stratos_evaluator import normalized_weights
+    from prompts.autoprompt import DEFAULT_EXAMPLES
+
+    config = validate_config_dict(cfg, str(config_cache.config_path(domain)))
+    return DomainState(
+        name=domain,
+        version=config_cache.config_version(domain),
+        cfg=cfg,
+        config=config,
+        constraints=_normalize_constraints(cfg.get("constraints") or {}),
+        weights=normalized_weights(cfg),
+        routing=compile_routing_keywords(cfg.get("routing_keywords") or {}),
+        # index_for: build_prompt_bundle(domain_cfg=st.cfg) 가 같은 examples 리스트로 찾으면 이 색인을 그대로 쓴다
+        examples=index_for(cfg.get("examples") or DEFAULT_EXAMPLES),
+    )
+
+
+def get(domain: str) -> DomainState:
+    """
+    도메인 상태. 없는 도메인이면 FileNotFoundError, 검증 실패면 RuntimeError.
+    config 파일이 바뀌었으면 다시 읽고 상태를 다시 만든다.
+    """
+    try:
+        st = config_cache.get_derived(domain, "state", lambda cfg: _build(domain, cfg))
+    except RuntimeError as e:
+        with _LOCK:
+            _ERRORS[domain] = str(e)
+        raise
+    if domain in _ERRORS:
+        with _LOCK:
+            _ERRORS.pop(domain, None)
+    return st
+
+
+def preload() -> Dict[str, str]:
+    """domains/* 전체를 읽고 검증. 실패한 도메인은 건너뛰고 {domain: error} 로 돌려준다."""
+    for d in config_cache.list_domains():
+        try:
+            get(d)
+        except RuntimeError:
+            pass
+    return errors()
+
+
+def domains() -> List[str]:
+    """검증을 통과한 도메인 목록"""
+    return [d for d in config_cache.list_domains() if d not in _ERRORS]
+
+
+def errors() -> Dict[str, str]:
+    with _LOCK:
+        return dict(_ERRORS)
+
+
+def info() -> Dict[str, Any]:
+    return {"domains": domains(), "errors": errors()}
+
+
+__all__ = ["DomainState", "get", "preload", "domains", "errors", "info"]
@@ -0,0 +1,132 @@
+# core_engine/example_index.py
+from __future__ import annotations
+
+import math
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from core_engine.keyword_matcher import normalize
+
+# few-shot 예시 선택용 문자 n-gram 색인.
+# 형태소 분석 없이 한국어에도 통하도록 정규화된 입력의 문자 2/3-gram 을 TF-IDF 가중 후 L2 정규화하고,
+# n-gram -> [(예시 id, 가중치)] 역색인을 만든다. 질의는 자기 n-gram 의 posting 만 더하므로
+# 예시 수·길이와 무관하게 질의 길이에 비례 (수백 개 예시에서도 1ms 미만).
+#   idx = index_for(cfg["examples"])                 # config 로드 시 1회 (domain_registry.DomainState.examples)
+#   idx.select("온보딩 퍼널 개선", k=3, budget_chars=1200)  → 관련도 순 예시 dict 목록
+
+NGRAM_SIZES = (2, 3)
+DEFAULT_K = 3
+DEFAULT_BUDGET_CHARS = 1200  # 선택한 예시의 input+output 글자 수 합 상한
+
+
+def _as_example(x: Any) -> Dict[str, str]:
+    return {"input": x} if isinstance(x, str) else dict(x)
+
+
+def _grams(text: str) -> Dict[str, int]:
+    t = " ".join(normalize(text).split())
+    tf: Dict[str, int] = {}
+    if 0 < len(t) < NGRAM_SIZES[0]:
+        tf[t] = 1
+    for n in NGRAM_SIZES:
+        for i in range(len(t) - n + 1):
+            g = t[i:i + n]
+            tf[g] = tf.get(g, 0) + 1
+    return tf
+
+
+def _size(ex: Dict[str, str]) -> int:
+    return len(ex.get("input") or "") + len(ex.get("output") or "")
+
+
+class ExampleIndex:
+    __slots__ = ("examples", "sizes", "_postings", "_idf")
+
+    def __init__(self, examples: Iterable[Any]):
+        self.examples: List[Dict[str, str]] = [_as_example(x) for x in (examples or [])]
+        self.sizes = [_size(ex) for ex in self.examples]
+        docs = [_grams(ex.get("input") or "") for ex in self.examples]
+        n = len(docs)
+        df: Dict[str, int] = {}
+        for tf in docs:
+            for g in tf:
+                df[g] = df.get(g, 0) + 1
+        self._idf = {g: math.log((1 + n) / (1 + c)) + 1.0 for g, c in df.items()}
+        self._postings: Dict[str, List[Tuple[int, float]]] = {}
+        for i, tf in enumerate(docs):
+            w = {g: c * self._idf[g] for g, c in tf.items()}
+            norm = math.sqrt(sum(v * v for v in w.values())) or 1.0
+            for g, v in w.items():
+                self._postings.setdefault(g, []).append((i, v / norm))
+
+    def __len__(self) -> int:
+        return len(self.examples)
+
+    def scores(self, text: str) -> Dict[int, float]:
+        """예시 id -> 코사인 유사도 (겹치는 n-gram 이 없는 예시는 빠짐)"""
+        q = _grams(text or "")
+        postings, idf = self._postings, self._idf
+        qw = {g: c * idf[g] for g, c in q.items() if g in idf}
+        if not qw:
+            return {}
+        # 질의 노름은 색인에 없는 n-gram 까지 포함해야 예시 간 비교가 아닌 절대 유사도가 된다
+        qnorm = math.sqrt(sum((c * idf.get(g, 1.0)) ** 2 for g, c in q.items())) or 1.0
+        acc: Dict[int, float] = {}
+        for g, w in qw.items():
+            for i, v in postings[g]:
+                acc[i] = acc.get(i, 0.0) + w * v
+        return {i: s / qnorm for i, s in acc.items()}
+
+    def select(self, text: str, *, k: int = DEFAULT_K,
+               budget_chars: Optional[int] = DEFAULT_BUDGET_CHARS) -> List[Dict[str, str]]:
+        """
+        관련도 순 상위 k 개 (글자 수 합이 budget_chars 를 넘는 예시는 건너뜀).
+        겹치는 예시가 하나도 없으면 원래 순서대로 고른다.
+        첫 번째(가장 관련 높은) 예시는 budget_chars 를 넘어도 넣는다 (프롬프트에 예시가 비지 않게).
+        """
+        if k <= 0 or not self.examples:
+            return []
+        s = self.scores(text)
+        order = sorted(s, key=lambda i: (-s[i], i)) if s else range(len(self.examples))
+        out: List[Dict[str, str]] = []
+        used = 0
+        for i in order:
+            if out and budget_chars is not None and used + self.sizes[i] > budget_chars:
+                continue
+            out.append(self.examples[i])
+            used += self.sizes[i]
+            if len(out) >= k:
+                break
+        return out
+
+    def __repr__(self) -> str:
+        return f"ExampleIndex(examples={len(self.examples)}, ngrams={len(self._postings)})"
+
+
+# config 를 통째로 넘기는 호출용: 같은 examples 리스트 객체(config_cache 의 버전별 dict)면 색인 재사용
+_INDEXES: Dict[int, Tuple[Any, ExampleIndex]] = {}
+_INDEXES_MAX = 32
+_LOCK = threading.Lock()
+
+
+def index_for(examples: List[Any]) -> ExampleIndex:
+    hit = _INDEXES.get(id(examples))
+    if hit is not None and hit[0] is examples:
+        return hit[1]
+    idx = ExampleIndex(examples)
+    with _LOCK:
+        if len(_INDEXES) >= _INDEXES_MAX:
+            _INDEXES.clear()
+        _INDEXES[id(examples)] = (examples, idx)
+    return idx
+
+
+def selection_limits(cfg: Dict[str, Any]) -> Tuple[int, Optional[int]]:
+    """cfg.cutoffs.few_shot_k / few_shot_chars (없으면 기본값, few_shot_chars: null 이면 글자 수 제한 없음)"""
+    cut = cfg.get("cutoffs") or {}
+    k = int(cut.get("few_shot_k", DEFAULT_K))
+    budget = cut.get("few_shot_chars", DEFAULT_BUDGET_CHARS)
+    return k, (int(budget) if budget is not None else None)
+
+
+__all__ = ["ExampleIndex", "index_for", "selection_limits", "DEFAULT_K", "DEFAULT_BUDGET_CHARS"]
@@ -0,0 +1,271 @@
+# core_engine/job_queue.py
+from __future__ import annotations
+
+import json
+import os
+import socket
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+# 내구성 있는 작업 큐 (SQLite).
+# - 프로듀서: enqueue({domain, input, export})
+# - 워커: claim(owner, lease_s) 로 리스를 잡고 run_once 실행 후 complete/fail
+# - 리스가 만료된 running 작업(워커 크래시)은 다른 워커가 다시 가져간다 (max_attempts 까지)
+# - 실행 중인 워커는 리스를 주기적으로 연장(heartbeat)하므로 lease_s 보다 긴 작업도 중복 실행되지 않는다
+# - 실패는 max_attempts 까지 지수 백오프로 재시도
+#
+# 저널 모드는 기본 WAL (한 호스트 내 여러 프로세스에서 읽기/쓰기 동시성이 좋음).
+# 단, WAL 은 공유 메모리(-shm)를 쓰므로 네트워크 파일시스템(NFS/SMB)에서는 동작하지 않는다.
+# 여러 호스트가 공유 파일시스템의 큐를 함께 비울 때는 journal_mode="DELETE" 로 열 것
+# (파일 락 기반 롤백 저널; 처리량은 낮지만 안전).
+
+ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_DB = ROOT / "output" / "_queue" / "jobs.sqlite3"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id            INTEGER PRIMARY KEY AUTOINCREMENT,
+    domain        TEXT    NOT NULL,
+    input         TEXT    NOT NULL,
+    export        TEXT,
+    status        TEXT    NOT NULL DEFAULT 'queued',  -- queued | running | done | failed
+    attempts      INTEGER NOT NULL DEFAULT 0,
+    max_attempts  INTEGER NOT NULL DEFAULT 3,
+    available_at  REAL    NOT NULL,
+    lease_owner   TEXT,
+    lease_expires REAL,
+    out_dir       TEXT,
+    result        TEXT,
+    error         TEXT,
+    created_at    REAL    NOT NULL,
+    updated_at    REAL    NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_claim ON jobs (status, available_at);
+"""
+
+RETRY_BACKOFF_S = 5.0
+
+
+def worker_id() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+class JobQueue:
+    def __init__(self, path: str | os.PathLike = DEFAULT_DB, journal_mode: str = "WAL", timeout: float = 30.0):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # autocommit 모드: 트랜잭션은 BEGIN IMMEDIATE 로 직접 관리
+        self._db = sqlite3.connect(str(self.path), timeout=timeout, isolation_level=None)
+        self._db.row_factory = sqlite3.Row
+        self._db.execute(f"PRAGMA journal_mode={journal_mode}")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        self._db.close()
+
+    # ---------- producer ----------
+    def enqueue(self, domain: str, user_input: str, export: Optional[str] = None,
+                max_attempts: int = 3) -> int:
+        now = time.time()
+        cur = self._db.execute(
+            "INSERT INTO jobs (domain, input, export, max_attempts, available_at, created_at, updated_at)"
+            " VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (domain, user_input, export, max_attempts, now, now, now),
+        )
+        return int(cur.lastrowid)
+
+    def enqueue_many(self, items: Iterable[Dict[str, Any]], export: Optional[str] = None,
+                     max_attempts: int = 3) -> int:
+        now = time.time()
+        rows = [(it["domain"], it["input"], it.get("export", export), max_attempts, now, now, now) for it in items]
+        self._db.execute("BEGIN IMMEDIATE")
+        try:
+            self._db.executemany(
+                "INSERT INTO jobs (domain, input, export, max_attempts, available_at, created_at, updated_at)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+            self._db.execute("COMMIT")
+        except Exception:
+            self._db.execute("ROLLBACK")
+            raise
+        return len(rows)
+
+    # ---------- worker ----------
+    def claim(self, owner: str, lease_s: float = 300.0) -> Optional[Dict[str, Any]]:
+        """
+        대기 중이거나 리스가 만료된 작업 하나를 owner 에게 할당. 없으면 None.
+        리스가 만료됐는데 시도 횟수를 다 쓴 작업(워커를 죽이는 작업)은 다시 돌리지 않고 failed 로 둔다.
+        """
+        now = time.time()
+        self._db.execute("BEGIN IMMEDIATE")
+        try:
+            self._db.execute(
+                "UPDATE jobs SET status = 'failed',"
+                " error = 'lease expired on attempt ' || attempts || ' (worker lost: ' || lease_owner || ')',"
+                " lease_owner = NULL, lease_expires = NULL, updated_at = ?"
+                " WHERE status = 'running' AND lease_expires < ? AND attempts >= max_attempts",
+                (now, now),
+            )
+            row = self._db.execute(
+                "SELECT * FROM jobs"
+                " WHERE (status = 'queued' AND available_at <= ?)"
+                "    OR (status = 'running' AND lease_expires < ? AND attempts < max_attempts)"
+                " ORDER BY id LIMIT 1",
+                (now, now),
+            ).fetchone()
+            if row is None:
+                self._db.execute("COMMIT")
+                return None
+            self._db.execute(
+                "UPDATE jobs SET status = 'running', attempts = attempts + 1,"
+                " lease_owner = ?, lease_expires = ?, updated_at = ? WHERE id = ?",
+                (owner, now + lease_s, now, row["id"]),
+            )
+            self._db.execute("COMMIT")
+        except Exception:
+            self._db.execute("ROLLBACK")
+            raise
+        job = dict(row)
+        job["attempts"] += 1
+        job["lease_owner"] = owner
+        return job
+
+    def extend_lease(self, job_id: int, owner: str, lease_s: float = 300.0) -> bool:
+        cur = self._db.execute(
+            "UPDATE jobs SET lease_expires = ?, updated_at = ?"
+            " WHERE id = ? AND status = 'running' AND lease_owner = ?",
+            (time.time() + lease_s, time.time(), job_id, owner),
+        )
+        return cur.rowcount == 1
+
+    def complete(self, job_id: int, owner: str, out_dir: str, result: Dict[str, Any]) -> bool:
+        """리스를 가진 owner 만 완료 처리 가능 (리스를 뺏긴 늦은 워커의 결과는 무시)."""
+        cur = self._db.execute(
+            "UPDATE jobs SET status = 'done', out_dir = ?, result = ?, error = NULL,"
+            " lease_owner = NULL, lease_expires = NULL, updated_at = ?"
+            " WHERE id = ? AND status = 'running' AND lease_owner = ?",
+            (out_dir, json.dumps(result, ensure_ascii=False), time.time(), job_id, owner),
+        )
+        return cur.rowcount == 1
+
+    def fail(self, job_id: int, owner: str, error: str) -> bool:
+        """재시도 가능하면 백오프 후 queued 로, 아니면 failed 로."""
+        now = time.time()
+        cur = self._db.execute(
+            "UPDATE jobs SET"
+            " status = CASE WHEN attempts < max_attempts THEN 'queued' ELSE 'failed' END,"
+            " available_at = ? + ? * (1 << (attempts - 1)),"
+            " error = ?, lease_owner = NULL, lease_expires = NULL, updated_at = ?"
+            " WHERE id = ? AND status = 'running' AND lease_owner = ?",
+            (now, RETRY_BACKOFF_S, error, now, job_id, owner),
+        )
+        return cur.rowcount == 1
+
+    # ---------- 조회 ----------
+    def counts(self) -> Dict[str, int]:
+        out = {"queued": 0, "running": 0, "done": 0, "failed": 0}
+        for row in self._db.execute("SELECT status, COUNT(*) AS n FROM jobs GROUP BY status"):
+            out[row["status"]] = row["n"]
+        return out
+
+    def get(self, job_id: int) -> Optional[Dict[str, Any]]:
+        row = self._db.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return dict(row) if row else None
+
+    def pending(self) -> int:
+        now = time.time()
+        row = self._db.execute(
+            "SELECT COUNT(*) FROM jobs WHERE status = 'queued'"
+            " OR (status = 'running' AND lease_expires < ? AND attempts < max_attempts)",
+            (now,),
+        ).fetchone()
+        return int(row[0])
+
+    def failed(self, limit: int = 20) -> List[Dict[str, Any]]:
+        rows = self._db.execute(
+            "SELECT id, domain, input, attempts, error FROM jobs WHERE status = 'failed' ORDER BY id LIMIT ?",
+            (limit,),
+        )
+        return [dict(r) for r in rows]
+
+
+# ------------------------------------------------------------
+# 워커 루프
+# ------------------------------------------------------------
+@contextmanager
+def lease_heartbeat(db_path: str, job_id: int, owner: str, lease_s: float = 300.0, *,
+                    journal_mode: str = "WAL", interval_s: Optional[float] = None) -> Iterator[None]:
+    """블록이 실행되는 동안 별도 스레드(별도 연결)에서 interval_s(기본 lease_s/3)마다 리스 연장"""
+    stop = threading.Event()
+    interval = interval_s if interval_s is not None else max(0.05, lease_s / 3)
+
+    def _beat() -> None:
+        q = JobQueue(db_path, journal_mode=journal_mode)
+        try:
+            while not stop.wait(interval):
+                if not q.extend_lease(job_id, owner, lease_s):
+                    return  # 리스를 뺏겼거나 이미 끝남
+        finally:
+            q.close()
+
+    t = threading.Thread(target=_beat, name=f"lease-{job_id}", daemon=True)
+    t.start()
+    try:
+        yield
+    finally:
+        stop.set()
+        t.join()
+
+
+def work_loop(db_path: str, *, journal_mode: str = "WAL", lease_s: float = 300.0,
+              poll_s: float = 1.0, drain: bool = False, base_dir: str = "output",
+              deadline_s: Optional[float] = None, quiet: bool = False) -> int:
+    """
+    큐에서 작업을 하나씩 claim 해서 run_once(+export) 실행.
+    drain=True 면 처리할 작업이 없을 때 종료, 아니면 poll_s 간격으로 계속 대기.
+    처리한 작업 수 반환.
+    """
+    from core_engine.batch_runner import _run_item
+    from core_engine import rate_limit
+
+    rate_limit.set_default_priority(rate_limit.BATCH)
+    q = JobQueue(db_path, journal_mode=journal_mode)
+    owner = worker_id()
+    done = 0
+    try:
+        while True:
+            job = q.claim(owner, lease_s)
+            if job is None:
+                if drain and q.pending() == 0:
+                    return done
+                time.sleep(poll_s)
+                continue
+            with lease_heartbeat(db_path, job["id"], owner, lease_s, journal_mode=journal_mode):
+                rec = _run_item({
+                    "index": job["id"],
+                    "id": str(job["id"]),
+                    "domain": job["domain"],
+                    "input": job["input"],
+                    "export": job["export"],
+                    "deadline_s": deadline_s,
+                    "out_dir": os.path.join(base_dir, "jobs", f"{job['id']:06d}"),
+                })
+            if rec["status"] == "ok":
+                q.complete(job["id"], owner, rec["out_dir"], rec)
+            else:
+                q.fail(job["id"], owner, rec.get("error", "unknown error"))
+            done += 1
+            if not quiet:
+                mark = "✓" if rec["status"] == "ok" else "✗"
+                print(f"  {mark} [{owner}] job {job['id']} attempt {job['attempts']} ({rec['elapsed_ms']}ms)")
+    finally:
+        q.close()
+
+
+__all__ = ["JobQueue", "work_loop", "lease_heartbeat", "worker_id", "DEFAULT_DB"]
@@ -0,0 +1,136 @@
+# core_engine/keyword_matcher.py
+from __future__ import annotations
+
+import unicodedata
+from collections import deque
+from typing import Dict, Iterable, List, Mapping, NamedTuple, Optional, Sequence, Tuple
+
+# 다중 키워드 매처 (Aho-Corasick).
+# 라벨(intent/입력 유형)별 키워드 목록을 한 번 오토마톤으로 컴파일해 두면,
+# 키워드가 수천 개여도 입력 길이에 비례하는 한 번의 스캔으로 모든 매치(라벨, 위치)를 찾는다.
+# 키워드와 입력은 같은 normalize() 를 거친다: NFKC (전각→반각, 호환 자모/분해된 한글 → 완성형) + casefold.
+#   m = KeywordMatcher.compile({"report": ["보고서", "리포트"], "strategy": ["전략"]})
+#   m.first_label("월간 보고서 전략", default="strategy")   → "report" (라벨 순서가 우선순위)
+#   m.find_all("월간 보고서 전략")                          → [Match(3, 6, "보고서", ("report",)), ...]
+# 위치(start, end)는 normalize() 된 텍스트 기준이다.
+
+
+def normalize(text: str) -> str:
+    return unicodedata.normalize("NFKC", text).casefold()
+
+
+class Match(NamedTuple):
+    start: int
+    end: int
+    keyword: str
+    labels: Tuple[str, ...]
+
+
+class KeywordMatcher:
+    __slots__ = ("labels", "keywords", "_kw_labels", "_goto", "_fail", "_out")
+
+    def __init__(self, table: Sequence[Tuple[str, Iterable[str]]]):
+        self.labels: Tuple[str, ...] = tuple(label for label, _ in table)
+        self.keywords: List[str] = []          # 키워드 id -> 정규화된 키워드
+        self._kw_labels: List[Tuple[int, ...]] = []  # 키워드 id -> 라벨 인덱스 (같은 키워드가 여러 라벨에 있을 수 있음)
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[Tuple[int, ...]] = [()]  # 노드 -> 이 노드에서 끝나는 키워드 id (fail 링크 출력 포함)
+
+        ids: Dict[str, int] = {}
+        for li, (_, kws) in enumerate(table):
+            for kw in kws:
+                k = normalize(str(kw)) if kw else ""
+                if not k:
+                    continue
+                if k not in ids:
+                    ids[k] = len(self.keywords)
+                    self.keywords.append(k)
+                    self._kw_labels.append(())
+                    self._insert(k, ids[k])
+                kid = ids[k]
+                if li not in self._kw_labels[kid]:
+                    self._kw_labels[kid] += (li,)
+        self._link()
+
+    @classmethod
+    def compile(cls, table: Mapping[str, Iterable[str]]) -> "KeywordMatcher":
+        """{라벨: [키워드...]} (dict 순서 = 우선순위). 값이 list/tuple 이 아닌 항목은 무시."""
+        return cls([(str(label), kws) for label, kws in (table or {}).items() if isinstance(kws, (list, tuple))])
+
+    # ---------- 빌드 ----------
+    def _insert(self, kw: str, kid: int) -> None:
+        node = 0
+        for ch in kw:
+            nxt = self._goto[node].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[node][ch] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append(())
+            node = nxt
+        self._out[node] += (kid,)
+
+    def _link(self) -> None:
+        goto, fail, out = self._goto, self._fail, self._out
+        q = deque(goto[0].values())
+        while q:
+            node = q.popleft()
+            for ch, nxt in goto[node].items():
+                f = fail[node]
+                while f and ch not in goto[f]:
+                    f = fail[f]
+                fail[nxt] = goto[f].get(ch, 0)
+                out[nxt] += out[fail[nxt]]
+                q.append(nxt)
+
+    # ---------- 조회 ----------
+    def _scan(self, text: str):
+        goto, fail, out = self._goto, self._fail, self._out
+        node = 0
+        for i, ch in enumerate(text):
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            if out[node]:
+                yield i + 1, out[node]
+
+    def find_all(self, text: str) -> List[Match]:
+        """모든 매치 (겹치는 것 포함), 끝 위치 순. 위치는 normalize(text) 기준."""
+        res: List[Match] = []
+        labels = self.labels
+        for end, kids in self._scan(normalize(text or "")):
+            for kid in kids:
+                kw = self.keywords[kid]
+                res.append(Match(end - len(kw), end, kw, tuple(labels[li] for li in self._kw_labels[kid])))
+        return res
+
+    def matched_labels(self, text: str) -> List[str]:
+        """매치된 라벨 (우선순위 순, 중복 없음)"""
+        hit = set()
+        for _, kids in self._scan(normalize(text or "")):
+            for kid in kids:
+                hit.update(self._kw_labels[kid])
+        return [self.labels[li] for li in sorted(hit)]
+
+    def first_label(self, text: str, default: Optional[str] = None) -> Optional[str]:
+        """매치된 라벨 중 우선순위가 가장 높은 것 (첫 라벨이 나오면 바로 멈춤)"""
+        best = len(self.labels)
+        for _, kids in self._scan(normalize(text or "")):
+            for kid in kids:
+                li = self._kw_labels[kid][0]
+                if li < best:
+                    best = li
+                    if best == 0:
+                        return self.labels[0]
+        return self.labels[best] if best < len(self.labels) else default
+
+    def __len__(self) -> int:
+        return len(self.keywords)
+
+    def __repr__(self) -> str:
+        return f"KeywordMatcher(labels={len(self.labels)}, keywords={len(self.keywords)}, nodes={len(self._goto)})"
+
+
+__all__ = ["KeywordMatcher", "Match", "normalize"]
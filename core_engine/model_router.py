@@ -1,13 +1,39 @@
 # core_engine/model_router.py
 from __future__ import annotations
+import asyncio
+import contextvars
+import math
 import os
-from typing import List, Dict, Any, Optional
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, TimeoutError as FutureTimeout, wait
+from typing import Callable, Deque, List, Dict, Any, Optional, Tuple
+
+from core_engine.council import is_valid_candidate
+from core_engine.deadline import Deadline, DeadlineExceeded
+from core_engine.response_cache import RESPONSE_CACHE, cache_key
+from core_engine.rate_limit import LIMITERS, estimate_tokens
+from core_engine.route_health import RouteTable, route_key
+from core_engine.singleflight import SingleFlight
 
 class ProviderBase:
+    env_key = ""  # 이 환경변수(API 키)가 없으면 모의응답
+
+    def live(self) -> bool:
+        return bool(self.env_key and os.getenv(self.env_key))
+
     def call(self, model: str, messages: List[Dict[str, str]], temperature: float = 0.2) -> str:
         raise NotImplementedError
 
+    async def acall(self, model: str, messages: List[Dict[str, str]], temperature: float = 0.2) -> str:
+        # 기본: 동기 call 을 I/O 풀에서 실행. 네트워크 SDK 가 붙으면 네이티브 async 로 재정의
+        from core_engine.aio import run_io
+        return await run_io(self.call, model, messages, temperature)
+
 class OpenAIProvider(ProviderBase):
+    env_key = "OPENAI_API_KEY"
+
     def call(self, model: str, messages: List[Dict[str, str]], temperature: float = 0.2) -> str:
         # 실제 API 키 없으면 모의응답
         if not os.getenv("OPENAI_API_KEY"):
@@ -18,6 +44,8 @@ class OpenAIProvider(ProviderBase):
         return f'{{"title":"[openai LIVE]","objectives":["tbd"],"modules":[],"flow":[],"risks":[],"meta":{{"version":"live","model":"{model}","timestamp":"N/A"}}}}'
 
 class AnthropicProvider(ProviderBase):
+    env_key = "ANTHROPIC_API_KEY"
+
     def call(self, model: str, messages: List[Dict[str, str]], temperature: float = 0.2) -> str:
         if not os.getenv("ANTHROPIC_API_KEY"):
             last = next((m["content"] for m in reversed(messages) if m["role"]=="user"), "[]")
@@ -25,6 +53,8 @@ class AnthropicProvider(ProviderBase):
         return f'{{"title":"[anthropic LIVE]","objectives":["tbd"],"modules":[],"flow":[],"risks":[],"meta":{{"version":"live","model":"{model}","timestamp":"N/A"}}}}'
 
 class GeminiProvider(ProviderBase):
+    env_key = "GOOGLE_API_KEY"
+
     def call(self, model: str, messages: List[Dict[str, str]], temperature: float = 0.2) -> str:
         if not os.getenv("GOOGLE_API_KEY"):
             last = next((m["content"] for m in reversed(messages) if m["role"]=="user"), "[]")
@@ -37,8 +67,505 @@ PROVIDERS: Dict[str, ProviderBase] = {
     "gemini": GeminiProvider(),
 }
 
-def model_call(provider: str, name: str, messages: List[Dict[str, str]], temperature: float = 0.2) -> str:
+# deadline 이 있는 호출은 이 풀에서 실행하고 남은 시간만큼만 기다린다.
+# (시간 초과된 호출 스레드는 버려지지만 워커는 즉시 풀려난다)
+_CALL_POOL = ThreadPoolExecutor(max_workers=16, thread_name_prefix="model_call")
+
+def _submit(fn: Callable[..., Any], *args: Any) -> Any:
+    # 호출자의 contextvars(rate_limit 우선순위 등)를 풀 스레드로 넘긴다
+    return _CALL_POOL.submit(contextvars.copy_context().run, fn, *args)
+
+# 한도(rate_limit)는 실제 provider 로 나가는 호출에만 (캐시 적중/single-flight follower 는 소모 없음).
+# 모든 provider 호출은 응답 캐시(response_cache)를 거친다. 키에 live/mock 이 들어가므로
+# API 키를 설정한 뒤에 예전 모의응답이 나오지 않는다. cache=False 면 조회/저장 모두 건너뜀.
+# council 이 받지 않는 응답(is_valid_candidate 실패)은 저장하지 않고 그 route 의 실패로 센다 (TTL 동안 재생되지 않게).
+# 캐시에 없는 같은 키의 호출이 동시에 진행 중이면 그 결과를 기다린다 (single-flight, cache=False 여도).
+IN_FLIGHT = SingleFlight()
+
+class LatencyTracker:
+    """provider:모델 별 최근 호출 지연 (캐시 적중 제외). hedge 시점(p95) 계산용."""
+    def __init__(self, window: int = 200, min_samples: int = 20):
+        self.window = window
+        self.min_samples = min_samples
+        self._lock = threading.Lock()
+        self._samples: Dict[str, Deque[float]] = {}
+
+    def record(self, key: str, seconds: float) -> None:
+        with self._lock:
+            d = self._samples.get(key)
+            if d is None:
+                d = self._samples[key] = deque(maxlen=self.window)
+            d.append(seconds)
+
+    def quantile(self, key: str, q: float) -> Optional[float]:
+        """표본이 min_samples 미만이면 None"""
+        with self._lock:
+            d = list(self._samples.get(key) or ())
+        if len(d) < self.min_samples:
+            return None
+        d.sort()
+        return d[min(len(d) - 1, int(q * (len(d) - 1) + 0.5))]
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        out = {}
+        with self._lock:
+            keys = list(self._samples)
+        for k in keys:
+            with self._lock:
+                d = sorted(self._samples[k])
+            out[k] = {"n": len(d), "p50_ms": round(d[len(d) // 2] * 1000, 1),
+                      "p95_ms": round(d[min(len(d) - 1, int(0.95 * (len(d) - 1) + 0.5))] * 1000, 1)}
+        return out
+
+LATENCY = LatencyTracker()
+ROUTES = RouteTable()  # route 별 EWMA 지연/오류율 + circuit breaker (route_call 의 순서 결정)
+
+def route_state() -> Dict[str, Dict[str, Any]]:
+    return ROUTES.state()
+
+class _Report:
+    """
+    스레드 호출 1건의 결과를 ROUTES 에 누가 기록할지: 호출을 포기한 쪽(시간 초과/deadline/quorum 패배)과
+    늦게 끝난 _fetch 중 먼저 claim 한 쪽만. 포기한 뒤 끝난 호출이 record_success 로 연속 실패를 되돌리거나
+    (circuit 이 영영 안 열림) 같은 호출을 두 번 세거나 캐시에 쓰지 않게 한다.
+    """
+    __slots__ = ("_lock", "_claimed")
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._claimed = False
+
+    def claim(self) -> bool:
+        with self._lock:
+            if self._claimed:
+                return False
+            self._claimed = True
+            return True
+
+def _owns(report: Optional[_Report]) -> bool:
+    return report is None or report.claim()
+
+def _fetch(provider: str, p: ProviderBase, name: str, messages: List[Dict[str, str]],
+           temperature: float, key: str, cache: bool, report: Optional[_Report] = None) -> str:
+    lim = LIMITERS.get(provider)
+    if lim is not None:
+        lim.acquire(estimate_tokens(messages))
+    rkey = f"{provider}:{name}"
+    t0 = time.monotonic()
+    try:
+        text = p.call(name, messages, temperature)
+    except Exception:
+        if _owns(report):
+            ROUTES.record_failure(rkey)
+        raise
+    took = time.monotonic() - t0
+    LATENCY.record(rkey, took)  # 실제 왕복 시간이므로 호출자가 포기했어도 hedge p95 표본에는 넣는다
+    if not _owns(report):
+        return text  # 호출자가 이미 포기하고 실패/지연으로 기록함
+    if is_valid_candidate(text):
+        ROUTES.record_success(rkey, took)
+        if cache:
+            RESPONSE_CACHE.put(key, text, provider=provider, name=name)
+    else:
+        ROUTES.record_failure(rkey)  # 품질 실패는 실제 왕복에서만 (캐시 적중/follower 는 다시 세지 않음)
+    return text
+
+async def _afetch(provider: str, p: ProviderBase, name: str, messages: List[Dict[str, str]],
+                  temperature: float, key: str, cache: bool) -> str:
+    from core_engine.aio import run_io
+    lim = LIMITERS.get(provider)
+    if lim is not None:
+        await lim.aacquire(estimate_tokens(messages))
+    rkey = f"{provider}:{name}"
+    t0 = time.monotonic()
+    try:
+        text = await p.acall(name, messages, temperature)
+    except asyncio.CancelledError:  # 실패로 세지는 않지만 "적어도 이만큼 걸림" 은 남긴다 (시간 초과는 호출한 쪽이 실패로 기록)
+        ROUTES.record_latency(rkey, time.monotonic() - t0)
+        raise
+    except Exception:
+        ROUTES.record_failure(rkey)
+        raise
+    took = time.monotonic() - t0
+    LATENCY.record(rkey, took)
+    if is_valid_candidate(text):
+        ROUTES.record_success(rkey, took)
+        if cache:
+            await run_io(RESPONSE_CACHE.put, key, text, provider=provider, name=name)
+    else:
+        ROUTES.record_failure(rkey)
+    return text
+
+def _cached_call(provider: str, p: ProviderBase, name: str, messages: List[Dict[str, str]],
+                 temperature: float, cache: bool, report: Optional[_Report] = None) -> str:
+    key = cache_key(provider, name, messages, temperature, p.live())
+    if cache:
+        text = RESPONSE_CACHE.get(key)
+        if text is not None:
+            return text
+    else:
+        RESPONSE_CACHE.note_bypass()
+    return IN_FLIGHT.do(key, _fetch, provider, p, name, messages, temperature, key, cache, report)
+
+async def _acached_call(provider: str, p: ProviderBase, name: str, messages: List[Dict[str, str]],
+                        temperature: float, cache: bool) -> str:
+    key = cache_key(provider, name, messages, temperature, p.live())
+    if cache:
+        from core_engine.aio import run_io
+        text = await run_io(RESPONSE_CACHE.get, key)  # 디스크 단 조회가 이벤트 루프를 막지 않게
+        if text is not None:
+            return text
+    else:
+        RESPONSE_CACHE.note_bypass()
+    return await IN_FLIGHT.ado(key, _afetch, provider, p, name, messages, temperature, key, cache)
+
+def model_call(provider: str, name: str, messages: List[Dict[str, str]], temperature: float = 0.2,
+               *, deadline: Optional[Deadline] = None, cache: bool = True) -> str:
     p = PROVIDERS.get(provider)
     if not p:
         raise ValueError(f"Unknown provider: {provider}")
-    return p.call(name, messages, temperature)
\ No newline at end of file
+    if deadline is None:
+        return _cached_call(provider, p, name, messages, temperature, cache)
+    stage = f"model_call:{provider}"
+    deadline.check(stage)
+    t0 = time.monotonic()
+    report = _Report()
+    fut = _submit(_cached_call, provider, p, name, messages, temperature, cache, report)
+    try:
+        return fut.result(timeout=deadline.timeout())
+    except FutureTimeout:
+        fut.cancel()
+        if report.claim():
+            ROUTES.record_latency(f"{provider}:{name}", time.monotonic() - t0)
+        raise DeadlineExceeded(stage)
+
+async def amodel_call(provider: str, name: str, messages: List[Dict[str, str]], temperature: float = 0.2,
+                      *, deadline: Optional[Deadline] = None, cache: bool = True) -> str:
+    """model_call 의 async 판. deadline 이 있으면 남은 시간만큼만 기다린다."""
+    p = PROVIDERS.get(provider)
+    if not p:
+        raise ValueError(f"Unknown provider: {provider}")
+    if deadline is None:
+        return await _acached_call(provider, p, name, messages, temperature, cache)
+    stage = f"model_call:{provider}"
+    deadline.check(stage)
+    try:
+        return await asyncio.wait_for(_acached_call(provider, p, name, messages, temperature, cache),
+                                      timeout=deadline.timeout())
+    except asyncio.TimeoutError:
+        raise DeadlineExceeded(stage)
+
+# ---------- fan-out / council ----------
+# config 의 cutoffs.routes.<stage> 에 있는 모든 provider 를 동시에 호출해 후보를 모으고 council 로 합친다.
+# 전체 지연 = 가장 느린 (시간 안에 온) 응답. route 마다 timeout_s (없으면 timeout 인자), deadline 이 있으면 그보다 짧게.
+#   routes = stage_routes(cfg, "qgen")
+#   text = council_call(routes, messages, deadline=dl)       # 또는 route_call(cfg, "qgen", messages)
+DEFAULT_ROUTE_TIMEOUT = 30.0
+
+def stage_routes(cfg: Optional[Dict[str, Any]], stage: str) -> List[Dict[str, Any]]:
+    """cfg.cutoffs.routes.<stage> -> [{"provider", "name", ...}] (형식이 틀린 항목은 무시)"""
+    routes = (((cfg or {}).get("cutoffs") or {}).get("routes") or {}).get(stage) or []
+    return [r for r in routes if isinstance(r, dict) and r.get("provider")]
+
+def _candidate(route: Dict[str, Any]) -> Dict[str, Any]:
+    return {"provider": route.get("provider"), "name": route.get("name"), "text": None, "error": None, "ms": None}
+
+def fanout_call(routes: List[Dict[str, Any]], messages: List[Dict[str, str]], temperature: float = 0.2,
+                *, timeout: float = DEFAULT_ROUTE_TIMEOUT, deadline: Optional[Deadline] = None,
+                cache: bool = True) -> List[Dict[str, Any]]:
+    """
+    routes 를 동시에 호출. route 순서대로 {"provider", "name", "text", "error", "ms"} 를 돌려준다.
+    실패/시간 초과는 예외 대신 error 에 남긴다 (시간 초과된 스레드는 버려짐).
+    """
+    if deadline is not None:
+        deadline.check("model_fanout")
+    t0 = time.monotonic()
+    out = [_candidate(r) for r in routes]
+    futs: Dict[Any, int] = {}
+    reports: Dict[int, _Report] = {}
+    limits: Dict[int, float] = {}
+    ends: Dict[int, float] = {}  # 완료 시각 (콜백에서 기록; 시간 초과 후 끝난 호출은 out 에 반영 안 됨)
+    for i, r in enumerate(routes):
+        p = PROVIDERS.get(r.get("provider"))
+        if p is None:
+            out[i]["error"] = f"Unknown provider: {r.get('provider')}"
+            continue
+        limits[i] = float(r.get("timeout_s") or timeout)
+        reports[i] = _Report()
+        fut = _submit(_cached_call, r["provider"], p, r.get("name"), messages, temperature, cache, reports[i])
+        fut.add_done_callback(lambda _f, i=i: ends.__setitem__(i, time.monotonic()))
+        futs[fut] = i
+
+    pending = set(futs)
+    while pending:
+        elapsed = time.monotonic() - t0
+        wait_s = min(limits[futs[f]] for f in pending) - elapsed
+        if deadline is not None:
+            wait_s = min(wait_s, deadline.remaining())
+        done, pending = wait(pending, timeout=max(0.0, wait_s), return_when=FIRST_COMPLETED)
+        for f in done:
+            c = out[futs[f]]
+            c["ms"] = round((ends.get(futs[f], time.monotonic()) - t0) * 1000, 1)
+            try:
+                c["text"] = f.result()
+            except Exception as e:  # provider 하나의 실패가 나머지를 막지 않게
+                c["error"] = f"{type(e).__name__}: {e}"
+        elapsed = time.monotonic() - t0
+        late = deadline is not None and deadline.expired()
+        for f in [f for f in pending if late or limits[futs[f]] <= elapsed]:
+            f.cancel()
+            i = futs[f]
+            if reports[i].claim():  # 방금 끝난 호출이면 _fetch 가 이미 기록함
+                if late:
+                    ROUTES.record_latency(route_key(routes[i]), elapsed)
+                else:
+                    ROUTES.record_failure(route_key(routes[i]))
+            out[i]["error"] = "deadline exceeded" if late else f"timeout after {limits[i]:.1f}s"
+            pending.discard(f)
+    return out
+
+async def afanout_call(routes: List[Dict[str, Any]], messages: List[Dict[str, str]], temperature: float = 0.2,
+                       *, timeout: float = DEFAULT_ROUTE_TIMEOUT,
+                       deadline: Optional[Deadline] = None, cache: bool = True) -> List[Dict[str, Any]]:
+    """fanout_call 의 async 판 (provider 의 acall 을 gather)."""
+    if deadline is not None:
+        deadline.check("model_fanout")
+    t0 = time.monotonic()
+
+    async def one(route: Dict[str, Any]) -> Dict[str, Any]:
+        c = _candidate(route)
+        p = PROVIDERS.get(route.get("provider"))
+        if p is None:
+            c["error"] = f"Unknown provider: {route.get('provider')}"
+            return c
+        limit = float(route.get("timeout_s") or timeout)
+        if deadline is not None:
+            limit = deadline.timeout(limit)
+        try:
+            c["text"] = await asyncio.wait_for(
+                _acached_call(route["provider"], p, route.get("name"), messages, temperature, cache), timeout=limit)
+        except asyncio.TimeoutError:
+            if deadline is not None and deadline.expired():
+                c["error"] = "deadline exceeded"
+            else:
+                ROUTES.record_failure(route_key(route))
+                c["error"] = f"timeout after {limit:.1f}s"
+        except Exception as e:
+            c["error"] = f"{type(e).__name__}: {e}"
+        c["ms"] = round((time.monotonic() - t0) * 1000, 1)
+        return c
+
+    return list(await asyncio.gather(*(one(r) for r in routes)))
+
+def _merge(candidates: List[Dict[str, Any]], merge: Callable[[List[str]], str],
+           deadline: Optional[Deadline]) -> str:
+    texts = [c["text"] for c in candidates if c["text"] is not None]
+    if not texts:
+        if deadline is not None and deadline.expired():
+            raise DeadlineExceeded("model_fanout")
+        errors = "; ".join(f"{c['provider']}: {c['error']}" for c in candidates)
+        raise RuntimeError(f"all providers failed ({errors})")
+    return merge(texts)
+
+def council_call(routes: List[Dict[str, Any]], messages: List[Dict[str, str]], temperature: float = 0.2,
+                 *, timeout: float = DEFAULT_ROUTE_TIMEOUT, deadline: Optional[Deadline] = None,
+                 merge: Optional[Callable[[List[str]], str]] = None, cache: bool = True) -> str:
+    """fanout_call 로 모은 후보(route 순서)를 council.simple_council_merge 로 합침. 전부 실패면 RuntimeError."""
+    from core_engine.council import simple_council_merge
+    candidates = fanout_call(routes, messages, temperature, timeout=timeout, deadline=deadline, cache=cache)
+    return _merge(candidates, merge or simple_council_merge, deadline)
+
+async def acouncil_call(routes: List[Dict[str, Any]], messages: List[Dict[str, str]], temperature: float = 0.2,
+                        *, timeout: float = DEFAULT_ROUTE_TIMEOUT, deadline: Optional[Deadline] = None,
+                        merge: Optional[Callable[[List[str]], str]] = None, cache: bool = True) -> str:
+    from core_engine.council import simple_council_merge
+    candidates = await afanout_call(routes, messages, temperature, timeout=timeout, deadline=deadline, cache=cache)
+    return _merge(candidates, merge or simple_council_merge, deadline)
+
+# ---------- quorum / hedge ----------
+# 유효 후보(council.is_valid_candidate)가 k 개 모이면 바로 끝내고 남은 호출은 취소한다.
+# hedge=True 면 처음엔 k 개 route 만 보내고, 진행 중인 호출이 그 provider 의 p95 지연
+# (표본이 적으면 route.hedge_after_s 또는 DEFAULT_HEDGE_AFTER) 을 넘기거나 실패하면 다음 route 를 추가로 보낸다.
+# → 꼬리 지연은 가장 느린 provider 가 아니라 가장 빠른 정상 provider 를 따른다.
+# (스레드에서 이미 돌기 시작한 동기 호출은 중단할 수 없어 결과만 버린다. 늦게 끝나도 route 상태/응답 캐시에는 남기지 않는다 — _Report)
+DEFAULT_HEDGE_AFTER = 2.0
+MIN_HEDGE_AFTER = 0.05  # p95 가 아주 작아도 바로 hedge 하지는 않게
+
+def hedge_after(route: Dict[str, Any]) -> float:
+    if route.get("hedge_after_s"):
+        return float(route["hedge_after_s"])
+    p95 = LATENCY.quantile(f"{route.get('provider')}:{route.get('name')}", 0.95)
+    return max(p95, MIN_HEDGE_AFTER) if p95 is not None else DEFAULT_HEDGE_AFTER
+
+def _finish(valid: List[str], errors: List[str], merge: Optional[Callable[[List[str]], str]],
+            deadline: Optional[Deadline]) -> str:
+    from core_engine.council import simple_council_merge
+    if not valid:
+        if deadline is not None and deadline.expired():
+            raise DeadlineExceeded("model_quorum")
+        raise RuntimeError(f"no valid candidate ({'; '.join(errors) or 'no routes'})")
+    return (merge or simple_council_merge)(valid)
+
+def quorum_call(routes: List[Dict[str, Any]], messages: List[Dict[str, str]], temperature: float = 0.2,
+                *, k: int = 1, hedge: bool = True, timeout: float = DEFAULT_ROUTE_TIMEOUT,
+                deadline: Optional[Deadline] = None, cache: bool = True,
+                merge: Optional[Callable[[List[str]], str]] = None) -> str:
+    """유효 후보 k 개(도착 순)를 council merge 로 합침. 시간 안에 k 개가 안 되면 모인 것만, 하나도 없으면 RuntimeError."""
+    if deadline is not None:
+        deadline.check("model_quorum")
+    k = max(1, min(int(k), len(routes) or 1))
+    queue = list(routes)
+    running: Dict[Any, Tuple[Dict[str, Any], float, float, float]] = {}  # future -> (route, hedge 시각, 마감 시각, 시작)
+    reports: Dict[Any, _Report] = {}
+    valid: List[str] = []
+    errors: List[str] = []
+
+    def launch() -> None:
+        while queue:
+            r = queue.pop(0)
+            p = PROVIDERS.get(r.get("provider"))
+            if p is None:
+                errors.append(f"{r.get('provider')}: unknown provider")
+                continue
+            now = time.monotonic()
+            report = _Report()
+            fut = _submit(_cached_call, r["provider"], p, r.get("name"), messages, temperature, cache, report)
+            reports[fut] = report
+            running[fut] = (r, now + hedge_after(r) if hedge else math.inf, now + float(r.get("timeout_s") or timeout), now)
+            return
+
+    for _ in range(k if hedge else len(routes)):
+        launch()
+    while running and len(valid) < k:
+        now = time.monotonic()
+        wake = min(min(v[1] for v in running.values()) if queue else math.inf,
+                   min(v[2] for v in running.values()))
+        if deadline is not None:
+            wake = min(wake, now + deadline.remaining())
+        done, _ = wait(set(running), timeout=max(0.0, wake - now), return_when=FIRST_COMPLETED)
+        for f in done:
+            r = running.pop(f)[0]
+            try:
+                text = f.result()
+            except Exception as e:
+                errors.append(f"{r['provider']}: {type(e).__name__}: {e}")
+                launch()
+                continue
+            if is_valid_candidate(text):
+                valid.append(text)
+            else:
+                errors.append(f"{r['provider']}: invalid candidate")
+                launch()
+        if deadline is not None and deadline.expired():
+            break
+        now = time.monotonic()
+        for f, (r, h, d, t0) in list(running.items()):
+            if d <= now:
+                f.cancel()
+                running.pop(f)
+                if reports[f].claim():
+                    ROUTES.record_failure(route_key(r))
+                errors.append(f"{r['provider']}: timeout")
+                launch()
+            elif queue and h <= now:
+                running[f] = (r, math.inf, d, t0)  # 호출 하나당 hedge 는 한 번
+                launch()
+    now = time.monotonic()
+    for f, (r, _, _, t0) in running.items():
+        f.cancel()  # quorum 이 찼거나 deadline: 진 호출은 경과 시간만 지연으로 남긴다 (늦은 성공은 다시 세지 않음)
+        if reports[f].claim():
+            ROUTES.record_latency(route_key(r), now - t0)
+    return _finish(valid[:k], errors, merge, deadline)
+
+async def aquorum_call(routes: List[Dict[str, Any]], messages: List[Dict[str, str]], temperature: float = 0.2,
+                       *, k: int = 1, hedge: bool = True, timeout: float = DEFAULT_ROUTE_TIMEOUT,
+                       deadline: Optional[Deadline] = None, cache: bool = True,
+                       merge: Optional[Callable[[List[str]], str]] = None) -> str:
+    """quorum_call 의 async 판. 끝나면 남은 task 를 취소한다 (provider 호출까지 취소됨)."""
+    if deadline is not None:
+        deadline.check("model_quorum")
+    k = max(1, min(int(k), len(routes) or 1))
+    queue = list(routes)
+    running: Dict["asyncio.Task[str]", Tuple[Dict[str, Any], float, float]] = {}
+    valid: List[str] = []
+    errors: List[str] = []
+
+    def launch() -> None:
+        while queue:
+            r = queue.pop(0)
+            p = PROVIDERS.get(r.get("provider"))
+            if p is None:
+                errors.append(f"{r.get('provider')}: unknown provider")
+                continue
+            now = time.monotonic()
+            task = asyncio.ensure_future(_acached_call(r["provider"], p, r.get("name"), messages, temperature, cache))
+            running[task] = (r, now + hedge_after(r) if hedge else math.inf, now + float(r.get("timeout_s") or timeout))
+            return
+
+    for _ in range(k if hedge else len(routes)):
+        launch()
+    try:
+        while running and len(valid) < k:
+            now = time.monotonic()
+            wake = min(min(h for _, h, _ in running.values()) if queue else math.inf,
+                       min(d for _, _, d in running.values()))
+            if deadline is not None:
+                wake = min(wake, now + deadline.remaining())
+            done, _ = await asyncio.wait(set(running), timeout=max(0.0, wake - now),
+                                         return_when=asyncio.FIRST_COMPLETED)
+            for t in done:
+                r, _, _ = running.pop(t)
+                if t.exception() is not None:
+                    e = t.exception()
+                    errors.append(f"{r['provider']}: {type(e).__name__}: {e}")
+                    launch()
+                elif is_valid_candidate(t.result()):
+                    valid.append(t.result())
+                else:
+                    errors.append(f"{r['provider']}: invalid candidate")
+                    launch()
+            if deadline is not None and deadline.expired():
+                break
+            now = time.monotonic()
+            for t, (r, h, d) in list(running.items()):
+                if d <= now:
+                    t.cancel()  # 경과 시간은 _afetch 가 취소될 때 남긴다
+                    running.pop(t)
+                    ROUTES.record_failure(route_key(r))
+                    errors.append(f"{r['provider']}: timeout")
+                    launch()
+                elif queue and h <= now:
+                    running[t] = (r, math.inf, d)
+                    launch()
+    finally:
+        for t in running:
+            t.cancel()
+    return _finish(valid[:k], errors, merge, deadline)
+
+def route_call(cfg: Optional[Dict[str, Any]], stage: str, messages: List[Dict[str, str]], temperature: float = 0.2,
+               *, deadline: Optional[Deadline] = None, cache: bool = True) -> str:
+    """
+    도메인 config 대로 호출. route 순서는 고정 목록이 아니라 ROUTES.rank (빠르고 건강한 route 먼저,
+    circuit 이 열린 route 는 제외, half-open route 는 주기적으로 probe).
+    모든 route 의 circuit 이 열려 있으면 provider 를 부르지 않고 바로 route_health.CircuitOpen (retry_after 포함).
+    cutoffs.council 이 켜져 있고 route 가 둘 이상이면 quorum_call
+    (k = cutoffs.council_k, 기본 1 / hedge = cutoffs.hedge, 기본 켜짐),
+    아니면 순서대로 model_call 하고 실패하면 다음 route 로 넘어간다.
+    """
+    routes = stage_routes(cfg, stage)
+    if not routes:
+        raise ValueError(f"no routes configured for stage {stage!r}")
+    ranked = ROUTES.rank(routes)
+    cut = (cfg or {}).get("cutoffs") or {}
+    if cut.get("council") and len(ranked) > 1:
+        return quorum_call(ranked, messages, temperature, k=int(cut.get("council_k") or 1),
+                           hedge=cut.get("hedge", True) is not False, deadline=deadline, cache=cache)
+    errors: List[str] = []
+    for r in ranked:
+        try:
+            return model_call(r["provider"], r.get("name"), messages, temperature, deadline=deadline, cache=cache)
+        except DeadlineExceeded:
+            raise
+        except Exception as e:
+            errors.append(f"{r['provider']}: {type(e).__name__}: {e}")
+    raise RuntimeError(f"all routes failed for stage {stage!r} ({'; '.join(errors)})")
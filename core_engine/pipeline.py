@@ -0,0 +1,144 @@
+# core_engine/pipeline.py
+from __future__ import annotations
+
+import time
+from typing import Any, Dict, Iterator, List, Tuple
+
+from core_engine.admission import admitted
+from core_engine.deadline import Deadline
+from core_engine.profiling import StageProfiler, stage
+from core_engine.startup_profile import mark_first_stage
+from core_engine.qmand_engine import run_qmand_pipeline
+from core_engine.qgen_engine import run_qgen_pipeline
+from core_engine.stratos_evaluator import evaluate_strategy
+from core_engine.save_strategy import save_strategy, _to_jsonable
+
+EXPORT_CHOICES = ["md", "html", "pdf", "all"]  # 내장 포맷. 플러그인 포맷은 export_choices() 참고
+
+
+@admitted("run")
+def run_once(
+    domain: str,
+    user_input: str,
+    *,
+    cfg: Dict[str, Any] | None = None,
+    out_dir: str | None = None,
+    quiet: bool = False,
+    deadline: Deadline | None = None,
+    profiler: StageProfiler | None = None,
+) -> Tuple[Dict[str, Any], Any, str]:
+    """QGEN → STRATOS → SAVE (profiler 가 있으면 단계별로 cProfile 캡처). admission "run" 게이트 뒤에서 실행."""
+    mark_first_stage("qgen")
+    with stage(profiler, "qgen"):
+        strategy = run_qgen_pipeline(domain, user_input, cfg=cfg, deadline=deadline)
+    with stage(profiler, "stratos"):
+        evaluation = evaluate_strategy(domain, strategy, cfg=cfg, deadline=deadline)
+    with stage(profiler, "save"):
+        out_dir = save_strategy(domain, strategy, evaluation, out_dir=out_dir, quiet=quiet, deadline=deadline)
+    return strategy, evaluation, out_dir
+
+
+def export_choices() -> List[str]:
+    """등록된 모든 포맷(플러그인 포함) + 'all'. reportlab 은 로드하지 않는다."""
+    from tools.export_report import available_formats
+    return available_formats() + ["all"]
+
+
+def export_formats(export: str | None) -> List[str]:
+    """--export 값(포맷명 | 'all' | None) -> 실제 포맷 목록. 'all' 은 내장 포맷(md/html/pdf)."""
+    if not export:
+        return []
+    if export == "all":
+        from tools.export_report import BUILTIN_FORMATS
+        return list(BUILTIN_FORMATS)
+    return [export]
+
+
+def iter_exports(
+    strategy: Any,
+    evaluation: Any,
+    out_dir: str,
+    export: str | None,
+    *,
+    open_file: bool = False,
+    debug: bool = False,
+    quiet: bool = False,
+    logo_path: str | None = None,
+    deadline: Deadline | None = None,
+    profiler: StageProfiler | None = None,
+) -> Iterator[Tuple[str, str]]:
+    """
+    포맷별로 내보내면서 (format, path) 를 하나씩 yield. deadline 때문에 건너뛴 포맷은 path 가 "".
+    각 백엔드는 exporter 레지스트리에서 첫 사용 시 로드된다 (pdf 를 안 쓰면 reportlab 도 안 읽음).
+    """
+    from tools.export_report import get_exporter
+
+    for fmt in export_formats(export):
+        with stage(profiler, f"export_{fmt}"):
+            fn = get_exporter(fmt)  # 백엔드 지연 로드 비용도 해당 export 단계에 포함
+            path = fn(strategy, evaluation, out_dir, open_file=open_file, debug=debug, quiet=quiet,
+                      logo_path=logo_path, deadline=deadline)
+        yield fmt, path
+
+
+def export_reports(
+    strategy: Any,
+    evaluation: Any,
+    out_dir: str,
+    export: str | None,
+    **kwargs: Any,
+) -> List[str]:
+    """선택된 포맷으로 리포트 내보내기. 생성된 파일 경로 목록 반환 (건너뛴 포맷 제외)."""
+    return [path for _, path in iter_exports(strategy, evaluation, out_dir, export, **kwargs) if path]
+
+
+def iter_stages(
+    domain: str,
+    user_input: str,
+    *,
+    cfg: Dict[str, Any] | None = None,
+    routing: Any = None,
+    export: str | None = None,
+    out_dir: str | None = None,
+    quiet: bool = True,
+    deadline: Deadline | None = None,
+    profiler: StageProfiler | None = None,
+) -> Iterator[Dict[str, Any]]:
+    """
+    QMAND → QGEN → STRATOS → SAVE → EXPORT 를 실행하면서
+    각 단계가 끝날 때마다 {"event", "data", "elapsed_ms"} 이벤트를 yield.
+    (서비스 스트리밍 응답 / UI 조기 표시용)
+    """
+    t0 = time.perf_counter()
+
+    def _ev(event: str, data: Any) -> Dict[str, Any]:
+        return {"event": event, "data": data, "elapsed_ms": round((time.perf_counter() - t0) * 1000, 1)}
+
+    mark_first_stage("qmand")
+    with stage(profiler, "qmand"):
+        qmand = run_qmand_pipeline(domain, user_input, cfg=cfg, routing=routing, deadline=deadline)
+    yield _ev("qmand", qmand)
+
+    with stage(profiler, "qgen"):
+        strategy = run_qgen_pipeline(domain, qmand, cfg=cfg, deadline=deadline)
+    yield _ev("qgen", strategy)
+
+    with stage(profiler, "stratos"):
+        evaluation = evaluate_strategy(domain, strategy, cfg=cfg, deadline=deadline)
+    yield _ev("stratos", _to_jsonable(evaluation))
+
+    with stage(profiler, "save"):
+        out_dir = save_strategy(domain, strategy, evaluation, out_dir=out_dir, quiet=quiet, deadline=deadline)
+    yield _ev("save", {"out_dir": out_dir})
+
+    for fmt, path in iter_exports(strategy, evaluation, out_dir, export, quiet=quiet, deadline=deadline,
+                                  profiler=profiler):
+        if path:
+            yield _ev("export", {"format": fmt, "path": path})
+        else:
+            yield _ev("export", {"format": fmt, "path": None, "skipped": "deadline"})
+
+    yield _ev("done", {"out_dir": out_dir})
+
+
+__all__ = ["run_once", "iter_stages", "iter_exports", "export_formats", "export_reports", "export_choices", "EXPORT_CHOICES"]
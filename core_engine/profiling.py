@@ -0,0 +1,105 @@
+# core_engine/profiling.py
+from __future__ import annotations
+
+import os
+import time
+from contextlib import contextmanager, nullcontext
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+# 단계별 cProfile 캡처.
+# with profiler.stage("qgen"): ...  로 감싼 구간마다 별도 프로파일을 잡고,
+# dump(out_dir) 하면 <stage>.pstats 와 flamegraph.pl / speedscope 용 <stage>.collapsed 를 쓴다.
+
+_Func = Tuple[str, int, str]  # (filename, lineno, funcname) — pstats 키
+
+
+class StageProfiler:
+    def __init__(self) -> None:
+        import cProfile  # 프로파일링할 때만 로드 (시작 시간 예산)
+        self._cProfile = cProfile
+        self.stages: Dict[str, Any] = {}   # name -> cProfile.Profile
+        self.wall_ms: Dict[str, float] = {}
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        prof = self._cProfile.Profile()
+        t0 = time.perf_counter()
+        prof.enable()
+        try:
+            yield
+        finally:
+            prof.disable()
+            self.wall_ms[name] = round((time.perf_counter() - t0) * 1000, 2)
+            self.stages[name] = prof
+
+    def dump(self, out_dir: str) -> List[str]:
+        """<out_dir>/<stage>.pstats, <stage>.collapsed 작성. 경로 목록 반환."""
+        import pstats
+        os.makedirs(out_dir, exist_ok=True)
+        paths: List[str] = []
+        for name, prof in self.stages.items():
+            p_stats = os.path.join(out_dir, f"{name}.pstats")
+            prof.dump_stats(p_stats)
+            p_coll = os.path.join(out_dir, f"{name}.collapsed")
+            with open(p_coll, "w", encoding="utf-8") as f:
+                for line in collapsed_stacks(pstats.Stats(prof).stats):  # type: ignore[attr-defined]
+                    f.write(line + "\n")
+            paths += [p_stats, p_coll]
+        return paths
+
+    def summary(self) -> Dict[str, float]:
+        return dict(self.wall_ms)
+
+
+def stage(profiler: Optional[StageProfiler], name: str):
+    """profiler 가 None 이면 아무것도 하지 않는 컨텍스트"""
+    return profiler.stage(name) if profiler is not None else nullcontext()
+
+
+def _label(func: _Func) -> str:
+    filename, lineno, name = func
+    if filename == "~":  # 내장 함수: ('~', 0, "<built-in method ...>")
+        return name
+    return f"{name} ({os.path.basename(filename)}:{lineno})"
+
+
+def collapsed_stacks(stats: Dict[_Func, Any], max_depth: int = 64, min_fraction: float = 0.001) -> List[str]:
+    """
+    pstats 호출 그래프 -> collapsed stack 라인("a;b;c <microseconds>").
+    cProfile 은 호출자-피호출자 간선만 기록하므로, 각 경로에 간선의 누적시간 비율로
+    시간을 나눠 배분한다 (flameprof 방식 근사). 재귀는 경로상 중복 노드에서 끊는다.
+    경로 수가 폭발하지 않도록 전체의 min_fraction 미만인 경로는 더 내려가지 않는다.
+    """
+    callees: Dict[_Func, List[Tuple[_Func, float]]] = {}
+    for func, (_cc, _nc, _tt, _ct, callers) in stats.items():
+        for caller, edge in callers.items():
+            callees.setdefault(caller, []).append((func, edge[3]))  # edge = (cc, nc, tt, ct)
+
+    totals: Dict[str, float] = {}
+    roots = [f for f, v in stats.items() if not v[4]]
+    min_t = sum(stats[r][3] for r in roots) * min_fraction
+
+    def walk(func: _Func, t: float, path: Tuple[_Func, ...], labels: Tuple[str, ...]) -> None:
+        ct = stats[func][3]
+        frac = (t / ct) if ct > 0 else 0.0
+        key = ";".join(labels)
+        totals[key] = totals.get(key, 0.0) + stats[func][2] * frac
+        if len(path) >= max_depth:
+            return
+        for child, edge_ct in callees.get(func, []):
+            if child in path or child not in stats or edge_ct * frac < min_t:
+                continue
+            walk(child, edge_ct * frac, path + (child,), labels + (_label(child),))
+
+    for root in roots:
+        walk(root, stats[root][3], (root,), (_label(root),))
+
+    lines = []
+    for key, sec in totals.items():
+        us = int(round(sec * 1_000_000))
+        if us > 0:
+            lines.append(f"{key} {us}")
+    return lines
+
+
+__all__ = ["StageProfiler", "stage", "collapsed_stacks"]
@@ -1,6 +1,92 @@
+# core_engine/prompt_loader.py
+from __future__ import annotations
+
+import os
+import threading
 from pathlib import Path
-BASE = Path("prompts")
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+# 프롬프트 파일 로더 + 조립된 프롬프트 캐시.
+# 경로는 프로젝트 루트의 prompts/ (CWD 무관). 파일 내용은 (mtime, size) 가 바뀔 때만 다시 읽는다.
+# memo(key, build) 는 autoprompt 가 조립한 system 텍스트 등을 캐시한다. 키에 프롬프트 내용이 들어가므로
+# prompts/*.txt 가 바뀌면 자연히 새 키가 된다 (옛 항목은 MEMO_MAX 를 넘으면 비움).
+# stats() 로 hit / load / reload / missing, memo_hits / memo_misses 를 볼 수 있다.
+
+BASE = Path(__file__).resolve().parent.parent / "prompts"
+MEMO_MAX = 256
+
+_LOCK = threading.Lock()
+_FILES: Dict[str, Tuple[str, tuple, str]] = {}  # name -> (path, stamp, text)
+_MEMO: Dict[Hashable, Any] = {}
+_STATS: Dict[str, int] = {"hits": 0, "loads": 0, "reloads": 0, "missing": 0, "memo_hits": 0, "memo_misses": 0}
+
+
+def _count(key: str) -> None:
+    with _LOCK:
+        _STATS[key] += 1
+
+
+def _candidates(name: str):
+    # 예전 규칙 <name>.system.txt 와 실제 파일 이름 <name>_system.txt 둘 다
+    yield os.path.join(BASE, f"{name}.system.txt")
+    yield os.path.join(BASE, f"{name}_system.txt")
+
+
+def _stamp(path: str) -> Optional[tuple]:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+def load_prompt(name: str, default: str = "") -> str:
+    """prompts/<name>.system.txt (또는 <name>_system.txt). 없으면 default."""
+    hit = _FILES.get(name)
+    if hit is not None and _stamp(hit[0]) == hit[1]:  # 정상 경로: stat 1회
+        _count("hits")
+        return hit[2]
+    for path in _candidates(name):
+        stamp = _stamp(path)
+        if stamp is None:
+            continue
+        with open(path, "r", encoding="utf-8") as f:
+            text = f.read()
+        with _LOCK:
+            _STATS["reloads" if hit is not None else "loads"] += 1
+            _FILES[name] = (path, stamp, text)
+        return text
+    _count("missing")
+    return default
+
+
+def memo(key: Hashable, build: Callable[[], Any]) -> Any:
+    """key 로 조립 결과 캐시. build() 는 처음 한 번만."""
+    try:
+        v = _MEMO[key]
+    except KeyError:
+        pass
+    else:
+        _count("memo_hits")
+        return v
+    v = build()
+    with _LOCK:
+        _STATS["memo_misses"] += 1
+        if len(_MEMO) >= MEMO_MAX:
+            _MEMO.clear()
+        _MEMO[key] = v
+    return v
+
+
+def stats() -> Dict[str, int]:
+    with _LOCK:
+        return dict(_STATS, files=len(_FILES), memo=len(_MEMO))
+
+
+def clear() -> None:
+    with _LOCK:
+        _FILES.clear()
+        _MEMO.clear()
+
 
-def load_prompt(name: str, default: str="") -> str:
-    p = BASE / f"{name}.system.txt"
-    return p.read_text(encoding="utf-8") if p.exists() else default
\ No newline at end of file
+__all__ = ["load_prompt", "memo", "stats", "clear", "BASE"]
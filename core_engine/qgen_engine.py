@@ -2,31 +2,30 @@
 
 from __future__ import annotations
 
-import os
 from datetime import datetime
 from typing import Dict, Any, List
 
-import yaml
-
 from schemas.strategy import StrategyRequest, StructuredStrategy, ModuleMeta
+from core_engine import config_cache
+from core_engine.deadline import Deadline
 
 
 # ------------------------------------------------------------
 # 내부 유틸
 # ------------------------------------------------------------
+def _default_domain_config(domain: str) -> Dict[str, Any]:
+    # 최소 기본값
+    return {
+        "domain_name": domain,
+        "constraints": {"language": "ko-KR", "max_objectives": "7", "max_modules": "12"},
+        "kpis": [],
+        "flow_patterns": ["Discovery", "Design", "Delivery"],
+        "risks": ["데이터 부족", "리소스 병목"],
+    }
+
+
 def _load_domain_config(domain: str) -> Dict[str, Any]:
-    path = os.path.join("domains", domain, "config.yaml")
-    if not os.path.exists(path):
-        # 최소 기본값
-        return {
-            "domain_name": domain,
-            "constraints": {"language": "ko-KR", "max_objectives": "7", "max_modules": "12"},
-            "kpis": [],
-            "flow_patterns": ["Discovery", "Design", "Delivery"],
-            "risks": ["데이터 부족", "리소스 병목"],
-        }
-    with open(path, "r", encoding="utf-8") as f:
-        return yaml.safe_load(f) or {}
+    return config_cache.load_or_default(domain, _default_domain_config)
 
 
 def _normalize_constraints(d: Dict[str, Any] | None) -> Dict[str, str]:
@@ -98,13 +97,23 @@ def generate_strategy(payload: Dict[str, Any]) -> Dict[str, Any]:
     return _as_dict(strat)
 
 
-def run_qgen_pipeline(domain: str, qmand_or_text: Dict[str, Any] | str) -> Dict[str, Any]:
+def run_qgen_pipeline(
+    domain: str,
+    qmand_or_text: Dict[str, Any] | str,
+    *,
+    cfg: Dict[str, Any] | None = None,
+    deadline: Deadline | None = None,
+) -> Dict[str, Any]:
     """
     - qmand_or_text 가 dict 이면: QMAND 출력으로 간주 (user_input, constraints 등 포함)
     - qmand_or_text 가 str 이면: 그냥 사용자 입력 텍스트로 간주
+    - cfg: 미리 로드된 도메인 config (배치 워커 등). 없으면 파일에서 로드
+    - deadline: 요청 예산. 현재는 템플릿 경로(즉시 완료)뿐이라 그대로 진행하며,
+      LLM 경로가 붙으면 예산이 부족할 때 이 템플릿 경로가 폴백이 된다
     도메인 config와 병합하여 Strategy 템플릿 생성
     """
-    cfg = _load_domain_config(domain)
+    if cfg is None:
+        cfg = _load_domain_config(domain)
 
     if isinstance(qmand_or_text, dict):
         user_input = (
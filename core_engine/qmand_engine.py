@@ -2,26 +2,18 @@
 from __future__ import annotations
 
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, List, Tuple
 import datetime, json
 
-try:
-    import yaml
-except ImportError:
-    yaml = None
+from core_engine import config_cache
+from core_engine.admission import admitted
+from core_engine.deadline import Deadline
+from core_engine.keyword_matcher import KeywordMatcher, Match
 
 # ---------- utils ----------
 def _project_root() -> Path:
     return Path(__file__).resolve().parent.parent
 
-def _load_yaml(p: Path) -> Dict[str, Any]:
-    if not p.exists():
-        raise FileNotFoundError(f"config not found: {p}")
-    if yaml is None:
-        raise RuntimeError("PyYAML is required. pip install pyyaml")
-    with p.open("r", encoding="utf-8") as f:
-        return yaml.safe_load(f) or {}
-
 def _now_utc_iso() -> str:
     return datetime.datetime.utcnow().isoformat(timespec="seconds") + "Z"
 
@@ -30,33 +22,57 @@ def _normalize_user_input(raw: Any) -> str:
         return (raw.get("text", "") or "").strip()
     return (str(raw) if raw is not None else "").strip()
 
-def _detect_intent(text: str, routing_keywords: Dict[str, Any]) -> str:
-    tl = text.lower()
-    for intent, kws in (routing_keywords or {}).items():
-        if isinstance(kws, (list, tuple)):
-            for kw in kws:
-                if kw and kw.lower() in tl:
-                    return intent
-    return "strategy"
+def compile_routing_keywords(routing_keywords: Dict[str, Any]) -> KeywordMatcher:
+    """routing_keywords -> 컴파일된 매처 (dict 순서 = intent 우선순위). 상주 프로세스에서 config 버전당 1회."""
+    return KeywordMatcher.compile(routing_keywords or {})
+
+# routing 을 안 넘긴 호출용: 같은 routing_keywords dict (config_cache 의 버전별 객체) 면 매처 재사용
+_MATCHERS: Dict[int, Tuple[Dict[str, Any], KeywordMatcher]] = {}
+_MATCHERS_MAX = 32
+
+def _matcher_for(routing_keywords: Dict[str, Any]) -> KeywordMatcher:
+    hit = _MATCHERS.get(id(routing_keywords))
+    if hit is not None and hit[0] is routing_keywords:
+        return hit[1]
+    m = compile_routing_keywords(routing_keywords)
+    if len(_MATCHERS) >= _MATCHERS_MAX:
+        _MATCHERS.clear()
+    _MATCHERS[id(routing_keywords)] = (routing_keywords, m)
+    return m
+
+def _detect_intent(text: str, routing_keywords: Dict[str, Any],
+                   compiled: KeywordMatcher | None = None) -> str:
+    m = compiled if compiled is not None else _matcher_for(routing_keywords)
+    return m.first_label(text, default="strategy")
+
+def match_intents(text: str, cfg: Dict[str, Any], routing: KeywordMatcher | None = None) -> List[Match]:
+    """입력에서 매치된 모든 routing 키워드 (intent, 위치) — 한 번의 스캔"""
+    m = routing if routing is not None else _matcher_for(cfg.get("routing_keywords") or {})
+    return m.find_all(_normalize_user_input(text))
 
 # ---------- public API ----------
 def load_domain_config(domain: str) -> Dict[str, Any]:
-    base = _project_root()
-    cfg_path = base / "domains" / domain / "config.yaml"
-    return _load_yaml(cfg_path)
-
-def run_qmand_pipeline(domain: str, user_input: Any, *, language: str = "ko-KR") -> Dict[str, Any]:
-    cfg = load_domain_config(domain)
-
+    """공용 config 캐시에서 조회 (없으면 FileNotFoundError). 반환 dict 는 수정하지 말 것."""
+    return config_cache.get_domain_config(domain)
+
+def build_qmand_payload(
+    domain: str,
+    user_input: Any,
+    cfg: Dict[str, Any],
+    *,
+    language: str = "ko-KR",
+    routing: KeywordMatcher | None = None,
+) -> Dict[str, Any]:
+    """디스크 I/O 없는 QMAND 본체 (sync/async 공용)"""
     text = _normalize_user_input(user_input)
-    intent = _detect_intent(text, cfg.get("routing_keywords") or {})
+    intent = _detect_intent(text, cfg.get("routing_keywords") or {}, routing)
 
     constraints = dict(cfg.get("constraints") or {})
     constraints.setdefault("language", language)
 
     meta = {"domain": domain, "intent": intent, "timestamp": _now_utc_iso()}
 
-    qmand_payload = {
+    return {
         "domain": domain,
         "user_input": text,          # 문자열 보장
         "constraints": constraints,
@@ -64,16 +80,34 @@ def run_qmand_pipeline(domain: str, user_input: Any, *, language: str = "ko-KR")
         "meta": meta,
     }
 
-    # trace (best-effort)
+def write_qmand_trace(qmand_payload: Dict[str, Any], deadline: Deadline | None = None) -> None:
+    """trace (best-effort) — 예산이 이미 소진됐으면 건너뜀"""
+    if deadline is not None and deadline.expired():
+        return
     try:
         trace_dir = _project_root() / "output" / "_trace"
         trace_dir.mkdir(parents=True, exist_ok=True)
-        (trace_dir / f"qmand_{meta['timestamp'].replace(':','')}.json").write_text(
+        ts = qmand_payload["meta"]["timestamp"]
+        (trace_dir / f"qmand_{ts.replace(':','')}.json").write_text(
             json.dumps(qmand_payload, ensure_ascii=False, indent=2), encoding="utf-8"
         )
     except Exception:
         pass
 
+@admitted("qmand")
+def run_qmand_pipeline(
+    domain: str,
+    user_input: Any,
+    *,
+    language: str = "ko-KR",
+    cfg: Dict[str, Any] | None = None,
+    routing: KeywordMatcher | None = None,
+    deadline: Deadline | None = None,
+) -> Dict[str, Any]:
+    if cfg is None:
+        cfg = load_domain_config(domain)
+    qmand_payload = build_qmand_payload(domain, user_input, cfg, language=language, routing=routing)
+    write_qmand_trace(qmand_payload, deadline)
     return qmand_payload
 
-__all__ = ["run_qmand_pipeline", "load_domain_config"]
\ No newline at end of file
+__all__ = ["run_qmand_pipeline", "build_qmand_payload", "write_qmand_trace", "load_domain_config", "compile_routing_keywords", "match_intents"]
\ No newline at end of file
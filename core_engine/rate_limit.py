@@ -0,0 +1,383 @@
+# core_engine/rate_limit.py
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import heapq
+import itertools
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+# provider 별 호출 한도 (초당 요청 수 + 분당 토큰 수) 토큰 버킷과 우선순위 대기열.
+# 한도를 넘는 호출은 provider 로 보내지 않고 여기서 기다린다 (429 폭주 방지).
+# 대기열은 (우선순위, 도착 순) — INTERACTIVE 가 BATCH 보다 항상 먼저 나간다.
+#   with priority(BATCH): ...           # 이 블록 안의 model_call 은 batch 우선순위
+#   set_default_priority(BATCH)         # 배치/큐 워커 프로세스 전체 기본값
+# 기본은 프로세스별 버킷. KAI_RATE_LIMIT_SHARED=1 이면 한 호스트의 모든 프로세스(서비스, 배치 워커, 큐 워커)가
+# 버킷을 함께 쓴다 (실제 provider 키로 여러 프로세스를 띄울 때):
+#   output/_cache/ratelimit/<provider>.json 에 잔량을 두고 <provider>.lock (flock) 안에서 꺼낸다.
+#   다른 프로세스에 INTERACTIVE 요청이 한도 때문에 기다리는 중이면 BATCH 는 버킷에서 꺼내지 않고 양보한다.
+#   파일 잠금/입출력은 _cond 밖에서 (async 는 aio.run_io 로) — 같은 프로세스의 다른 대기자나 이벤트 루프를 막지 않게.
+#   KAI_RATE_LIMIT_DIR 로 위치 변경.
+#   KAI_PROVIDER_LIMITS="openai=5:90000,anthropic=2:40000"   (rps:tpm, tpm 생략 가능)
+
+INTERACTIVE = 0
+BATCH = 10
+PRIORITY_NAMES = {INTERACTIVE: "interactive", BATCH: "batch"}
+
+# provider -> (requests/sec, tokens/min)
+DEFAULT_PROVIDER_LIMITS: Dict[str, Tuple[float, float]] = {
+    "openai": (10.0, 200_000.0),
+    "anthropic": (5.0, 100_000.0),
+    "gemini": (10.0, 250_000.0),
+}
+DEFAULT_MAX_WAIT = 30.0
+DEFAULT_SHARED_DIR = Path(__file__).resolve().parent.parent / "output" / "_cache" / "ratelimit"
+INTERACTIVE_HOLD = 1.0    # 대화형 대기 표시의 유효 시간 (표시한 프로세스가 죽어도 배치가 영영 막히지 않게)
+YIELD_POLL = 0.05
+CHARS_PER_TOKEN = 2       # 한국어 위주 입력의 대략치
+DEFAULT_OUTPUT_TOKENS = 512
+
+_PRIORITY: contextvars.ContextVar[Optional[int]] = contextvars.ContextVar("kai_priority", default=None)
+_DEFAULT_PRIORITY = INTERACTIVE
+
+
+class RateLimited(Exception):
+    def __init__(self, provider: str, waited: float, retry_after: float):
+        super().__init__(f"[{provider}] rate limit queue wait exceeded ({waited:.1f}s, retry after {retry_after:.1f}s)")
+        self.provider = provider
+        self.retry_after = retry_after
+
+
+def current_priority() -> int:
+    p = _PRIORITY.get()
+    return _DEFAULT_PRIORITY if p is None else p
+
+
+def set_default_priority(p: int) -> None:
+    global _DEFAULT_PRIORITY
+    _DEFAULT_PRIORITY = p
+
+
+@contextmanager
+def priority(p: int) -> Iterator[None]:
+    token = _PRIORITY.set(p)
+    try:
+        yield
+    finally:
+        _PRIORITY.reset(token)
+
+
+def estimate_tokens(messages: List[Dict[str, str]], expected_output: int = DEFAULT_OUTPUT_TOKENS) -> int:
+    chars = sum(len(m.get("content") or "") for m in messages)
+    return max(1, chars // CHARS_PER_TOKEN) + expected_output
+
+
+class TokenBucket:
+    __slots__ = ("rate", "capacity", "level", "stamp")
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate          # 초당 충전량
+        self.capacity = capacity
+        self.level = capacity
+        self.stamp = time.monotonic()
+
+    def _refill(self, now: float) -> None:
+        self.level = min(self.capacity, self.level + (now - self.stamp) * self.rate)
+        self.stamp = now
+
+    def wait_for(self, n: float, now: float) -> float:
+        """n 만큼 꺼내려면 기다려야 하는 시간 (0 이면 지금 가능)"""
+        self._refill(now)
+        n = min(n, self.capacity)
+        return 0.0 if self.level >= n else (n - self.level) / self.rate
+
+    def take(self, n: float) -> None:
+        self.level -= min(n, self.capacity)
+
+
+class SharedBuckets:
+    """
+    요청/토큰 버킷 잔량을 파일에 두고 프로세스들이 잠금 안에서 함께 꺼낸다.
+    {"req", "tok", "stamp"(epoch), "interactive": {pid: 표시 만료 시각}}
+    """
+
+    def __init__(self, path: Path, rps: float, tpm: Optional[float]):
+        self.path = path
+        self.lock_path = path.with_suffix(".lock")
+        self.rps = rps
+        self.req_capacity = max(1.0, rps)
+        self.tpm = tpm
+        self._me = str(os.getpid())
+
+    def _load(self, now: float) -> Dict[str, Any]:
+        try:
+            st = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            st = {}
+        if not isinstance(st, dict):
+            st = {}
+        dt = max(0.0, now - float(st.get("stamp") or now))
+        req = float(st.get("req", self.req_capacity))
+        st["req"] = min(self.req_capacity, req + dt * self.rps)
+        if self.tpm:
+            tok = float(st.get("tok", self.tpm))
+            st["tok"] = min(self.tpm, tok + dt * self.tpm / 60.0)
+        st["stamp"] = now
+        marks = st.get("interactive") if isinstance(st.get("interactive"), dict) else {}
+        st["interactive"] = {k: v for k, v in marks.items() if isinstance(v, (int, float)) and v > now}
+        return st
+
+    def _save(self, st: Dict[str, Any]) -> None:
+        self.path.write_text(json.dumps(st), encoding="utf-8")
+
+    def poll(self, tokens: int, prio: int) -> float:
+        """꺼냈으면 0, 아니면 다시 볼 때까지의 시간"""
+        from core_engine.config_store import file_lock
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with file_lock(self.lock_path):
+            now = time.time()
+            st = self._load(now)
+            marks = st["interactive"]
+            if prio > INTERACTIVE and any(pid != self._me for pid in marks):
+                wait = YIELD_POLL  # 다른 프로세스의 대화형 요청이 먼저
+            else:
+                wait = 0.0 if st["req"] >= 1 else (1 - st["req"]) / self.rps
+                if self.tpm:
+                    n = min(tokens, self.tpm)
+                    wait = max(wait, 0.0 if st["tok"] >= n else (n - st["tok"]) / (self.tpm / 60.0))
+                if wait <= 0:
+                    st["req"] -= 1
+                    if self.tpm:
+                        st["tok"] -= min(tokens, self.tpm)
+                    marks.pop(self._me, None)
+                elif prio <= INTERACTIVE:
+                    marks[self._me] = now + max(INTERACTIVE_HOLD, wait * 2)
+            self._save(st)
+        return wait
+
+    def levels(self) -> Dict[str, float]:
+        from core_engine.config_store import file_lock
+
+        if not self.path.exists():
+            return {"req": self.req_capacity, "tok": self.tpm or 0.0}
+        with file_lock(self.lock_path):
+            st = self._load(time.time())
+        return {"req": st["req"], "tok": st.get("tok", 0.0)}
+
+
+class ProviderLimiter:
+    def __init__(self, name: str, rps: float, tpm: Optional[float] = None, max_wait: float = DEFAULT_MAX_WAIT,
+                 shared_dir: Optional[Path] = None):
+        self.name = name
+        self.rps = float(rps)
+        self.tpm = float(tpm) if tpm else None
+        self.max_wait = max_wait
+        self._req = TokenBucket(self.rps, max(1.0, self.rps))
+        self._tok = TokenBucket(self.tpm / 60.0, self.tpm) if self.tpm else None
+        # shared_dir 가 있으면 위 프로세스 로컬 버킷 대신 파일 버킷을 쓴다
+        self._shared = SharedBuckets(Path(shared_dir) / f"{name}.json", self.rps, self.tpm) if shared_dir else None
+        self._cond = threading.Condition()
+        self._heap: List[Tuple[int, int]] = []  # (priority, seq)
+        self._seq = itertools.count()
+        self._granted: Dict[int, int] = {}
+        self._rejected: Dict[int, int] = {}
+        self._wait_total: Dict[int, float] = {}
+        self._wait_max: Dict[int, float] = {}
+
+    # _cond 밖에서 호출. 차례가 와서 한도 안이면 꺼내고 None, 아니면 다시 볼 때까지의 시간
+    def _poll(self, entry: Tuple[int, int], tokens: int) -> Optional[float]:
+        with self._cond:
+            if self._heap[0] != entry:
+                return 0.05
+            if self._shared is None:
+                now = time.monotonic()
+                wait = self._req.wait_for(1, now)
+                if self._tok is not None:
+                    wait = max(wait, self._tok.wait_for(tokens, now))
+                if wait > 0:
+                    return wait
+                self._req.take(1)
+                if self._tok is not None:
+                    self._tok.take(tokens)
+                self._grant(entry)
+                return None
+        wait = self._shared.poll(tokens, entry[0])  # 파일 잠금은 _cond 없이 (차례인 호출만 여기까지 온다)
+        if wait > 0:
+            return wait
+        with self._cond:
+            self._grant(entry)
+        return None
+
+    def _grant(self, entry: Tuple[int, int]) -> None:
+        if self._heap[0] == entry:
+            heapq.heappop(self._heap)
+        else:  # 공유 버킷을 보는 사이 더 높은 우선순위가 들어옴 — 이미 꺼냈으므로 그대로 통과
+            self._heap.remove(entry)
+            heapq.heapify(self._heap)
+        self._cond.notify_all()
+
+    def _enter(self, prio: int) -> Tuple[int, int]:
+        entry = (prio, next(self._seq))
+        heapq.heappush(self._heap, entry)
+        return entry
+
+    def _leave(self, entry: Tuple[int, int], waited: float, ok: bool) -> None:
+        prio = entry[0]
+        if ok:
+            self._granted[prio] = self._granted.get(prio, 0) + 1
+            self._wait_total[prio] = self._wait_total.get(prio, 0.0) + waited
+            self._wait_max[prio] = max(self._wait_max.get(prio, 0.0), waited)
+            return
+        self._rejected[prio] = self._rejected.get(prio, 0) + 1
+        self._heap.remove(entry)
+        heapq.heapify(self._heap)
+        self._cond.notify_all()
+
+    def _retry_after(self) -> float:
+        return round(max(1.0, len(self._heap) / max(self.rps, 1e-6)), 1)
+
+    def acquire(self, tokens: int = 1, prio: Optional[int] = None, max_wait: Optional[float] = None) -> float:
+        """차례와 한도가 허락할 때까지 대기. 기다린 시간(초) 반환, max_wait 넘기면 RateLimited."""
+        prio = current_priority() if prio is None else prio
+        limit = self.max_wait if max_wait is None else max_wait
+        t0 = time.monotonic()
+        with self._cond:
+            entry = self._enter(prio)
+        try:
+            while True:
+                hint = self._poll(entry, tokens)
+                with self._cond:
+                    waited = time.monotonic() - t0
+                    if hint is None:
+                        self._leave(entry, waited, True)
+                        return waited
+                    if waited >= limit:
+                        self._leave(entry, waited, False)
+                        raise RateLimited(self.name, waited, self._retry_after())
+                    self._cond.wait(min(hint, limit - waited))
+        except BaseException:
+            self._abandon(entry, t0)
+            raise
+
+    async def aacquire(self, tokens: int = 1, prio: Optional[int] = None, max_wait: Optional[float] = None) -> float:
+        """acquire 의 async 판 (이벤트 루프를 막지 않도록 잠깐씩 잠들며 차례를 확인, 공유 버킷 입출력은 run_io)"""
+        from core_engine.aio import run_io
+
+        prio = current_priority() if prio is None else prio
+        limit = self.max_wait if max_wait is None else max_wait
+        t0 = time.monotonic()
+        with self._cond:
+            entry = self._enter(prio)
+        try:
+            while True:
+                if self._shared is not None:
+                    hint = await run_io(self._poll, entry, tokens)
+                else:
+                    hint = self._poll(entry, tokens)
+                with self._cond:
+                    waited = time.monotonic() - t0
+                    if hint is None:
+                        self._leave(entry, waited, True)
+                        return waited
+                    if waited >= limit:
+                        self._leave(entry, waited, False)
+                        raise RateLimited(self.name, waited, self._retry_after())
+                await asyncio.sleep(min(hint, 0.05, limit - waited))
+        except BaseException:  # 취소/파일 오류: 대기열에 남아 뒤 호출을 막지 않게
+            self._abandon(entry, t0)
+            raise
+
+    def _abandon(self, entry: Tuple[int, int], t0: float) -> None:
+        with self._cond:
+            if entry in self._heap:
+                self._leave(entry, time.monotonic() - t0, False)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._cond:
+            now = time.monotonic()
+            by_prio = {}
+            for prio in sorted(set(self._granted) | set(self._rejected) | {p for p, _ in self._heap}):
+                n = self._granted.get(prio, 0)
+                by_prio[PRIORITY_NAMES.get(prio, str(prio))] = {
+                    "queued": sum(1 for p, _ in self._heap if p == prio),
+                    "granted": n,
+                    "rejected": self._rejected.get(prio, 0),
+                    "wait_avg_ms": round(self._wait_total.get(prio, 0.0) / n * 1000, 2) if n else 0.0,
+                    "wait_max_ms": round(self._wait_max.get(prio, 0.0) * 1000, 2),
+                }
+            out: Dict[str, Any] = {"rps": self.rps, "tpm": self.tpm, "queue_depth": len(self._heap),
+                                   "shared": self._shared is not None, "priorities": by_prio}
+        if self._shared is not None:
+            lv = self._shared.levels()
+            out["requests_available"] = round(lv["req"], 2)
+            if self.tpm:
+                out["tokens_available"] = int(lv["tok"])
+            return out
+        with self._cond:
+            self._req._refill(now)
+            out["requests_available"] = round(self._req.level, 2)
+            if self._tok is not None:
+                self._tok._refill(now)
+                out["tokens_available"] = int(self._tok.level)
+        return out
+
+
+class RateLimiters:
+    def __init__(self, limits: Optional[Dict[str, Tuple[float, Optional[float]]]] = None,
+                 max_wait: float = DEFAULT_MAX_WAIT, shared_dir: Optional[Path] = None):
+        self.max_wait = max_wait
+        self.shared_dir = shared_dir
+        self._lock = threading.Lock()
+        self._limiters: Dict[str, ProviderLimiter] = {}
+        self.configure(limits)
+
+    def configure(self, limits: Optional[Dict[str, Tuple[float, Optional[float]]]] = None) -> None:
+        merged: Dict[str, Tuple[float, Optional[float]]] = dict(DEFAULT_PROVIDER_LIMITS)
+        merged.update(limits or {})
+        with self._lock:
+            self._limiters = {p: ProviderLimiter(p, rps, tpm, self.max_wait, self.shared_dir)
+                              for p, (rps, tpm) in merged.items()}
+
+    def get(self, provider: str) -> Optional[ProviderLimiter]:
+        """한도가 없는 provider 는 None (제한 없음)"""
+        return self._limiters.get(provider)
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        return {p: lim.stats() for p, lim in list(self._limiters.items())}
+
+
+def parse_provider_limits(spec: str) -> Dict[str, Tuple[float, Optional[float]]]:
+    """'openai=5:90000,gemini=10' -> {"openai": (5.0, 90000.0), "gemini": (10.0, None)}"""
+    out: Dict[str, Tuple[float, Optional[float]]] = {}
+    for part in (spec or "").split(","):
+        part = part.strip()
+        if not part:
+            continue
+        name, _, val = part.partition("=")
+        rps, _, tpm = val.partition(":")
+        out[name.strip()] = (float(rps), float(tpm) if tpm else None)
+    return out
+
+
+def _shared_dir_from_env() -> Optional[Path]:
+    if os.environ.get("KAI_RATE_LIMIT_SHARED", "0") not in ("1", "true", "on"):
+        return None
+    return Path(os.environ.get("KAI_RATE_LIMIT_DIR") or DEFAULT_SHARED_DIR)
+
+
+LIMITERS = RateLimiters(parse_provider_limits(os.environ.get("KAI_PROVIDER_LIMITS") or ""),
+                        shared_dir=_shared_dir_from_env())
+
+
+__all__ = [
+    "LIMITERS", "RateLimiters", "ProviderLimiter", "TokenBucket", "SharedBuckets", "RateLimited",
+    "INTERACTIVE", "BATCH", "priority", "current_priority", "set_default_priority",
+    "estimate_tokens", "parse_provider_limits",
+]
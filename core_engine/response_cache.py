@@ -0,0 +1,224 @@
+# core_engine/response_cache.py
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+# model_router 응답 캐시 (provider 왕복을 같은 요청에 두 번 내지 않도록).
+# 키: (provider, 모델 이름, messages, temperature, live/mock) 를 정렬된 JSON 으로 만든 sha256.
+#   1단: 메모리 LRU — 항목 수 / 글자 수 상한, TTL 지나면 버림
+#   2단: 디스크 output/_cache/model/<키 앞 2자>/<키>.json — 재시작 후에도 유지 (같은 TTL)
+#        put 때 PRUNE_INTERVAL 마다 한 번 정리: TTL 지난 파일 삭제 + 총 크기 상한을 넘으면 오래된 것부터 삭제
+#        (응답에는 고객 입력이 들어가므로 만료된 것을 디스크에 남겨 두지 않는다)
+# 환경변수: KAI_MODEL_CACHE=0 (끄기), KAI_MODEL_CACHE_TTL (초, 기본 7일),
+#           KAI_MODEL_CACHE_ENTRIES (기본 1024), KAI_MODEL_CACHE_DISK_MB (기본 256), KAI_MODEL_CACHE_DIR
+# 호출 단위로 끄려면 model_call(..., cache=False).
+
+ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_DIR = ROOT / "output" / "_cache" / "model"
+DEFAULT_TTL = 7 * 24 * 3600.0
+DEFAULT_ENTRIES = 1024
+DEFAULT_MAX_CHARS = 16 * 1024 * 1024
+DEFAULT_DISK_BYTES = 256 * 1024 * 1024
+PRUNE_INTERVAL = 300.0
+
+
+def cache_key(provider: str, name: Optional[str], messages: List[Dict[str, str]], temperature: float,
+              live: bool = True) -> str:
+    body = json.dumps(
+        {"p": provider, "m": name, "msgs": messages, "t": round(float(temperature), 6), "live": live},
+        ensure_ascii=False, sort_keys=True, separators=(",", ":"),
+    )
+    return hashlib.sha256(body.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    def __init__(self, *, max_entries: int = DEFAULT_ENTRIES, max_chars: int = DEFAULT_MAX_CHARS,
+                 ttl_s: Optional[float] = DEFAULT_TTL, disk_dir: Optional[Path] = DEFAULT_DIR,
+                 max_disk_bytes: Optional[int] = DEFAULT_DISK_BYTES, enabled: bool = True):
+        self.max_entries = max(1, int(max_entries))
+        self.max_chars = max(1, int(max_chars))
+        self.ttl_s = ttl_s
+        self.disk_dir = Path(disk_dir) if disk_dir is not None else None
+        self.max_disk_bytes = max_disk_bytes
+        self.enabled = enabled
+        self._last_prune = 0.0  # 0: 첫 put 때 한 번 정리 (이전 실행이 남긴 파일)
+        self._pruning = False
+        self._lock = threading.Lock()
+        self._mem: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()  # key -> (저장 시각 epoch, text)
+        self._chars = 0
+        self._stats: Dict[str, int] = {
+            "hits": 0, "disk_hits": 0, "misses": 0, "stores": 0, "evictions": 0, "expired": 0, "bypass": 0,
+            "pruned": 0,
+        }
+
+    # ---------- 내부 ----------
+    def _fresh(self, created: float) -> bool:
+        return self.ttl_s is None or time.time() - created < self.ttl_s
+
+    def _disk_path(self, key: str) -> Optional[Path]:
+        return self.disk_dir / key[:2] / f"{key}.json" if self.disk_dir is not None else None
+
+    def _remember(self, key: str, created: float, text: str) -> None:
+        # self._lock 안에서 호출
+        old = self._mem.pop(key, None)
+        if old is not None:
+            self._chars -= len(old[1])
+        self._mem[key] = (created, text)
+        self._chars += len(text)
+        while len(self._mem) > self.max_entries or (self._chars > self.max_chars and len(self._mem) > 1):
+            _, (_, t) = self._mem.popitem(last=False)
+            self._chars -= len(t)
+            self._stats["evictions"] += 1
+
+    def _read_disk(self, key: str) -> Optional[Tuple[float, str]]:
+        p = self._disk_path(key)
+        if p is None:
+            return None
+        try:
+            rec = json.loads(p.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+        if rec.get("key") != key or not isinstance(rec.get("text"), str):
+            return None
+        return float(rec.get("created") or 0.0), rec["text"]
+
+    # ---------- API ----------
+    def get(self, key: str) -> Optional[str]:
+        if not self.enabled:
+            return None
+        with self._lock:
+            hit = self._mem.get(key)
+            if hit is not None:
+                if self._fresh(hit[0]):
+                    self._mem.move_to_end(key)
+                    self._stats["hits"] += 1
+                    return hit[1]
+                self._mem.pop(key)
+                self._chars -= len(hit[1])
+                self._stats["expired"] += 1
+        rec = self._read_disk(key)
+        with self._lock:
+            if rec is not None and self._fresh(rec[0]):
+                self._remember(key, rec[0], rec[1])
+                self._stats["disk_hits"] += 1
+                return rec[1]
+            if rec is not None:
+                self._stats["expired"] += 1
+            self._stats["misses"] += 1
+        if rec is not None:
+            self._unlink(self._disk_path(key))  # 만료된 파일은 읽은 김에 지운다
+        return None
+
+    def put(self, key: str, text: str, *, provider: str = "", name: Optional[str] = None) -> None:
+        if not self.enabled:
+            return
+        created = time.time()
+        with self._lock:
+            self._remember(key, created, text)
+            self._stats["stores"] += 1
+        p = self._disk_path(key)
+        if p is None:
+            return
+        rec = {"key": key, "provider": provider, "name": name, "created": created, "text": text}
+        try:
+            p.parent.mkdir(parents=True, exist_ok=True)
+            tmp = p.with_name(f".{p.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+            tmp.write_text(json.dumps(rec, ensure_ascii=False), encoding="utf-8")
+            os.replace(tmp, p)
+        except OSError:
+            pass  # 디스크 단은 best-effort (메모리 단은 이미 저장됨)
+        self._maybe_prune(created)
+
+    def _unlink(self, p: Optional[Path]) -> bool:
+        try:
+            if p is not None:
+                p.unlink()
+                return True
+        except OSError:
+            pass
+        return False
+
+    def _maybe_prune(self, now: float) -> None:
+        with self._lock:
+            if self._pruning or now - self._last_prune < PRUNE_INTERVAL:
+                return
+            self._pruning = True
+        try:
+            self.prune_disk(now)
+        finally:
+            with self._lock:
+                self._pruning = False
+                self._last_prune = now
+
+    def prune_disk(self, now: Optional[float] = None) -> int:
+        """TTL 지난 파일 삭제 후, 남은 총 크기가 max_disk_bytes 를 넘으면 오래된 것부터 삭제. 지운 파일 수 반환."""
+        if self.disk_dir is None or not self.disk_dir.is_dir():
+            return 0
+        now = time.time() if now is None else now
+        files: List[Tuple[float, int, Path]] = []
+        removed = 0
+        for p in self.disk_dir.glob("*/*.json"):
+            try:
+                st = p.stat()
+            except OSError:
+                continue
+            if self.ttl_s is not None and now - st.st_mtime >= self.ttl_s:
+                removed += self._unlink(p)
+            else:
+                files.append((st.st_mtime, st.st_size, p))
+        total = sum(size for _, size, _ in files)
+        if self.max_disk_bytes is not None and total > self.max_disk_bytes:
+            files.sort()
+            for _, size, p in files:
+                if total <= self.max_disk_bytes:
+                    break
+                if self._unlink(p):
+                    removed += 1
+                    total -= size
+        with self._lock:
+            self._stats["pruned"] += removed
+        return removed
+
+    def note_bypass(self) -> None:
+        with self._lock:
+            self._stats["bypass"] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return dict(self._stats, entries=len(self._mem), chars=self._chars, enabled=self.enabled,
+                        disk_dir=str(self.disk_dir) if self.disk_dir is not None else None)
+
+    def clear(self, *, disk: bool = False) -> None:
+        with self._lock:
+            self._mem.clear()
+            self._chars = 0
+        if disk and self.disk_dir is not None and self.disk_dir.is_dir():
+            for p in self.disk_dir.glob("*/*.json"):
+                try:
+                    p.unlink()
+                except OSError:
+                    pass
+
+
+def _from_env() -> ResponseCache:
+    ttl = os.environ.get("KAI_MODEL_CACHE_TTL")
+    return ResponseCache(
+        max_entries=int(os.environ.get("KAI_MODEL_CACHE_ENTRIES") or DEFAULT_ENTRIES),
+        ttl_s=float(ttl) if ttl else DEFAULT_TTL,
+        max_disk_bytes=int(float(os.environ.get("KAI_MODEL_CACHE_DISK_MB") or DEFAULT_DISK_BYTES / 2**20) * 2**20),
+        disk_dir=Path(os.environ.get("KAI_MODEL_CACHE_DIR") or DEFAULT_DIR),
+        enabled=os.environ.get("KAI_MODEL_CACHE", "1") not in ("0", "false", "off"),
+    )
+
+
+RESPONSE_CACHE = _from_env()
+
+
+__all__ = ["ResponseCache", "RESPONSE_CACHE", "cache_key"]
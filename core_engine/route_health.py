@@ -0,0 +1,165 @@
+# core_engine/route_health.py
+from __future__ import annotations
+
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+# (provider, 모델) route 별 건강 상태 — 적응형 라우팅 + circuit breaker.
+# - 실제 provider 호출마다 지연 EWMA 와 오류율 EWMA 를 갱신한다
+# - 연속 실패가 FAILURE_THRESHOLD 번이면 circuit open: COOLDOWN 동안 그 route 로 보내지 않는다
+# - cooldown 이 지나면 half-open: PROBE_INTERVAL 마다 한 요청을 맨 앞에 세워 시험 호출(probe),
+#   성공하면 closed, 실패하면 다시 open (cooldown 은 두 배, 최대 MAX_COOLDOWN)
+# - rank(routes) 는 closed route 를 점수(지연 EWMA × (1 + 오류율 가중)) 순으로 정렬한다.
+#   표본 없는 route 는 config 순서대로 먼저 (측정이 있어야 비교 가능).
+#   보낼 수 있는 route 가 하나도 없으면(전부 open) 기다리지 않고 CircuitOpen(retry_after)
+# - 시간 초과는 실패(record_failure), 결과를 못 보고 끊은 호출(hedge 에 진 호출, deadline)은
+#   "적어도 이만큼 걸림" 으로 지연 EWMA 에만 반영한다(record_latency) — 멈춘 provider 가 측정 없는 route 로 남지 않게
+#   model_router.route_state() 로 전체 상태를 볼 수 있다 (/health 의 "routes").
+
+ALPHA = 0.2
+FAILURE_THRESHOLD = 3
+ERROR_RATE_THRESHOLD = 0.5   # 표본 MIN_SAMPLES 이상에서 오류율 EWMA 가 이 이상이어도 open
+MIN_SAMPLES = 10
+ERROR_PENALTY = 4.0
+COOLDOWN = 30.0
+MAX_COOLDOWN = 300.0
+PROBE_INTERVAL = 5.0
+
+
+class CircuitOpen(RuntimeError):
+    def __init__(self, keys: List[str], retry_after: float):
+        super().__init__(f"all routes unavailable ({', '.join(keys)}; retry after {retry_after:.1f}s)")
+        self.keys = keys
+        self.retry_after = retry_after
+
+
+def route_key(route: Dict[str, Any]) -> str:
+    return f"{route.get('provider')}:{route.get('name')}"
+
+
+class RouteHealth:
+    __slots__ = ("key", "ewma_s", "error_rate", "calls", "failures", "consecutive",
+                 "state", "opened_at", "cooldown", "last_probe")
+
+    def __init__(self, key: str):
+        self.key = key
+        self.ewma_s: Optional[float] = None
+        self.error_rate = 0.0
+        self.calls = 0
+        self.failures = 0
+        self.consecutive = 0
+        self.state = "closed"        # closed | open | half_open
+        self.opened_at = 0.0
+        self.cooldown = COOLDOWN
+        self.last_probe = 0.0
+
+    def _refresh(self, now: float) -> None:
+        if self.state == "open" and now - self.opened_at >= self.cooldown:
+            self.state = "half_open"
+
+    def _open(self, now: float) -> None:
+        if self.state == "half_open":
+            self.cooldown = min(MAX_COOLDOWN, self.cooldown * 2)
+        self.state = "open"
+        self.opened_at = now
+
+    def score(self) -> float:
+        return (self.ewma_s or 0.0) * (1.0 + ERROR_PENALTY * self.error_rate)
+
+    def snapshot(self, now: float) -> Dict[str, Any]:
+        self._refresh(now)
+        return {
+            "state": self.state,
+            "ewma_ms": round(self.ewma_s * 1000, 1) if self.ewma_s is not None else None,
+            "error_rate": round(self.error_rate, 3),
+            "calls": self.calls,
+            "failures": self.failures,
+            "consecutive_failures": self.consecutive,
+            "retry_in_s": round(max(0.0, self.opened_at + self.cooldown - now), 1) if self.state == "open" else 0.0,
+        }
+
+
+class RouteTable:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._routes: Dict[str, RouteHealth] = {}
+
+    def _get(self, key: str) -> RouteHealth:
+        h = self._routes.get(key)
+        if h is None:
+            h = self._routes[key] = RouteHealth(key)
+        return h
+
+    def record_success(self, key: str, seconds: float) -> None:
+        with self._lock:
+            h = self._get(key)
+            h.calls += 1
+            h.ewma_s = seconds if h.ewma_s is None else ALPHA * seconds + (1 - ALPHA) * h.ewma_s
+            h.error_rate *= (1 - ALPHA)
+            h.consecutive = 0
+            if h.state != "closed":
+                h.state = "closed"
+                h.cooldown = COOLDOWN
+
+    def record_latency(self, key: str, seconds: float) -> None:
+        """끝나지 않은 호출의 경과 시간 (실제 지연 >= seconds). EWMA 보다 길 때만 반영, 성공/실패 수는 그대로."""
+        with self._lock:
+            h = self._get(key)
+            if h.ewma_s is None or seconds > h.ewma_s:
+                h.ewma_s = seconds if h.ewma_s is None else ALPHA * seconds + (1 - ALPHA) * h.ewma_s
+
+    def record_failure(self, key: str) -> None:
+        with self._lock:
+            h = self._get(key)
+            now = time.monotonic()
+            h._refresh(now)
+            h.calls += 1
+            h.failures += 1
+            h.consecutive += 1
+            h.error_rate = ALPHA + (1 - ALPHA) * h.error_rate
+            if h.state == "half_open" or h.consecutive >= FAILURE_THRESHOLD or (
+                    h.calls >= MIN_SAMPLES and h.error_rate >= ERROR_RATE_THRESHOLD):
+                if h.state != "open":
+                    h._open(now)
+
+    def rank(self, routes: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        보낼 순서대로 정렬한 route 목록: probe 할 half-open route → closed route (측정 없는 것, 점수 순).
+        open (cooldown 중) route 는 빠진다. 모두 빠지면 CircuitOpen (retry_after = 가장 먼저 다시 열릴 때까지).
+        """
+        now = time.monotonic()
+        probes, fresh, measured, blocked = [], [], [], []
+        with self._lock:
+            for i, r in enumerate(routes):
+                h = self._get(route_key(r))
+                h._refresh(now)
+                if h.state == "closed":
+                    (fresh if h.ewma_s is None else measured).append((h.score(), i, r))
+                elif h.state == "half_open" and now - h.last_probe >= PROBE_INTERVAL:
+                    h.last_probe = now
+                    probes.append((0.0, i, r))
+                else:
+                    retry_at = h.opened_at + h.cooldown if h.state == "open" else h.last_probe + PROBE_INTERVAL
+                    blocked.append((retry_at, i, r))
+        measured.sort(key=lambda x: (x[0], x[1]))
+        ordered = [r for _, _, r in probes + fresh + measured]
+        if ordered or not blocked:
+            return ordered
+        retry_after = max(0.0, min(t for t, _, _ in blocked) - now)
+        raise CircuitOpen([route_key(r) for _, _, r in blocked], round(retry_after, 1))
+
+    def state(self) -> Dict[str, Dict[str, Any]]:
+        now = time.monotonic()
+        with self._lock:
+            return {k: h.snapshot(now) for k, h in self._routes.items()}
+
+    def reset(self, key: Optional[str] = None) -> None:
+        with self._lock:
+            if key is None:
+                self._routes.clear()
+            else:
+                self._routes.pop(key, None)
+
+
+__all__ = ["RouteTable", "RouteHealth", "CircuitOpen", "route_key"]
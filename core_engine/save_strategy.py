@@ -4,6 +4,8 @@ import os
 import json
 from datetime import datetime
 from typing import Any, Dict
+
+from core_engine.deadline import Deadline
 try:
     from pydantic import BaseModel  # pydantic v2
 except Exception:  # pydantic이 없어도 동작하도록
@@ -57,13 +59,27 @@ def save_json(path: str, data: Any) -> None:
         json.dump(_to_jsonable(data), f, ensure_ascii=False, indent=2)
 
 
-def save_strategy(domain: str, strategy: Any, evaluation: Any, base_dir: str = "output") -> str:
+def save_strategy(
+    domain: str,
+    strategy: Any,
+    evaluation: Any,
+    base_dir: str = "output",
+    *,
+    out_dir: str | None = None,
+    quiet: bool = False,
+    deadline: Deadline | None = None,
+) -> str:
     """
     전략과 평가 결과를 timestamp 디렉토리에 저장.
     - strategy.json
     - evaluation.json
+    out_dir 를 주면 timestamp 대신 해당 디렉토리에 저장 (배치: 초 단위 충돌 방지)
+    deadline 이 지나도 저장은 건너뛰지 않는다 (결과 유실 방지). 이후 export 단계가 줄어든다.
     """
-    out_dir = _timestamp_dir(base_dir)
+    if out_dir is None:
+        out_dir = _timestamp_dir(base_dir)
+    else:
+        os.makedirs(out_dir, exist_ok=True)
 
     # 파일 경로
     strategy_path = os.path.join(out_dir, "strategy.json")
@@ -73,5 +89,6 @@ def save_strategy(domain: str, strategy: Any, evaluation: Any, base_dir: str = "
     save_json(strategy_path, strategy)
     save_json(eval_path, evaluation)
 
-    print(f"[save] -> {out_dir}")
+    if not quiet:
+        print(f"[save] -> {out_dir}")
     return out_dir
\ No newline at end of file
@@ -0,0 +1,369 @@
+# core_engine/service.py
+from __future__ import annotations
+
+import json
+import os
+import socketserver
+import time
+from contextlib import nullcontext
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, Iterator, Tuple
+from uuid import uuid4
+
+from core_engine import admission, config_cache, domain_registry, prompt_loader
+from core_engine.deadline import Deadline, DeadlineExceeded
+from core_engine.response_cache import RESPONSE_CACHE
+from core_engine.model_router import IN_FLIGHT, LATENCY, route_state
+from core_engine.rate_limit import LIMITERS, RateLimited
+from core_engine.route_health import CircuitOpen
+from core_engine.qmand_engine import run_qmand_pipeline
+from core_engine.qgen_engine import run_qgen_pipeline
+from core_engine.stratos_evaluator import evaluate_strategy
+from core_engine.save_strategy import _to_jsonable
+from core_engine.pipeline import export_reports, iter_stages
+
+# 상주 파이프라인 서비스 (로컬 HTTP 또는 Unix 소켓)
+#   GET  /health               상태 + config 캐시 정보
+#   POST /qmand     {domain, input}
+#   POST /qgen      {domain, input | qmand}
+#   POST /evaluate  {domain, strategy}
+#   POST /export    {strategy, evaluation, out_dir, export}
+#   POST /run       {domain, input, export}   QMAND → QGEN → STRATOS → SAVE (+EXPORT)
+#   POST /run/stream  (같은 입력)  단계별 이벤트 스트림: NDJSON 기본,
+#                     Accept: text/event-stream 또는 ?format=sse 이면 SSE
+# body 의 deadline_ms 가 있으면 요청 예산으로 각 단계에 전달 (초과 시 504).
+# 각 엔드포인트는 admission 게이트(ROUTE_STAGES) 뒤에 있으며,
+# 한도 초과 시 503 + Retry-After 로 즉시 거절한다.
+# serve(pipeline=...) 로 띄우면 /run 은 공유 단계 파이프라인(stage_pipeline)에 넣어
+# 동시 요청끼리 생성/저장/내보내기가 겹쳐 돈다 (이때 응답에 qmand 는 없음).
+
+_STARTED = time.time()
+_PIPELINE = None  # StagePipeline | None
+
+
+class BadRequest(Exception):
+    pass
+
+
+def _domain_state(domain: str) -> Tuple[Dict[str, Any], Any]:
+    """(config, 컴파일된 routing 키워드) — config 파일이 바뀌면 자동 재로딩"""
+    st = _domain(domain)
+    return st.cfg, st.routing
+
+
+def _domain(domain: str) -> domain_registry.DomainState:
+    try:
+        return domain_registry.get(domain)
+    except FileNotFoundError:
+        raise BadRequest(f"unknown domain: {domain}")
+    except RuntimeError as e:
+        raise BadRequest(str(e))
+
+
+def _request_out_dir(base_dir: str = "output") -> str:
+    # 동시 요청이 같은 초에 끝나도 디렉터리가 겹치지 않도록 짧은 요청 ID 부착
+    return os.path.join(base_dir, f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_{uuid4().hex[:6]}")
+
+
+def _deadline(body: Dict[str, Any]) -> Deadline | None:
+    ms = body.get("deadline_ms")
+    if ms in (None, ""):
+        return None
+    try:
+        return Deadline(float(ms) / 1000.0)
+    except (TypeError, ValueError):
+        raise BadRequest(f"invalid deadline_ms: {ms!r}")
+
+
+def _require(body: Dict[str, Any], key: str) -> Any:
+    v = body.get(key)
+    if v in (None, ""):
+        raise BadRequest(f"missing field: {key}")
+    return v
+
+
+# ---------- handlers ----------
+def handle_qmand(body: Dict[str, Any]) -> Dict[str, Any]:
+    domain = _require(body, "domain")
+    cfg, routing = _domain_state(domain)
+    return run_qmand_pipeline(domain, _require(body, "input"), cfg=cfg, routing=routing,
+                              deadline=_deadline(body))
+
+
+def handle_qgen(body: Dict[str, Any]) -> Dict[str, Any]:
+    domain = _require(body, "domain")
+    cfg, _ = _domain_state(domain)
+    return run_qgen_pipeline(domain, body.get("qmand") or _require(body, "input"), cfg=cfg,
+                             deadline=_deadline(body))
+
+
+def handle_evaluate(body: Dict[str, Any]) -> Dict[str, Any]:
+    st = _domain(_require(body, "domain"))
+    return _to_jsonable(evaluate_strategy(st.name, _require(body, "strategy"), cfg=st.cfg, weights=st.weights,
+                                          deadline=_deadline(body)))
+
+
+def handle_export(body: Dict[str, Any]) -> Dict[str, Any]:
+    paths = export_reports(
+        _require(body, "strategy"), _require(body, "evaluation"), _require(body, "out_dir"),
+        body.get("export") or "all", quiet=True, deadline=_deadline(body),
+    )
+    return {"exports": paths}
+
+
+def stream_run(body: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+    domain = _require(body, "domain")
+    user_input = _require(body, "input")
+    cfg, routing = _domain_state(domain)
+    return iter_stages(domain, user_input, cfg=cfg, routing=routing,
+                       export=body.get("export"), out_dir=_request_out_dir(),
+                       deadline=_deadline(body))
+
+
+def _run_pipelined(body: Dict[str, Any]) -> Dict[str, Any]:
+    domain = _require(body, "domain")
+    cfg, _ = _domain_state(domain)
+    item = _PIPELINE.submit({"domain": domain, "input": _require(body, "input"), "cfg": cfg,
+                             "export": body.get("export"), "out_dir": _request_out_dir(),
+                             "deadline": _deadline(body)}).result()
+    if "error" in item:
+        if item["error"].startswith("DeadlineExceeded"):
+            raise DeadlineExceeded(item.get("failed_stage", "run"))
+        raise RuntimeError(item["error"])
+    return {
+        "strategy": item["strategy"],
+        "evaluation": _to_jsonable(item["evaluation"]),
+        "out_dir": item["out_dir"],
+        "exports": item.get("exports", []),
+        "stage_ms": item.get("stage_ms", {}),
+    }
+
+
+def handle_run(body: Dict[str, Any]) -> Dict[str, Any]:
+    if _PIPELINE is not None:
+        return _run_pipelined(body)
+    out: Dict[str, Any] = {"exports": []}
+    for ev in stream_run(body):
+        name, data = ev["event"], ev["data"]
+        if name == "qgen":
+            out["strategy"] = data
+        elif name == "stratos":
+            out["evaluation"] = data
+        elif name == "export":
+            if data.get("path"):
+                out["exports"].append(data["path"])
+            else:
+                out.setdefault("skipped", []).append(data["format"])
+        elif name in ("save", "done"):
+            out["out_dir"] = data["out_dir"]
+        else:
+            out[name] = data
+    return out
+
+
+def handle_health(_: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "ok": True,
+        "uptime_s": round(time.time() - _STARTED, 1),
+        "pid": os.getpid(),
+        "domains": config_cache.cache_info(),
+        "config_cache": config_cache.stats(),
+        "prompt_cache": prompt_loader.stats(),
+        "response_cache": RESPONSE_CACHE.stats(),
+        "single_flight": IN_FLIGHT.stats(),
+        "provider_latency": LATENCY.stats(),
+        "rate_limits": LIMITERS.stats(),
+        "routes": route_state(),
+        "registry": domain_registry.info(),
+        "admission": admission.CONTROLLER.stats(),
+        "pipeline": _PIPELINE.stats() if _PIPELINE is not None else None,
+    }
+
+
+ROUTES: Dict[Tuple[str, str], Callable[[Dict[str, Any]], Dict[str, Any]]] = {
+    ("GET", "/health"): handle_health,
+    ("POST", "/qmand"): handle_qmand,
+    ("POST", "/qgen"): handle_qgen,
+    ("POST", "/evaluate"): handle_evaluate,
+    ("POST", "/export"): handle_export,
+    ("POST", "/run"): handle_run,
+}
+
+STREAM_ROUTES: Dict[Tuple[str, str], Callable[[Dict[str, Any]], Iterator[Dict[str, Any]]]] = {
+    ("POST", "/run/stream"): stream_run,
+}
+
+# path -> admission stage (없으면 게이트 없이 처리)
+ROUTE_STAGES: Dict[str, str] = {
+    "/qmand": "qmand",
+    "/qgen": "qgen",
+    "/evaluate": "stratos",
+    "/export": "export",
+    "/run": "run",
+    "/run/stream": "run",
+}
+
+
+# ---------- HTTP ----------
+class KaiHandler(BaseHTTPRequestHandler):
+    server_version = "KaiService/1.0"
+    quiet = False
+
+    def _send_json(self, status: int, data: Any, headers: Dict[str, str] | None = None) -> None:
+        raw = json.dumps(data, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(raw)))
+        for k, v in (headers or {}).items():
+            self.send_header(k, v)
+        self.end_headers()
+        self.wfile.write(raw)
+
+    def _read_body(self) -> Dict[str, Any]:
+        n = int(self.headers.get("Content-Length") or 0)
+        if n <= 0:
+            return {}
+        try:
+            body = json.loads(self.rfile.read(n).decode("utf-8"))
+        except (ValueError, UnicodeDecodeError) as e:
+            raise BadRequest(f"invalid JSON body: {e}")
+        if not isinstance(body, dict):
+            raise BadRequest("JSON body must be an object")
+        return body
+
+    def _wants_sse(self) -> bool:
+        query = self.path.split("?", 1)[1] if "?" in self.path else ""
+        return "format=sse" in query or "text/event-stream" in (self.headers.get("Accept") or "")
+
+    def _stream(self, events: Iterator[Dict[str, Any]]) -> None:
+        # 길이 없이 보내고 연결 종료로 끝을 알림 (HTTP/1.0)
+        sse = self._wants_sse()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream; charset=utf-8" if sse else "application/x-ndjson; charset=utf-8")
+        self.send_header("Cache-Control", "no-cache")
+        self.end_headers()
+        try:
+            for ev in events:
+                line = json.dumps(ev, ensure_ascii=False)
+                if sse:
+                    chunk = f"event: {ev['event']}\ndata: {line}\n\n"
+                else:
+                    chunk = line + "\n"
+                self.wfile.write(chunk.encode("utf-8"))
+                self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            return  # 클라이언트가 먼저 끊음
+        except Exception as e:
+            err = json.dumps({"event": "error", "data": {"error": f"{type(e).__name__}: {e}"}}, ensure_ascii=False)
+            chunk = f"event: error\ndata: {err}\n\n" if sse else err + "\n"
+            self.wfile.write(chunk.encode("utf-8"))
+
+    def _dispatch(self, method: str) -> None:
+        path = self.path.split("?", 1)[0]
+        stage = ROUTE_STAGES.get(path)
+        try:
+            # 스트림이면 마지막 이벤트까지 슬롯을 잡고 있는다
+            with admission.CONTROLLER.admit(stage) if stage else nullcontext():
+                self._dispatch_admitted(method, path)
+        except admission.Rejected as e:
+            self._send_json(503, {"error": str(e), "stage": e.stage, "retry_after": e.retry_after},
+                            headers={"Retry-After": str(max(1, round(e.retry_after)))})
+
+    def _dispatch_admitted(self, method: str, path: str) -> None:
+        stream_fn = STREAM_ROUTES.get((method, path))
+        if stream_fn is not None:
+            try:
+                events = stream_fn(self._read_body())
+            except BadRequest as e:
+                self._send_json(400, {"error": str(e)})
+                return
+            self._stream(events)
+            return
+        fn = ROUTES.get((method, path))
+        if fn is None:
+            self._send_json(404, {"error": f"no route: {method} {path}"})
+            return
+        try:
+            self._send_json(200, fn(self._read_body()))
+        except BadRequest as e:
+            self._send_json(400, {"error": str(e)})
+        except DeadlineExceeded as e:
+            self._send_json(504, {"error": str(e), "stage": e.stage})
+        except RateLimited as e:  # provider 한도 대기열 초과: admission.Rejected 와 같은 503 + Retry-After
+            self._send_json(503, {"error": str(e), "provider": e.provider, "retry_after": e.retry_after},
+                            headers={"Retry-After": str(max(1, round(e.retry_after)))})
+        except CircuitOpen as e:  # 모든 route 의 circuit 이 열림
+            self._send_json(503, {"error": str(e), "routes": e.keys, "retry_after": e.retry_after},
+                            headers={"Retry-After": str(max(1, round(e.retry_after)))})
+        except Exception as e:
+            self._send_json(500, {"error": f"{type(e).__name__}: {e}"})
+
+    def do_GET(self) -> None:
+        self._dispatch("GET")
+
+    def do_POST(self) -> None:
+        self._dispatch("POST")
+
+    def address_string(self) -> str:
+        # Unix 소켓이면 client_address 가 비어 있음
+        return self.client_address[0] if self.client_address else "unix"
+
+    def log_message(self, fmt: str, *args: Any) -> None:
+        if not self.quiet:
+            super().log_message(fmt, *args)
+
+
+class _ThreadingUnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+def warm_up() -> None:
+    """모든 도메인 config/routing, 스키마, 프롬프트, PDF 폰트를 미리 메모리에 올림"""
+    for d, err in domain_registry.preload().items():
+        print(f"[service] skipping invalid domain {d}: {err.splitlines()[0]}")
+    import schemas.strategy  # noqa: F401
+    prompt_loader.load_prompt("qgen")
+    from tools.export_pdf import _register_kr_font
+    _register_kr_font()
+
+
+def make_server(host: str = "127.0.0.1", port: int = 8765, unix_socket: str | None = None,
+                quiet: bool = False) -> socketserver.BaseServer:
+    handler = type("Handler", (KaiHandler,), {"quiet": quiet})
+    if unix_socket:
+        if os.path.exists(unix_socket):
+            os.unlink(unix_socket)
+        return _ThreadingUnixHTTPServer(unix_socket, handler)
+    return ThreadingHTTPServer((host, port), handler)
+
+
+def serve(host: str = "127.0.0.1", port: int = 8765, unix_socket: str | None = None,
+          quiet: bool = False, limits: Dict[str, Tuple[int, int]] | None = None,
+          max_wait: float = admission.DEFAULT_MAX_WAIT,
+          pipeline: Dict[str, Tuple[int, int]] | None = None) -> None:
+    """pipeline(stage -> (workers, queue)) 이 있으면 /run 을 공유 단계 파이프라인으로 처리 (빈 dict 는 기본값)"""
+    global _PIPELINE
+    admission.configure(limits, max_wait)
+    warm_up()
+    if pipeline is not None:
+        from core_engine.stage_pipeline import StagePipeline, kai_stages
+        from core_engine.batch_runner import _init_worker
+        _PIPELINE = StagePipeline(kai_stages(pipeline), process_initializer=_init_worker,
+                                  initargs=([], "all")).start()
+    server = make_server(host, port, unix_socket, quiet)
+    where = unix_socket or f"http://{host}:{port}"
+    print(f"[service] listening on {where} (domains: {', '.join(domain_registry.domains())})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        if _PIPELINE is not None:
+            _PIPELINE.close()
+        if unix_socket and os.path.exists(unix_socket):
+            os.unlink(unix_socket)
+
+
+__all__ = ["serve", "make_server", "warm_up", "ROUTES", "STREAM_ROUTES"]
@@ -0,0 +1,121 @@
+# core_engine/singleflight.py
+from __future__ import annotations
+
+import asyncio
+import threading
+from typing import Any, Awaitable, Callable, Dict, Tuple
+
+# 같은 키의 호출이 동시에 여러 개 들어오면 첫 호출(leader)만 실제로 실행하고
+# 나머지(follower)는 그 결과를 기다려 함께 쓴다 (model_router 의 provider 호출 중복 제거).
+# 실패하면 follower 마다 예외 사본을 따로 받는다 (traceback 을 스레드 간에 공유하지 않게).
+# 스레드(do)와 asyncio(ado)는 따로 합친다 — 같은 키라도 sync 호출과 async 호출은 서로 기다리지 않는다.
+
+
+def _own_error(err: BaseException) -> BaseException:
+    # copy.copy 는 type(err)(*err.args) 로 다시 만들어서 __init__ 인자가 다른 예외(RateLimited, DeadlineExceeded)를
+    # 깨뜨린다 → __init__ 없이 같은 타입을 만들고 속성(retry_after, stage ...)과 args 를 그대로 옮긴다.
+    cls = type(err)
+    try:
+        mine = cls.__new__(cls, *err.args)
+        mine.__dict__.update(err.__dict__)
+        mine.args = err.args
+    except Exception:
+        mine = RuntimeError(f"{cls.__name__}: {err}")
+    mine.__cause__ = err
+    return mine.with_traceback(None)
+
+
+class _Call:
+    __slots__ = ("done", "result", "error", "followers")
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: BaseException | None = None
+        self.followers = 0
+
+
+class SingleFlight:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._calls: Dict[str, _Call] = {}
+        self._tasks: Dict[Tuple[int, str], "asyncio.Task[Any]"] = {}  # (id(loop), key) -> leader task
+        self._waiters: Dict[Tuple[int, str], int] = {}                # 아직 결과를 기다리는 호출자 수
+        self._stats: Dict[str, int] = {"leaders": 0, "shared": 0, "errors": 0}
+
+    def do(self, key: str, fn: Callable[..., Any], *args: Any) -> Any:
+        """key 가 같은 호출이 진행 중이면 그 결과를 기다리고, 아니면 fn(*args) 실행."""
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                call.followers += 1
+                self._stats["shared"] += 1
+                leader = False
+            else:
+                call = self._calls[key] = _Call()
+                self._stats["leaders"] += 1
+                leader = True
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise _own_error(call.error)
+            return call.result
+        try:
+            call.result = fn(*args)
+            return call.result
+        except BaseException as e:
+            call.error = e
+            with self._lock:
+                self._stats["errors"] += 1
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.done.set()
+
+    async def ado(self, key: str, fn: Callable[..., Awaitable[Any]], *args: Any) -> Any:
+        """
+        do 의 async 판. leader 는 별도 task 로 돌아서 한 호출자가 취소/시간 초과돼도 나머지는 결과를 받는다.
+        기다리는 호출자가 모두 취소되면 leader task 도 취소한다.
+        """
+        tkey = (id(asyncio.get_running_loop()), key)
+        with self._lock:
+            task = self._tasks.get(tkey)
+            if task is not None:
+                self._stats["shared"] += 1
+                leader = False
+            else:
+                task = self._tasks[tkey] = asyncio.ensure_future(fn(*args))
+                self._stats["leaders"] += 1
+                leader = True
+            self._waiters[tkey] = self._waiters.get(tkey, 0) + 1
+
+        if leader:
+            def _forget(t: "asyncio.Task[Any]") -> None:
+                with self._lock:
+                    self._tasks.pop(tkey, None)
+                    self._waiters.pop(tkey, None)
+                    if not t.cancelled() and t.exception() is not None:
+                        self._stats["errors"] += 1
+            task.add_done_callback(_forget)
+        try:
+            return await asyncio.shield(task)
+        except asyncio.CancelledError:
+            with self._lock:
+                left = self._waiters.get(tkey, 1) - 1
+                if self._tasks.get(tkey) is task:
+                    self._waiters[tkey] = left
+            if left <= 0 and not task.done():
+                task.cancel()
+            raise
+        except BaseException as e:
+            if leader:
+                raise
+            raise _own_error(e) from e
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self._stats, in_flight=len(self._calls) + len(self._tasks))
+
+
+__all__ = ["SingleFlight"]
@@ -0,0 +1,286 @@
+# core_engine/stage_pipeline.py
+from __future__ import annotations
+
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from core_engine.deadline import Deadline
+
+# 단계 파이프라인 실행기.
+# 요청 하나를 QGEN → STRATOS → SAVE → EXPORT 로 끝까지 돌리는 대신,
+# 단계를 크기 제한 큐로 연결하고 단계마다 워커 수를 따로 둔다.
+#   submit ─q─▶ [qgen ×N] ─q─▶ [stratos ×N] ─q─▶ [save ×1] ─q─▶ [export ×M] ─▶ Future
+# - 요청 N 의 PDF 렌더링과 요청 N+1 의 생성이 겹쳐서 돈다
+# - 큐가 차면 앞 단계(와 submit)가 막힌다 (backpressure) → 느린 단계가 있어도 메모리가 늘지 않음
+# - processes=True 단계는 프로세스 풀에서 실행 (GIL 을 타는 CPU 작업: reportlab 렌더링 등)
+# 항목은 dict 이고, 단계 함수는 dict -> dict (돌려준 필드를 항목에 합친다. 항목 자체를 돌려줘도 됨).
+# 실패한 항목은 error 를 달고 나머지 단계를 건너뛴다.
+
+_STOP = object()
+
+
+class Stage:
+    def __init__(self, name: str, fn: Callable[[Dict[str, Any]], Dict[str, Any]], workers: int = 1,
+                 queue_size: int | None = None, processes: bool = False, local_keys: Iterable[str] = ("cfg",)):
+        self.name = name
+        self.fn = fn
+        self.workers = max(1, int(workers))
+        self.queue_size = max(1, int(queue_size)) if queue_size else self.workers * 2  # 입력 큐 크기
+        self.processes = processes  # True 면 fn 은 모듈 최상위 함수여야 함 (pickle)
+        self.local_keys = tuple(local_keys)  # 프로세스로 넘기지 않을 키
+        self.processed = 0
+        self.failed = 0
+        self.busy_s = 0.0
+
+    def __repr__(self) -> str:
+        return f"Stage({self.name!r}, workers={self.workers}, queue={self.queue_size}, processes={self.processes})"
+
+
+class _Ticket:
+    __slots__ = ("item", "future")
+
+    def __init__(self, item: Dict[str, Any]):
+        self.item = item
+        self.future: Future = Future()
+
+
+class StagePipeline:
+    def __init__(self, stages: List[Stage], *,
+                 process_initializer: Optional[Callable[..., None]] = None, initargs: tuple = ()):
+        if not stages:
+            raise ValueError("stages is empty")
+        self.stages = stages
+        # 단계 i 의 입력 큐. 크기 제한이 곧 backpressure.
+        self._queues: List[queue.Queue] = [queue.Queue(maxsize=s.queue_size) for s in stages]
+        self._alive = [s.workers for s in stages]
+        self._lock = threading.Lock()
+        self._threads: List[threading.Thread] = []
+        self._pools: Dict[str, ProcessPoolExecutor] = {}
+        self._init = (process_initializer, initargs)
+        self._started = False
+        self._closed = False
+
+    # ---------- 수명 ----------
+    def start(self) -> "StagePipeline":
+        if self._started:
+            return self
+        self._started = True
+        init, initargs = self._init
+        # 프로세스 풀을 스레드보다 먼저 띄운다 (스레드가 돌고 있는 상태에서 fork 하지 않도록)
+        for st in self.stages:
+            if st.processes:
+                self._pools[st.name] = ProcessPoolExecutor(max_workers=st.workers, initializer=init,
+                                                           initargs=initargs)
+                for f in [self._pools[st.name].submit(os.getpid) for _ in range(st.workers)]:
+                    f.result()
+        for i, st in enumerate(self.stages):
+            for w in range(st.workers):
+                t = threading.Thread(target=self._worker, args=(i,), name=f"stage-{st.name}-{w}", daemon=True)
+                t.start()
+                self._threads.append(t)
+        return self
+
+    def close(self, wait: bool = True) -> None:
+        """입력을 닫는다. 이미 들어간 항목은 끝까지 처리된다."""
+        if self._closed:
+            return
+        self._closed = True
+        if self._started:
+            for _ in range(self.stages[0].workers):
+                self._queues[0].put(_STOP)
+            if wait:
+                for t in self._threads:
+                    t.join()
+        for pool in self._pools.values():
+            pool.shutdown(wait=wait)
+
+    def __enter__(self) -> "StagePipeline":
+        return self.start()
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    # ---------- 입력 ----------
+    def submit(self, item: Dict[str, Any], timeout: Optional[float] = None) -> Future:
+        """
+        항목 투입. 첫 단계 큐가 차 있으면 자리가 날 때까지 막힌다 (timeout 초과 시 queue.Full).
+        마지막 단계까지 끝난 항목 dict 로 완료되는 Future 반환.
+        """
+        if self._closed:
+            raise RuntimeError("pipeline is closed")
+        self.start()
+        ticket = _Ticket(item)
+        self._queues[0].put(ticket, timeout=timeout)
+        return ticket.future
+
+    def map(self, items: Iterable[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+        """
+        items 를 별도 스레드에서 계속 투입하면서 결과를 입력 순서대로 yield.
+        투입은 backpressure 로 조절되므로 items 가 커도 메모리에 다 올라가지 않는다.
+        """
+        # 진행 중인 항목 수 상한 = 단계 워커 + 단계 큐 (그 이상은 submit 에서 막힘)
+        futures: "queue.Queue[Any]" = queue.Queue(maxsize=sum(s.workers + s.queue_size for s in self.stages))
+
+        def _feed() -> None:
+            try:
+                for it in items:
+                    futures.put(self.submit(it))
+            finally:
+                futures.put(_STOP)
+
+        feeder = threading.Thread(target=_feed, name="stage-feed", daemon=True)
+        feeder.start()
+        while True:
+            fut = futures.get()
+            if fut is _STOP:
+                break
+            yield fut.result()
+        feeder.join()
+
+    # ---------- 워커 ----------
+    def _run_stage(self, st: Stage, item: Dict[str, Any]) -> Dict[str, Any]:
+        if not st.processes:
+            out = st.fn(item)
+            if out is not item:
+                item.update(out)  # 새 필드만 돌려주는 단계 함수 (export_stage 등)
+            return item
+        # 프로세스 경계: local_keys 는 빼고, Deadline 은 남은 초로 바꿔서 보낸 뒤 결과를 합친다
+        slim = {k: v for k, v in item.items() if k not in st.local_keys and k != "deadline"}
+        if isinstance(item.get("deadline"), Deadline):
+            slim["deadline_s"] = item["deadline"].remaining()
+        item.update(self._pools[st.name].submit(st.fn, slim).result())
+        return item
+
+    def _worker(self, i: int) -> None:
+        st = self.stages[i]
+        q_in = self._queues[i]
+        q_out = self._queues[i + 1] if i + 1 < len(self.stages) else None
+        while True:
+            ticket = q_in.get()
+            if ticket is _STOP:
+                break
+            if "error" not in ticket.item:
+                t0 = time.perf_counter()
+                try:
+                    ticket.item = self._run_stage(st, ticket.item)
+                except Exception as e:
+                    ticket.item["error"] = f"{type(e).__name__}: {e}"
+                    ticket.item["failed_stage"] = st.name
+                    with self._lock:
+                        st.failed += 1
+                dt = time.perf_counter() - t0
+                ticket.item.setdefault("stage_ms", {})[st.name] = round(dt * 1000, 1)
+                with self._lock:
+                    st.processed += 1
+                    st.busy_s += dt
+            if q_out is not None:
+                q_out.put(ticket)  # 다음 단계가 밀려 있으면 여기서 막힘
+            else:
+                ticket.future.set_result(ticket.item)
+        # 이 단계의 마지막 워커가 다음 단계 워커 수만큼 종료 신호를 넘긴다
+        with self._lock:
+            self._alive[i] -= 1
+            last = self._alive[i] == 0
+        if last and q_out is not None:
+            for _ in range(self.stages[i + 1].workers):
+                q_out.put(_STOP)
+
+    # ---------- 상태 ----------
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                st.name: {
+                    "workers": st.workers,
+                    "processes": st.processes,
+                    "queued": self._queues[i].qsize(),
+                    "max_queue": st.queue_size,
+                    "processed": st.processed,
+                    "failed": st.failed,
+                    "busy_s": round(st.busy_s, 3),
+                }
+                for i, st in enumerate(self.stages)
+            }
+
+
+# ------------------------------------------------------------
+# Kai 파이프라인 단계 (run_once + export 를 단계로 쪼갠 것)
+# 항목: {"domain", "input", "out_dir", "export", "deadline_s" | "deadline", "cfg"?}
+# ------------------------------------------------------------
+def _item_deadline(item: Dict[str, Any]) -> Optional[Deadline]:
+    if item.get("deadline") is None and item.get("deadline_s") is not None:
+        item["deadline"] = Deadline(item["deadline_s"])
+    return item.get("deadline")
+
+
+def qgen_stage(item: Dict[str, Any]) -> Dict[str, Any]:
+    from core_engine.qgen_engine import run_qgen_pipeline
+    from core_engine.startup_profile import mark_first_stage
+
+    mark_first_stage("qgen")
+    item["strategy"] = run_qgen_pipeline(item["domain"], item["input"], cfg=item.get("cfg"),
+                                         deadline=_item_deadline(item))
+    return item
+
+
+def stratos_stage(item: Dict[str, Any]) -> Dict[str, Any]:
+    from core_engine.stratos_evaluator import evaluate_strategy
+
+    item["evaluation"] = evaluate_strategy(item["domain"], item["strategy"], cfg=item.get("cfg"),
+                                           deadline=_item_deadline(item))
+    return item
+
+
+def save_stage(item: Dict[str, Any]) -> Dict[str, Any]:
+    from core_engine.save_strategy import save_strategy
+
+    item["out_dir"] = save_strategy(item["domain"], item["strategy"], item["evaluation"],
+                                    out_dir=item.get("out_dir"), quiet=True, deadline=_item_deadline(item))
+    return item
+
+
+def export_stage(item: Dict[str, Any]) -> Dict[str, Any]:
+    """포맷별 리포트 내보내기. 새 필드만 돌려준다 (프로세스 풀에서 돌 때 pickle 비용; 항목에는 실행기가 합침)."""
+    from core_engine.pipeline import export_reports
+
+    exports = export_reports(item["strategy"], item["evaluation"], item["out_dir"], item.get("export"),
+                             quiet=True, deadline=_item_deadline(item))
+    return {"exports": exports}
+
+
+def default_stage_limits() -> Dict[str, Tuple[int, int]]:
+    """
+    단계별 (워커 수, 입력 큐 크기) 기본값.
+    - qgen/stratos: CPU 수 (LLM 호출이 들어가면 I/O 대기 위주)
+    - save: 1 (작은 파일 쓰기)
+    - export: CPU 수의 절반, 프로세스 풀 (PDF 렌더링이 GIL 을 잡음)
+    """
+    cpus = os.cpu_count() or 1
+    half = max(1, cpus // 2)
+    return {"qgen": (cpus, cpus * 2), "stratos": (cpus, cpus * 2), "save": (1, 4), "export": (half, half * 2)}
+
+
+_KAI_STAGE_FNS = {"qgen": qgen_stage, "stratos": stratos_stage, "save": save_stage, "export": export_stage}
+
+
+def kai_stages(limits: Dict[str, Tuple[int, int]] | None = None, *, export_processes: bool = True) -> List[Stage]:
+    """QGEN → STRATOS → SAVE → EXPORT 단계 구성. limits 는 parse_limits 형식 ('qgen=2:8,export=2:4')."""
+    merged = default_stage_limits()
+    unknown = set(limits or {}) - set(merged)
+    if unknown:
+        raise ValueError(f"unknown pipeline stage(s): {', '.join(sorted(unknown))} (expected: {', '.join(merged)})")
+    merged.update(limits or {})
+    return [
+        Stage(name, fn, merged[name][0], queue_size=merged[name][1],
+              processes=export_processes and name == "export")
+        for name, fn in _KAI_STAGE_FNS.items()
+    ]
+
+
+__all__ = [
+    "Stage", "StagePipeline", "kai_stages", "default_stage_limits",
+    "qgen_stage", "stratos_stage", "save_stage", "export_stage",
+]
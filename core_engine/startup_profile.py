@@ -0,0 +1,158 @@
+# core_engine/startup_profile.py
+from __future__ import annotations
+
+import json
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+# CLI 콜드 스타트 프로파일러.
+# 대상 스크립트를 `python -X importtime` 으로 다시 실행해 모듈별 임포트 비용을 모으고,
+# 파이프라인 첫 단계 진입 시각(mark_first_stage)까지의 시간을 잰다.
+# 체크인된 예산(tools/startup_budget.json)과 비교해 회귀를 잡는다.
+
+ROOT = Path(__file__).resolve().parent.parent
+BUDGET_PATH = ROOT / "tools" / "startup_budget.json"
+PROFILE_FLAG = "--profile-startup"
+_MARK_ENV = "KAI_STARTUP_MARK"
+_MARK_PREFIX = "kai-startup: first_stage "
+_MARKED = False
+
+
+def mark_first_stage(stage: str) -> None:
+    """파이프라인 첫 단계 진입 시 호출. 프로파일 실행 중일 때만 stderr 에 시각을 남긴다 (1회)."""
+    global _MARKED
+    if _MARKED or not os.environ.get(_MARK_ENV):
+        return
+    _MARKED = True
+    sys.stderr.write(f"{_MARK_PREFIX}{time.time():.6f} {stage}\n")
+    sys.stderr.flush()
+
+
+def _parse_importtime(stderr: str) -> List[Dict[str, Any]]:
+    rows: List[Dict[str, Any]] = []
+    for line in stderr.splitlines():
+        # "import time:   self [us] | cumulative | <들여쓰기>module"
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3:
+            continue
+        raw_name = parts[2].rstrip()
+        rows.append({
+            "module": raw_name.strip(),
+            "depth": (len(raw_name) - len(raw_name.lstrip())) // 2,
+            "self_ms": int(parts[0]) / 1000.0,
+            "cumulative_ms": int(parts[1]) / 1000.0,
+        })
+    return rows
+
+
+def profile_script(script: str, argv: List[str] | None = None, cwd: str | None = None) -> Dict[str, Any]:
+    """script 를 -X importtime 으로 실행해 임포트 비용/첫 단계 시간/전체 시간을 반환."""
+    env = os.environ.copy()
+    env[_MARK_ENV] = "1"
+    env["PYTHONIOENCODING"] = "utf-8"
+    cmd = [sys.executable, "-X", "importtime", script, *(argv or [])]
+    t0 = time.time()
+    p = subprocess.run(cmd, cwd=cwd or str(ROOT), env=env, capture_output=True, text=True,
+                       encoding="utf-8", errors="replace")
+    wall_ms = (time.time() - t0) * 1000.0
+
+    first_stage_ms: Optional[float] = None
+    first_stage: Optional[str] = None
+    other_err: List[str] = []
+    for line in p.stderr.splitlines():
+        if line.startswith(_MARK_PREFIX):
+            ts, _, first_stage = line[len(_MARK_PREFIX):].partition(" ")
+            first_stage_ms = (float(ts) - t0) * 1000.0
+        elif not line.startswith("import time:"):
+            other_err.append(line)
+
+    rows = _parse_importtime(p.stderr)
+    packages: Dict[str, float] = {}
+    for r in rows:
+        top = r["module"].split(".", 1)[0]
+        packages[top] = packages.get(top, 0.0) + r["self_ms"]
+
+    return {
+        "script": script,
+        "argv": argv or [],
+        "returncode": p.returncode,
+        "wall_ms": round(wall_ms, 1),
+        "first_stage": first_stage,
+        "first_stage_ms": round(first_stage_ms, 1) if first_stage_ms is not None else None,
+        "import_ms": round(sum(r["self_ms"] for r in rows), 1),
+        "modules": rows,
+        "packages_ms": {k: round(v, 2) for k, v in sorted(packages.items(), key=lambda kv: -kv[1])},
+        "stderr": "\n".join(other_err),
+    }
+
+
+def format_report(rep: Dict[str, Any], top: int = 20) -> str:
+    fs = f"{rep['first_stage_ms']}ms ({rep['first_stage']})" if rep["first_stage_ms"] is not None else "-"
+    lines = [
+        f"[startup] {rep['script']} {' '.join(rep['argv'])}".rstrip(),
+        f"  wall={rep['wall_ms']}ms  imports={rep['import_ms']}ms  first_stage={fs}  rc={rep['returncode']}",
+        "  -- top packages (self ms) --",
+    ]
+    for name, ms in list(rep["packages_ms"].items())[:top]:
+        lines.append(f"  {ms:9.2f}  {name}")
+    lines.append("  -- top modules (cumulative ms) --")
+    for r in sorted(rep["modules"], key=lambda r: -r["cumulative_ms"])[:top]:
+        lines.append(f"  {r['cumulative_ms']:9.2f}  {r['self_ms']:8.2f}  {r['module']}")
+    return "\n".join(lines)
+
+
+def check_budget(rep: Dict[str, Any], budget: Dict[str, Any]) -> List[str]:
+    """예산 위반 메시지 목록 (비었으면 통과)."""
+    errs: List[str] = []
+    name = budget.get("name") or rep["script"]
+    if rep["returncode"] != 0:
+        errs.append(f"{name}: exit code {rep['returncode']}\n{rep['stderr'][-2000:]}")
+    lim = budget.get("max_import_ms")
+    if lim is not None and rep["import_ms"] > lim:
+        errs.append(f"{name}: imports {rep['import_ms']}ms > budget {lim}ms")
+    lim = budget.get("max_first_stage_ms")
+    if lim is not None:
+        if rep["first_stage_ms"] is None:
+            errs.append(f"{name}: first stage never reached")
+        elif rep["first_stage_ms"] > lim:
+            errs.append(f"{name}: first stage {rep['first_stage_ms']}ms > budget {lim}ms")
+    for pkg, lim in (budget.get("packages_ms") or {}).items():
+        got = rep["packages_ms"].get(pkg, 0.0)
+        if got > lim:
+            errs.append(f"{name}: package '{pkg}' self import {got}ms > budget {lim}ms")
+    loaded = {r["module"] for r in rep["modules"]}
+    for mod in budget.get("forbidden") or []:
+        hit = sorted(m for m in loaded if m == mod or m.startswith(mod + "."))
+        if hit:
+            errs.append(f"{name}: forbidden import at startup: {hit[0]}")
+    return errs
+
+
+def load_budget(path: Path = BUDGET_PATH) -> Dict[str, Any]:
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def maybe_profile_startup(script: str) -> None:
+    """
+    엔트리 스크립트 맨 위(무거운 import 전)에서 호출.
+    argv 에 --profile-startup 이 있으면 자신을 -X importtime 으로 재실행해 리포트를 출력하고 종료.
+    """
+    if PROFILE_FLAG not in sys.argv:
+        return
+    argv = [a for a in sys.argv[1:] if a != PROFILE_FLAG]
+    rep = profile_script(os.path.abspath(script), argv, cwd=os.getcwd())
+    print(format_report(rep))
+    sys.exit(rep["returncode"])
+
+
+__all__ = [
+    "mark_first_stage", "profile_script", "format_report", "check_budget",
+    "load_budget", "maybe_profile_startup", "PROFILE_FLAG", "BUDGET_PATH",
+]
@@ -1,17 +1,13 @@
 # core_engine/stratos_evaluator.py
 from __future__ import annotations
 from typing import Dict, Any
-from pathlib import Path
-import yaml
 
 from schemas.strategy import EvalReport, StructuredStrategy
+from core_engine import config_cache
+from core_engine.deadline import Deadline
 
 def _load_domain_config(domain: str) -> Dict[str, Any]:
-    cfg_path = Path("domains") / domain / "config.yaml"
-    if cfg_path.exists():
-        with cfg_path.open("r", encoding="utf-8") as f:
-            return yaml.safe_load(f) or {}
-    return {}
+    return config_cache.load_or_default(domain, lambda _d: {})
 
 def _as_dict(strategy: Any) -> Dict[str, Any]:
     if isinstance(strategy, StructuredStrategy):
@@ -21,11 +17,31 @@ def _as_dict(strategy: Any) -> Dict[str, Any]:
     # 문자열/기타가 들어와도 깨지지 않게 최소 구조로 감싸기
     return {"title": str(strategy), "objectives": [], "modules": [], "flow": [], "risks": [], "meta": {}}
 
-def evaluate_strategy(domain: str, strategy: Any) -> EvalReport:
+DEFAULT_WEIGHTS: Dict[str, float] = {
+    "structure": 0.25,
+    "coverage": 0.25,
+    "feasibility": 0.25,
+    "risk": 0.15,
+    "clarity": 0.10,
+}
+
+def normalized_weights(cfg: Dict[str, Any]) -> Dict[str, float]:
+    """config 의 stratos_weights (없으면 기본값) 를 합 1 로 정규화"""
+    weights = cfg.get("stratos_weights", DEFAULT_WEIGHTS)
+    # 정규화 안전장치
+    total_w = sum(weights.values()) or 1.0
+    return {k: float(v) / total_w for k, v in weights.items()}
+
+def evaluate_strategy(domain: str, strategy: Any, *, cfg: Dict[str, Any] | None = None,
+                      deadline: Deadline | None = None, weights: Dict[str, float] | None = None) -> EvalReport:
     """
     간단한 휴리스틱 STRATOS 평가 (MVP):
     - 구조(Structure), 커버리지(Coverage), 실행가능성(Feasibility), 리스크(Risk), 명료성(Clarity)
     - 도메인 config의 stratos_weights 사용, 없으면 기본 가중치
+    - cfg: 미리 로드된 도메인 config (없으면 파일에서 로드)
+    - weights: 미리 정규화된 가중치 (domain_registry). 주면 가중치는 cfg 에서 다시 계산하지 않는다
+    - 결과의 config_version 은 평가에 쓴 cfg 의 버전 (cfg 없이 weights 만 주면 None)
+    - deadline: 휴리스틱 평가는 상수 시간이라 예산과 무관하게 끝까지 수행
     """
     s = _as_dict(strategy)
 
@@ -47,18 +63,9 @@ def evaluate_strategy(domain: str, strategy: Any) -> EvalReport:
     risk = 70.0                                                       # 기본 70 (MVP 고정)
     clarity = 86.7 if title else 70.0                                 # 제목 있으면 86.7
 
-    cfg = _load_domain_config(domain)
-    weights = cfg.get("stratos_weights", {
-        "structure": 0.25,
-        "coverage": 0.25,
-        "feasibility": 0.25,
-        "risk": 0.15,
-        "clarity": 0.10,
-    })
-
-    # 정규화 안전장치
-    total_w = sum(weights.values()) or 1.0
-    norm = {k: float(v) / total_w for k, v in weights.items()}
+    if cfg is None and weights is None:
+        cfg = _load_domain_config(domain)
+    norm = weights if weights is not None else normalized_weights(cfg)
 
     score = (
         structure * norm.get("structure", 0.0) +
@@ -88,4 +95,5 @@ def evaluate_strategy(domain: str, strategy: Any) -> EvalReport:
         findings=findings,
         recommendations=recs,
         used_weights=norm,
+        config_version=cfg.get("config_version", 0) if cfg is not None else None,
     )
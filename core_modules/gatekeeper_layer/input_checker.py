@@ -1,9 +1,12 @@
 # core_modules/gatekeeper_layer/input_checker.py
+from core_engine.keyword_matcher import KeywordMatcher
+
+# 입력 유형 -> 키워드 (순서 = 우선순위)
+INPUT_TYPE_KEYWORDS = {
+    "전략형": ["전략", "설계", "만들", "플랫폼", "앱", "퍼널"],
+    "아이디어형": ["아이디어", "기획"],
+}
+_MATCHER = KeywordMatcher.compile(INPUT_TYPE_KEYWORDS)
 
 def classify_input_type(text: str) -> str:
-    t = (text or "").lower()
-    if any(k in t for k in ["전략", "설계", "만들", "플랫폼", "앱", "퍼널"]):
-        return "전략형"
-    if any(k in t for k in ["아이디어", "기획"]):
-        return "아이디어형"
-    return "기타형"
+    return _MATCHER.first_label(text or "", default="기타형")
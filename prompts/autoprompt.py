@@ -1,5 +1,8 @@
-from typing import Dict, List
+from typing import Dict, List, Optional
 from schemas.strategy import PromptBundle
+from core_engine.example_index import ExampleIndex, index_for, selection_limits
+from core_engine.config_store import config_version_of
+from core_engine import prompt_loader
 
 DEFAULT_EXAMPLES: List[Dict[str, str]] = [
     {
@@ -12,21 +15,47 @@ DEFAULT_EXAMPLES: List[Dict[str, str]] = [
     }
 ]
 
-def build_prompt_bundle(
-    *,
-    system_text: str,
-    domain_cfg: Dict,
-    user_text: str,
-    thinking_combo: Dict
-) -> PromptBundle:
+def _system(system_text: str, domain_cfg: Dict, thinking_combo: Dict) -> str:
     sys_lines = [system_text.strip()]
     goal = (domain_cfg.get("goal") or "").strip()
     if goal:
         sys_lines.append(f"[도메인 목표] {goal}")
     sys_lines.append(f"[사고 프레임] strategy={thinking_combo.get('strategy_frame')}, judgment={thinking_combo.get('judgment')}")
-    system = "\n".join(sys_lines)
+    return "\n".join(sys_lines)
+
+def build_prompt_bundle(
+    *,
+    system_text: Optional[str] = None,
+    prompt_name: Optional[str] = None,
+    domain_cfg: Dict,
+    user_text: str,
+    thinking_combo: Dict,
+    example_index: Optional[ExampleIndex] = None,
+    max_examples: Optional[int] = None,
+    budget_chars: Optional[int] = None,
+) -> PromptBundle:
+    """
+    system_text 대신 prompt_name 을 주면 prompt_loader.load_prompt(prompt_name) 을 쓴다.
+    system 텍스트는 (프롬프트 내용, 도메인, config_version, goal, thinking combo) 키로 캐시된다.
+    예시는 전부 넣지 않고 user_text 와 가까운 상위 max_examples 개를 budget_chars 안에서 고른다.
+    example_index 는 domain_registry.DomainState.examples (없으면 domain_cfg 의 examples 로 색인을 찾거나 만든다).
+    max_examples / budget_chars 기본값은 domain_cfg.cutoffs.few_shot_k / few_shot_chars.
+    """
+    if system_text is None:
+        system_text = prompt_loader.load_prompt(prompt_name or "qgen")
+    # goal 까지 키에 넣어 config_version 을 안 올린 수동 편집에도 안전
+    key = ("system", system_text, domain_cfg.get("domain_name"), config_version_of(domain_cfg),
+           domain_cfg.get("goal"), tuple(sorted(thinking_combo.items())))
+    system = prompt_loader.memo(key, lambda: _system(system_text, domain_cfg, thinking_combo))
 
     user = user_text.strip()
-    examples = domain_cfg.get("examples") or DEFAULT_EXAMPLES
+    if example_index is None:
+        example_index = index_for(domain_cfg.get("examples") or DEFAULT_EXAMPLES)
+    k, budget = selection_limits(domain_cfg)
+    examples = example_index.select(
+        user,
+        k=k if max_examples is None else max_examples,
+        budget_chars=budget if budget_chars is None else budget_chars,
+    )
 
-    return PromptBundle(system=system, user=user, examples=examples)
\ No newline at end of file
+    return PromptBundle(system=system, user=user, examples=examples)
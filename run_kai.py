@@ -4,39 +4,65 @@ import argparse
 import os
 import sys
 
-from core_engine.qgen_engine import run_qgen_pipeline
-from core_engine.stratos_evaluator import evaluate_strategy
-from core_engine.save_strategy import save_strategy
-from tools.export_report import (
-    export_markdown_report,
-    export_html_report,
-    export_pdf_report,
-)
+from core_engine.startup_profile import maybe_profile_startup
+maybe_profile_startup(__file__)  # --profile-startup: 무거운 import 전에 가로챔
+
+from core_engine.deadline import Deadline
+from core_engine.pipeline import run_once, export_reports, export_choices
 
 def safe_print(*args, quiet=False, **kwargs):
     if not quiet:
         print(*args, **kwargs)
 
-def run_once(domain: str, user_input: str):
-    """QGEN → STRATOS → SAVE"""
-    strategy = run_qgen_pipeline(domain, user_input)
-    evaluation = evaluate_strategy(domain, strategy)
-    out_dir = save_strategy(domain, strategy, evaluation)
-    return strategy, evaluation, out_dir
+def run_batch_mode(args) -> None:
+    from core_engine.batch_runner import load_batch_inputs, run_batch
+
+    items = load_batch_inputs(args.batch, args.domain)
+    stages = None
+    if args.pipeline is not None:
+        from core_engine.admission import parse_limits
+        stages = parse_limits(args.pipeline)
+        safe_print(f"Kai batch: {len(items)} inputs, stage pipeline {args.pipeline or '(defaults)'}", quiet=args.quiet)
+    else:
+        safe_print(f"Kai batch: {len(items)} inputs, workers={args.workers or os.cpu_count()}", quiet=args.quiet)
+    batch_dir = run_batch(items, export=args.export, workers=args.workers, quiet=args.quiet,
+                          deadline_s=args.deadline, stages=stages)
+    safe_print(f"[batch] -> {batch_dir}", quiet=args.quiet)
 
 def main():
     parser = argparse.ArgumentParser(description="Kai CLI")
     parser.add_argument("--domain", required=True, help="도메인 이름")
-    parser.add_argument("--input", required=True, help="사용자 입력")
-    parser.add_argument("--export", choices=["md", "html", "pdf", "all"], help="리포트 내보내기 형식")
+    parser.add_argument("--input", help="사용자 입력")
+    parser.add_argument("--batch", help="배치 입력 (JSONL 파일 또는 *.txt 디렉터리)")
+    parser.add_argument("--workers", type=int, default=None, help="배치 워커 프로세스 수 (기본: CPU 수)")
+    parser.add_argument("--pipeline", nargs="?", const="", default=None, metavar="SPEC",
+                        help="배치를 단계 파이프라인으로 실행 (생성/저장/내보내기 겹침). 단계별 워커:큐 (예: qgen=4:8,export=2:4)")
+    parser.add_argument("--export", choices=export_choices(), help="리포트 내보내기 형식")
     parser.add_argument("--open", action="store_true", help="생성 후 열기")
     parser.add_argument("--debug", action="store_true", help="디버그 정보(가중치 등) 노출")
     parser.add_argument("--quiet", action="store_true", help="로그 최소화")
     parser.add_argument("--logo", default=None, help="PDF 헤더 로고 경로 (선택)")
+    parser.add_argument("--deadline", type=float, default=None, help="요청(배치는 항목)당 시간 예산(초). 부족하면 PDF 등 생략")
+    parser.add_argument("--profile-startup", action="store_true", help="모듈별 임포트 비용/첫 단계까지 시간 리포트")
+    parser.add_argument("--profile", action="store_true", help="단계별 cProfile 을 출력 폴더의 _profile/ 에 저장 (.pstats + .collapsed)")
     args = parser.parse_args()
 
+    if args.batch and args.profile:
+        parser.error("--profile 은 단건 실행 전용입니다 (배치는 워커 프로세스에서 돌아 단계별 프로파일을 모을 수 없음)")
+    if args.batch:
+        run_batch_mode(args)
+        return
+    if not args.input:
+        parser.error("--input 또는 --batch 중 하나가 필요합니다")
+
     safe_print("Kai System Initializing...", quiet=args.quiet)
-    strategy, evaluation, out_dir = run_once(args.domain, args.input)
+    deadline = Deadline(args.deadline) if args.deadline is not None else None
+    profiler = None
+    if args.profile:
+        from core_engine.profiling import StageProfiler
+        profiler = StageProfiler()
+    strategy, evaluation, out_dir = run_once(args.domain, args.input, quiet=args.quiet, deadline=deadline,
+                                             profiler=profiler)
 
     title = getattr(strategy, "title", None) or (
         strategy.get("title") if isinstance(strategy, dict) else ""
@@ -51,12 +77,15 @@ def main():
     safe_print(f"- 평가 점수: {score:.1f}", quiet=args.quiet)
 
     if args.export:
-        if args.export in ("md", "all"):
-            export_markdown_report(strategy, evaluation, out_dir, open_file=args.open, debug=args.debug, quiet=args.quiet)
-        if args.export in ("html", "all"):
-            export_html_report(strategy, evaluation, out_dir, open_file=args.open, debug=args.debug, quiet=args.quiet)
-        if args.export in ("pdf", "all"):
-            export_pdf_report(strategy, evaluation, out_dir, open_file=args.open, debug=args.debug, quiet=args.quiet, logo_path=args.logo)
+        export_reports(strategy, evaluation, out_dir, args.export,
+                       open_file=args.open, debug=args.debug, quiet=args.quiet, logo_path=args.logo,
+                       deadline=deadline, profiler=profiler)
+
+    if profiler is not None:
+        prof_dir = os.path.join(out_dir, "_profile")
+        profiler.dump(prof_dir)
+        safe_print(f"[profile] -> {prof_dir}  " + ", ".join(f"{k}={v}ms" for k, v in profiler.summary().items()),
+                   quiet=args.quiet)
 
 if __name__ == "__main__":
     main()
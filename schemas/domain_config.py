@@ -1,5 +1,5 @@
-from pydantic import BaseModel, Field, ValidationError
-from typing import List, Dict
+from pydantic import BaseModel, Field, ValidationError, field_validator
+from typing import Any, List, Dict, Optional
 
 class DomainConfig(BaseModel):
     domain_name: str
@@ -10,12 +10,49 @@ class DomainConfig(BaseModel):
     flow_patterns: List[str] = Field(default_factory=list)
     risks: List[str] = Field(default_factory=list)
     mitigations: List[str] = Field(default_factory=list)
+    routing_keywords: Dict[str, List[str]] = Field(default_factory=dict)
+    stratos_weights: Dict[str, float] = Field(default_factory=dict)
+    cutoffs: Dict[str, Any] = Field(default_factory=dict)
+    config_version: int = 0  # config_store.save_domain_config 가 쓸 때마다 +1
+
+    @field_validator("constraints", mode="before")
+    @classmethod
+    def _stringify_constraints(cls, v: Any) -> Any:
+        # YAML 은 max_objectives: 7 을 int 로 읽는다. 엔진 계약은 문자열 값.
+        if isinstance(v, dict):
+            return {str(k): x if isinstance(x, str) else str(x) for k, x in v.items()}
+        return v or {}
+
+    @field_validator("examples", mode="before")
+    @classmethod
+    def _wrap_examples(cls, v: Any) -> Any:
+        # 예시는 문자열(입력만) 또는 {"input", "output"} 둘 다 허용
+        if isinstance(v, list):
+            return [{"input": x} if isinstance(x, str) else x for x in v]
+        return v or []
+
+    @field_validator("routing_keywords", mode="before")
+    @classmethod
+    def _stringify_keywords(cls, v: Any) -> Any:
+        if isinstance(v, dict):
+            return {str(k): [str(kw) for kw in (kws or [])] for k, kws in v.items()}
+        return v or {}
+
+    @field_validator("kpis", "flow_patterns", "risks", "mitigations", "stratos_weights", "cutoffs", mode="before")
+    @classmethod
+    def _none_as_empty(cls, v: Any, info: Any) -> Any:
+        if v is None:
+            return {} if info.field_name in ("stratos_weights", "cutoffs") else []
+        return v
+
+def validate_config_dict(raw: Optional[Dict[str, Any]], source: str = "<config>") -> DomainConfig:
+    try:
+        return DomainConfig.model_validate(raw or {})
+    except ValidationError as e:
+        raise RuntimeError(f"[config invalid] {source}\n{e}")
 
 def load_and_validate_config(path: str) -> DomainConfig:
-    import yaml, json
+    import yaml
     with open(path, "r", encoding="utf-8") as f:
         raw = yaml.safe_load(f)
-    try:
-        return DomainConfig.model_validate(raw)
-    except ValidationError as e:
-        raise RuntimeError(f"[config invalid] {path}\n{e}")
\ No newline at end of file
+    return validate_config_dict(raw, path)
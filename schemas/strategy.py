@@ -1,7 +1,7 @@
 # schemas/strategy.py
 from __future__ import annotations
 from pydantic import BaseModel, Field
-from typing import List, Dict
+from typing import List, Dict, Optional
 
 class StrategyRequest(BaseModel):
     domain: str
@@ -36,4 +36,5 @@ class EvalReport(BaseModel):
     score: float
     findings: List[str] = Field(default_factory=list)
     recommendations: List[str] = Field(default_factory=list)
-    used_weights: Dict[str, float] = Field(default_factory=dict)
\ No newline at end of file
+    used_weights: Dict[str, float] = Field(default_factory=dict)
+    config_version: Optional[int] = None  # 평가에 쓴 도메인 config 의 config_version
\ No newline at end of file
@@ -22,6 +22,8 @@ try:
 except Exception:
     _qgen_generate_strategy = None  # type: ignore
 
+from core_engine.profiling import stage
+
 INPUT_DIR = ROOT / "tests" / "golden" / "inputs"
 SNAP_DIR  = ROOT / "tests" / "golden" / "snapshots"
 
@@ -177,19 +179,22 @@ def _call_qgen(domain: str, qmand: Any, fallback_text: str) -> Dict[str, Any]:
 # -----------------------
 # 테스트 실행
 # -----------------------
-def run_case(name: str, text: str, update: bool) -> str:
+def run_case(name: str, text: str, update: bool, profiler: Any = None) -> str:
     """단일 케이스 실행/비교. 결과: 'unchanged' | 'changed' | 'created' | 'updated'."""
     domain = "finsetreport"
 
     # QMAND
-    qmand = run_qmand_pipeline(domain=domain, user_input=text)
+    with stage(profiler, "qmand"):
+        qmand = run_qmand_pipeline(domain=domain, user_input=text)
     qmand_d = _to_dict(qmand)
 
     # QGEN (호환 래퍼)
-    draft = _call_qgen(domain, qmand_d, text)
+    with stage(profiler, "qgen"):
+        draft = _call_qgen(domain, qmand_d, text)
 
     # STRATOS
-    evalr = evaluate_strategy(domain, draft)
+    with stage(profiler, "stratos"):
+        evalr = evaluate_strategy(domain, draft)
     eval_d = _to_dict(evalr) or (evalr if isinstance(evalr, dict) else {})
 
     # 정규화
@@ -231,8 +236,15 @@ def main():
     ap = argparse.ArgumentParser()
     ap.add_argument("--case", default="", help="특정 케이스만 실행 (예: case3)")
     ap.add_argument("--update-baseline", action="store_true", help="스냅샷 갱신")
+    ap.add_argument("--profile", action="store_true",
+                    help="케이스/단계별 cProfile 저장 (output/_profile/golden_<ts>/<case>/*.pstats, *.collapsed)")
     args = ap.parse_args()
 
+    prof_root = None
+    if args.profile:
+        from datetime import datetime
+        prof_root = ROOT / "output" / "_profile" / f"golden_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+
     cases = []
     for p in sorted(INPUT_DIR.glob("*.txt")):
         name = p.stem
@@ -249,11 +261,20 @@ def main():
     summary = []
     for name, text in cases:
         print(f"\n[CASE] {name}: {text}")
-        status = run_case(name, text, update=args.update_baseline)
+        profiler = None
+        if prof_root is not None:
+            from core_engine.profiling import StageProfiler
+            profiler = StageProfiler()
+        status = run_case(name, text, update=args.update_baseline, profiler=profiler)
         summary.append({"case": name, "status": status})
+        if profiler is not None:
+            profiler.dump(str(prof_root / name))
+            summary[-1]["profile_ms"] = profiler.summary()
         if status in ("changed",):
             changed_any = True
 
+    if prof_root is not None:
+        print(f"\n[profile] -> {prof_root}")
     print("\n=== Summary ===")
     print(json.dumps(summary, ensure_ascii=False, indent=2))
 
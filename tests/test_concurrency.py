@@ -0,0 +1,377 @@
+# tests/test_concurrency.py
+from __future__ import annotations
+
+import asyncio
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Dict, List
+from unittest import mock
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from core_engine import model_router, route_health
+from core_engine.rate_limit import BATCH, INTERACTIVE, ProviderLimiter, RateLimited
+from core_engine.route_health import CircuitOpen, RouteTable
+from core_engine.singleflight import SingleFlight
+
+# model_router / singleflight / rate_limit / route_health 동작 테스트 (provider 는 가짜, 네트워크 없음)
+#   python -m unittest discover -s tests -v
+
+
+def _valid(tag: str) -> str:
+    return f'{{"title": "{tag}"}}'
+
+
+class _FakeProvider(model_router.ProviderBase):
+    """route 이름별 지연(초)만큼 잠든 뒤 유효 후보를 돌려준다. 호출 시각을 기록."""
+
+    def __init__(self, delays: Dict[str, float]):
+        self.delays = delays
+        self.started: Dict[str, float] = {}
+
+    def call(self, model: str, messages: List[Dict[str, str]], temperature: float = 0.2) -> str:
+        self.started[model] = time.monotonic()
+        time.sleep(self.delays.get(model, 0.0))
+        return _valid(model)
+
+
+class SingleFlightTest(unittest.TestCase):
+    def test_one_leader_for_concurrent_calls(self) -> None:
+        sf = SingleFlight()
+        calls = []
+        gate = threading.Event()
+
+        def fn() -> str:
+            calls.append(1)
+            gate.wait(2)
+            return "value"
+
+        results: List[str] = []
+        threads = [threading.Thread(target=lambda: results.append(sf.do("k", fn))) for _ in range(8)]
+        for t in threads:
+            t.start()
+        time.sleep(0.1)  # 모두 같은 호출에 붙을 때까지
+        gate.set()
+        for t in threads:
+            t.join()
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(results, ["value"] * 8)
+        self.assertEqual(sf.stats()["leaders"], 1)
+        self.assertEqual(sf.stats()["shared"], 7)
+        self.assertEqual(sf.stats()["in_flight"], 0)
+
+    def test_followers_get_their_own_error_copy(self) -> None:
+        sf = SingleFlight()
+        gate = threading.Event()
+
+        def fn() -> str:
+            gate.wait(2)
+            raise ValueError("boom")
+
+        errors: List[BaseException] = []
+
+        def run() -> None:
+            try:
+                sf.do("k", fn)
+            except ValueError as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=run) for _ in range(4)]
+        for t in threads:
+            t.start()
+        time.sleep(0.1)
+        gate.set()
+        for t in threads:
+            t.join()
+        self.assertEqual(len(errors), 4)
+        self.assertEqual(len({id(e) for e in errors}), 4)
+        leader = [e for e in errors if e.__cause__ is None]
+        self.assertEqual(len(leader), 1)
+        for e in errors:
+            if e is not leader[0]:
+                self.assertIs(e.__cause__, leader[0])
+
+    def test_follower_error_keeps_type_and_attributes(self) -> None:
+        sf = SingleFlight()
+        gate = threading.Event()
+
+        def fn() -> str:
+            gate.wait(2)
+            raise RateLimited("openai", 1.0, 7.5)
+
+        errors: List[BaseException] = []
+
+        def run() -> None:
+            try:
+                sf.do("k", fn)
+            except BaseException as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=run) for _ in range(3)]
+        for t in threads:
+            t.start()
+        time.sleep(0.1)
+        gate.set()
+        for t in threads:
+            t.join()
+        followers = [e for e in errors if e.__cause__ is not None]
+        self.assertEqual(len(followers), 2)
+        for e in followers:
+            self.assertIs(type(e), RateLimited)  # RuntimeError 로 바뀌지 않음
+            self.assertEqual((e.provider, e.retry_after), ("openai", 7.5))
+            self.assertEqual(str(e), str(e.__cause__))
+
+    def test_leader_cancelled_once_every_waiter_is_gone(self) -> None:
+        sf = SingleFlight()
+        state = {"cancelled": False}
+
+        async def slow() -> str:
+            try:
+                await asyncio.sleep(5)
+            except asyncio.CancelledError:
+                state["cancelled"] = True
+                raise
+            return "late"
+
+        async def main() -> None:
+            waiters = [asyncio.ensure_future(sf.ado("k", slow)) for _ in range(3)]
+            await asyncio.sleep(0.05)
+            waiters[0].cancel()
+            await asyncio.sleep(0.05)
+            self.assertFalse(state["cancelled"])  # 아직 기다리는 호출자가 있음
+            for w in waiters[1:]:
+                w.cancel()
+            await asyncio.gather(*waiters, return_exceptions=True)
+            await asyncio.sleep(0.05)
+            self.assertTrue(state["cancelled"])
+            self.assertEqual(sf.stats()["in_flight"], 0)
+
+        asyncio.run(main())
+
+    def test_remaining_waiters_get_result_after_one_cancels(self) -> None:
+        sf = SingleFlight()
+
+        async def fn() -> str:
+            await asyncio.sleep(0.1)
+            return "ok"
+
+        async def main() -> List[object]:
+            waiters = [asyncio.ensure_future(sf.ado("k", fn)) for _ in range(3)]
+            await asyncio.sleep(0.02)
+            waiters[0].cancel()
+            return await asyncio.gather(*waiters, return_exceptions=True)
+
+        res = asyncio.run(main())
+        self.assertIsInstance(res[0], asyncio.CancelledError)
+        self.assertEqual(res[1:], ["ok", "ok"])
+
+
+class RateLimitTest(unittest.TestCase):
+    def _drained(self, rps: float, shared_dir: Path | None = None) -> ProviderLimiter:
+        lim = ProviderLimiter("test", rps, None, max_wait=5.0, shared_dir=shared_dir)
+        for _ in range(int(max(1.0, rps))):
+            lim.acquire(1, INTERACTIVE, max_wait=0.5)
+        return lim
+
+    def test_interactive_served_before_earlier_batch(self) -> None:
+        lim = self._drained(10.0)
+        order: List[str] = []
+        batch = [threading.Thread(target=lambda: (lim.acquire(1, BATCH), order.append("batch")))
+                 for _ in range(3)]
+        for t in batch:
+            t.start()
+        time.sleep(0.02)  # batch 가 먼저 대기열에 들어감
+        inter = threading.Thread(target=lambda: (lim.acquire(1, INTERACTIVE), order.append("interactive")))
+        inter.start()
+        for t in batch + [inter]:
+            t.join()
+        self.assertEqual(order[0], "interactive")
+        self.assertEqual(sorted(order), ["batch"] * 3 + ["interactive"])
+
+    def test_rate_limited_after_max_wait(self) -> None:
+        lim = self._drained(1.0)
+        t0 = time.monotonic()
+        with self.assertRaises(RateLimited) as cm:
+            lim.acquire(1, BATCH, max_wait=0.1)
+        self.assertLess(time.monotonic() - t0, 0.5)
+        self.assertGreaterEqual(cm.exception.retry_after, 1.0)
+        self.assertEqual(lim.stats()["priorities"]["batch"]["rejected"], 1)
+        self.assertEqual(lim.stats()["queue_depth"], 0)
+
+    def test_shared_buckets_are_one_budget(self) -> None:
+        with tempfile.TemporaryDirectory() as d:
+            self._drained(2.0, Path(d))
+            other = ProviderLimiter("test", 2.0, None, max_wait=5.0, shared_dir=Path(d))
+            with self.assertRaises(RateLimited):
+                other.acquire(1, BATCH, max_wait=0.1)  # 다른 limiter 가 이미 버킷을 비움
+
+    def test_shared_poll_runs_off_event_loop(self) -> None:
+        with tempfile.TemporaryDirectory() as d:
+            lim = ProviderLimiter("test", 10.0, None, max_wait=5.0, shared_dir=Path(d))
+            real_poll = lim._shared.poll
+            threads: List[str] = []
+
+            def slow_poll(tokens: int, prio: int) -> float:
+                threads.append(threading.current_thread().name)
+                time.sleep(0.2)  # 느린 파일 잠금
+                return real_poll(tokens, prio)
+
+            lim._shared.poll = slow_poll
+
+            async def main() -> int:
+                ticks = 0
+
+                async def ticker() -> None:
+                    nonlocal ticks
+                    while True:
+                        await asyncio.sleep(0.01)
+                        ticks += 1
+
+                t = asyncio.ensure_future(ticker())
+                await lim.aacquire(1, INTERACTIVE)
+                t.cancel()
+                return ticks
+
+            self.assertGreater(asyncio.run(main()), 5)  # 이벤트 루프가 계속 돌았음
+            self.assertNotEqual(threads, [threading.main_thread().name])
+
+    def test_shared_buckets_are_opt_in(self) -> None:
+        from core_engine import rate_limit
+        with mock.patch.dict("os.environ", {}, clear=False) as env:
+            env.pop("KAI_RATE_LIMIT_SHARED", None)
+            self.assertIsNone(rate_limit._shared_dir_from_env())
+            env["KAI_RATE_LIMIT_SHARED"] = "1"
+            self.assertIsNotNone(rate_limit._shared_dir_from_env())
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class RouteHealthTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.clock = _Clock()
+        # time 모듈 전체가 아니라 route_health 가 보는 time 만 바꾼다 (다른 스레드의 time.monotonic 은 그대로)
+        patcher = mock.patch.object(route_health, "time", SimpleNamespace(monotonic=self.clock))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.table = RouteTable()
+        self.route = {"provider": "p", "name": "m"}
+
+    def _state(self) -> str:
+        return self.table.state()["p:m"]["state"]
+
+    def test_open_half_open_closed(self) -> None:
+        for _ in range(route_health.FAILURE_THRESHOLD):
+            self.table.record_failure("p:m")
+        self.assertEqual(self._state(), "open")
+        with self.assertRaises(CircuitOpen) as cm:
+            self.table.rank([self.route])
+        self.assertAlmostEqual(cm.exception.retry_after, route_health.COOLDOWN, places=1)
+
+        self.clock.now += route_health.COOLDOWN
+        self.assertEqual(self._state(), "half_open")
+        self.assertEqual(self.table.rank([self.route]), [self.route])  # probe 하나
+        with self.assertRaises(CircuitOpen):
+            self.table.rank([self.route])  # 다음 probe 는 PROBE_INTERVAL 뒤
+
+        self.table.record_success("p:m", 0.1)
+        self.assertEqual(self._state(), "closed")
+        self.assertEqual(self.table.rank([self.route]), [self.route])
+
+    def test_failed_probe_reopens_with_longer_cooldown(self) -> None:
+        for _ in range(route_health.FAILURE_THRESHOLD):
+            self.table.record_failure("p:m")
+        self.clock.now += route_health.COOLDOWN
+        self.table.rank([self.route])
+        self.table.record_failure("p:m")
+        self.assertEqual(self._state(), "open")
+        self.assertAlmostEqual(self.table.state()["p:m"]["retry_in_s"], 2 * route_health.COOLDOWN, places=1)
+
+    def test_abandoned_call_latency_ranks_route_last(self) -> None:
+        slow, fast = {"provider": "p", "name": "slow"}, {"provider": "p", "name": "fast"}
+        self.table.record_success("p:fast", 0.1)
+        self.table.record_latency("p:slow", 2.0)
+        self.assertEqual(self.table.rank([slow, fast]), [fast, slow])
+        self.assertEqual(self.table.state()["p:slow"]["failures"], 0)
+
+
+class QuorumTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.provider = _FakeProvider({})
+        model_router.PROVIDERS["fake"] = self.provider
+        self.addCleanup(model_router.PROVIDERS.pop, "fake", None)
+        model_router.ROUTES.reset()
+        self.addCleanup(model_router.ROUTES.reset)
+        self.messages = [{"role": "user", "content": f"{self.id()} {time.time()}"}]  # single-flight 키를 테스트마다 다르게
+
+    def _drain(self) -> None:
+        """버려진 호출 스레드가 _fetch 를 끝낼 때까지 (single-flight 에서 빠지는 것은 기록이 끝난 뒤)"""
+        end = time.monotonic() + 3.0
+        while model_router.IN_FLIGHT.stats()["in_flight"] and time.monotonic() < end:
+            time.sleep(0.02)
+        self.assertEqual(model_router.IN_FLIGHT.stats()["in_flight"], 0)
+
+    def test_stops_at_k(self) -> None:
+        self.provider.delays.update({"a": 0.0, "b": 0.02, "c": 2.0})
+        routes = [{"provider": "fake", "name": n} for n in ("a", "b", "c")]
+        t0 = time.monotonic()
+        out = model_router.quorum_call(routes, self.messages, k=2, hedge=False, cache=False,
+                                       merge=lambda texts: "|".join(sorted(texts)))
+        self.assertLess(time.monotonic() - t0, 1.0)  # c 를 기다리지 않음
+        self.assertEqual(out, f"{_valid('a')}|{_valid('b')}")
+
+    def test_hedges_after_hedge_after(self) -> None:
+        self.provider.delays.update({"slow": 1.0, "fast": 0.0})
+        routes = [{"provider": "fake", "name": "slow", "hedge_after_s": 0.1}, {"provider": "fake", "name": "fast"}]
+        t0 = time.monotonic()
+        out = model_router.quorum_call(routes, self.messages, k=1, cache=False)
+        self.assertEqual(out, _valid("fast"))
+        self.assertLess(time.monotonic() - t0, 0.8)
+        self.assertGreaterEqual(self.provider.started["fast"] - self.provider.started["slow"], 0.09)
+
+    def test_no_hedge_when_first_route_is_fast(self) -> None:
+        self.provider.delays.update({"a": 0.0, "b": 0.0})
+        routes = [{"provider": "fake", "name": "a", "hedge_after_s": 0.5}, {"provider": "fake", "name": "b"}]
+        self.assertEqual(model_router.quorum_call(routes, self.messages, k=1, cache=False), _valid("a"))
+        self.assertNotIn("b", self.provider.started)
+
+    def test_async_quorum_stops_at_k_and_hedges(self) -> None:
+        self.provider.delays.update({"slow": 1.0, "fast": 0.0})
+        routes = [{"provider": "fake", "name": "slow", "hedge_after_s": 0.1}, {"provider": "fake", "name": "fast"}]
+        t0 = time.monotonic()
+        out = asyncio.run(model_router.aquorum_call(routes, self.messages, k=1, cache=False))
+        self.assertEqual(out, _valid("fast"))
+        self.assertLess(time.monotonic() - t0, 0.8)
+
+    def test_hedge_loser_late_success_is_not_counted(self) -> None:
+        self.provider.delays.update({"slow": 0.3, "fast": 0.0})
+        routes = [{"provider": "fake", "name": "slow", "hedge_after_s": 0.05}, {"provider": "fake", "name": "fast"}]
+        self.assertEqual(model_router.quorum_call(routes, self.messages, k=1, cache=False), _valid("fast"))
+        self._drain()
+        slow = model_router.route_state()["fake:slow"]
+        self.assertEqual((slow["calls"], slow["failures"]), (0, 0))  # 지연만 남고 성공으로 다시 세지 않음
+        self.assertIsNotNone(slow["ewma_ms"])
+
+    def test_route_timeout_counts_as_failure(self) -> None:
+        self.provider.delays.update({"hang": 1.0, "ok": 0.0})
+        routes = [{"provider": "fake", "name": "hang", "timeout_s": 0.1}, {"provider": "fake", "name": "ok"}]
+        model_router.quorum_call(routes, self.messages, k=2, hedge=False, cache=False)
+        self._drain()  # 늦게 끝난 hang 호출이 성공으로 덮어쓰지 않는지까지 (cleanup 의 reset 뒤로 새지도 않게)
+        hang = model_router.route_state()["fake:hang"]
+        self.assertEqual((hang["calls"], hang["failures"], hang["consecutive_failures"]), (1, 1, 1))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,94 @@
+# tests/test_config_history.py
+from __future__ import annotations
+
+import sys
+import tempfile
+import unittest
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict
+from unittest import mock
+
+import yaml
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from core_engine import config_cache, config_history
+
+# config_history 기록/조회 테스트 (임시 디렉터리를 domains 루트로 씀)
+#   python -m unittest discover -s tests -v
+
+DOMAIN = "zz_history"
+
+
+def _cfg(version: int, **weights: float) -> Dict[str, object]:
+    return {"domain_name": DOMAIN, "config_version": version, "stratos_weights": dict(weights)}
+
+
+class ConfigHistoryTest(unittest.TestCase):
+    def setUp(self) -> None:
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        patcher = mock.patch.object(config_cache, "_ROOT", Path(tmp.name))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        config_history._INDEX_CACHE.clear()
+        self.addCleanup(config_history._INDEX_CACHE.clear)
+
+    def test_weights_replay_in_time_order(self) -> None:
+        config_history.record(DOMAIN, _cfg(1, a=0.5, b=0.5), when=100)
+        config_history.record(DOMAIN, _cfg(2, a=0.7, b=0.5), when=300)
+        self.assertEqual(config_history.weights_at(DOMAIN, 150), {"a": 0.5, "b": 0.5})
+        self.assertEqual(config_history.weights_at(DOMAIN, 300), {"a": 0.7, "b": 0.5})
+        self.assertEqual(config_history.entries(DOMAIN)[1]["weights_delta"], {"a": 0.7})
+        with self.assertRaises(LookupError):
+            config_history.weights_at(DOMAIN, 99)
+
+    def test_backdated_record_rebases_following_entry(self) -> None:
+        config_history.record(DOMAIN, _cfg(1, a=0.5, b=0.5), when=100)
+        config_history.record(DOMAIN, _cfg(2, a=0.7, b=0.5), when=300)
+        config_history.record(DOMAIN, _cfg(0, a=0.9, b=0.1), when=200)  # 나중에 옮겨진 예전 복사본
+        self.assertEqual([e["epoch"] for e in config_history.entries(DOMAIN)], [100, 200, 300])
+        self.assertEqual(config_history.weights_at(DOMAIN, 250), {"a": 0.9, "b": 0.1})
+        self.assertEqual(config_history.weights_at(DOMAIN, 350), {"a": 0.7, "b": 0.5})  # 뒤 항목이 그대로
+        self.assertEqual(config_history.weights_at(DOMAIN, 150), {"a": 0.5, "b": 0.5})
+
+    def test_deleted_weight_is_tombstoned(self) -> None:
+        config_history.record(DOMAIN, _cfg(1, a=0.5, b=0.5), when=100)
+        config_history.record(DOMAIN, _cfg(2, a=1.0), when=200)
+        self.assertEqual(config_history.entries(DOMAIN)[1]["weights_delta"], {"a": 1.0, "b": None})
+        self.assertEqual(config_history.weights_at(DOMAIN, 250), {"a": 1.0})
+        config_history.record(DOMAIN, _cfg(0, a=0.2, b=0.3, c=0.5), when=150)  # 사이에 끼워도 삭제는 유지
+        self.assertEqual(config_history.weights_at(DOMAIN, 175), {"a": 0.2, "b": 0.3, "c": 0.5})
+        self.assertEqual(config_history.weights_at(DOMAIN, 250), {"a": 1.0})
+
+    def test_entry_at_version_with_legacy_entries(self) -> None:
+        config_history.record(DOMAIN, _cfg(1, a=0.5), when=100)
+        config_history.record(DOMAIN, _cfg(2, a=0.6), when=300)
+        config_history.record(DOMAIN, _cfg(0, a=0.1), when=50)   # legacy: 모두 version 0, 시각은 더 이름
+        config_history.record(DOMAIN, _cfg(0, a=0.2), when=200)  # 시각 순 버전: 0, 1, 0, 2 (단조 아님)
+        self.assertEqual(config_history.entry_at_version(DOMAIN, 2)["epoch"], 300)
+        self.assertEqual(config_history.entry_at_version(DOMAIN, 1)["epoch"], 100)
+        self.assertEqual(config_history.entry_at_version(DOMAIN, 0)["epoch"], 200)  # 같은 버전이면 가장 늦은 것
+        with self.assertRaises(LookupError):
+            config_history.entry_at_version(DOMAIN, 3)
+        cfg = config_history.config_at(DOMAIN, 120)
+        self.assertEqual((cfg["config_version"], cfg["stratos_weights"]), (1, {"a": 0.5}))
+
+    def test_migrate_legacy_after_newer_writes(self) -> None:
+        config_history.record(DOMAIN, _cfg(1, a=0.5, b=0.5), when=datetime(2025, 9, 1, tzinfo=timezone.utc))
+        d = config_history.history_dir(DOMAIN)
+        for stamp, a in (("20250810_072240", 0.1), ("20250810_072545", 0.2)):
+            (d / f"config_{stamp}.yaml").write_text(yaml.safe_dump(_cfg(0, a=a, b=0.9)), encoding="utf-8")
+        self.assertEqual(len(config_history.migrate_legacy(DOMAIN, prune=True)), 2)
+        self.assertEqual(config_history.migrate_legacy(DOMAIN), [])
+        self.assertEqual(list(d.glob("config_*.yaml")), [])
+        self.assertEqual(config_history.weights_at(DOMAIN, "2025-08-10T07:25:00Z"), {"a": 0.1, "b": 0.9})
+        self.assertEqual(config_history.weights_at(DOMAIN, "2025-08-20T00:00:00Z"), {"a": 0.2, "b": 0.9})
+        self.assertEqual(config_history.weights_at(DOMAIN, "2025-09-02T00:00:00Z"), {"a": 0.5, "b": 0.5})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,74 @@
+# tests/test_config_store.py
+from __future__ import annotations
+
+import sys
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+from typing import List
+from unittest import mock
+
+import yaml
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from core_engine import config_cache, config_history, config_snapshot
+from core_engine.config_store import ConfigConflict, save_domain_config
+
+# config_store 쓰기 테스트 (임시 디렉터리를 domains 루트/스냅샷 위치로 씀)
+#   python -m unittest discover -s tests -v
+
+DOMAIN = "zz_store"
+
+
+class SaveDomainConfigTest(unittest.TestCase):
+    def setUp(self) -> None:
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        for target, attr, value in ((config_cache, "_ROOT", Path(tmp.name)),
+                                    (config_snapshot, "SNAPSHOT_DIR", Path(tmp.name) / "snap")):
+            patcher = mock.patch.object(target, attr, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        config_history._INDEX_CACHE.clear()
+        self.addCleanup(config_history._INDEX_CACHE.clear)
+        self.path = config_cache.config_path(DOMAIN)
+        self.path.parent.mkdir(parents=True)
+
+    def _on_disk(self) -> dict:
+        return yaml.safe_load(self.path.read_bytes())
+
+    def test_version_increments_and_conflict_keeps_file(self) -> None:
+        self.assertEqual(save_domain_config(DOMAIN, {"stratos_weights": {"a": 1.0}}), 1)
+        self.assertEqual(save_domain_config(DOMAIN, {"stratos_weights": {"a": 0.5}}, expected_version=1), 2)
+        with self.assertRaises(ConfigConflict):
+            save_domain_config(DOMAIN, {"stratos_weights": {"a": 0.1}}, expected_version=1)  # 이미 2
+        self.assertEqual(self._on_disk(), {"stratos_weights": {"a": 0.5}, "config_version": 2})
+        self.assertEqual([e["version"] for e in config_history.entries(DOMAIN)], [1, 2])  # 충돌은 이력에도 없음
+
+    def test_concurrent_writers_with_same_expected_version(self) -> None:
+        save_domain_config(DOMAIN, {"stratos_weights": {"a": 1.0}})
+        barrier = threading.Barrier(4)
+        results: List[object] = []
+
+        def write(i: int) -> None:
+            barrier.wait()
+            try:
+                results.append(save_domain_config(DOMAIN, {"stratos_weights": {"a": i / 10}}, expected_version=1))
+            except ConfigConflict as e:
+                results.append(e)
+
+        threads = [threading.Thread(target=write, args=(i,)) for i in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual([r for r in results if not isinstance(r, ConfigConflict)], [2])  # 한 writer 만 이김
+        self.assertEqual(self._on_disk()["config_version"], 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
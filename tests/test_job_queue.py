@@ -0,0 +1,83 @@
+# tests/test_job_queue.py
+from __future__ import annotations
+
+import sys
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from core_engine.job_queue import JobQueue, lease_heartbeat
+
+# job_queue 리스/재시도 테스트 (임시 SQLite, 짧은 리스)
+#   python -m unittest discover -s tests -v
+
+
+class JobQueueTest(unittest.TestCase):
+    def setUp(self) -> None:
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.db = str(Path(tmp.name) / "jobs.sqlite3")
+        self.q = JobQueue(self.db)
+        self.addCleanup(self.q.close)
+
+    def test_expired_lease_is_reclaimed(self) -> None:
+        job_id = self.q.enqueue("finsetreport", "x")
+        first = self.q.claim("w1", lease_s=0.05)
+        self.assertEqual((first["id"], first["attempts"]), (job_id, 1))
+        self.assertIsNone(self.q.claim("w2", lease_s=0.05))  # 아직 리스 중
+        time.sleep(0.1)
+        second = self.q.claim("w2", lease_s=5.0)
+        self.assertEqual((second["id"], second["attempts"], second["lease_owner"]), (job_id, 2, "w2"))
+        self.assertFalse(self.q.complete(job_id, "w1", "out", {}))  # 리스를 뺏긴 늦은 워커
+        self.assertTrue(self.q.complete(job_id, "w2", "out", {}))
+        self.assertEqual(self.q.get(job_id)["status"], "done")
+
+    def test_expired_lease_stops_at_max_attempts(self) -> None:
+        job_id = self.q.enqueue("finsetreport", "x", max_attempts=2)
+        for _ in range(2):
+            self.assertIsNotNone(self.q.claim("w", lease_s=0.05))
+            time.sleep(0.1)  # 워커가 죽은 것처럼 리스 만료
+        self.assertEqual(self.q.pending(), 0)
+        self.assertIsNone(self.q.claim("w", lease_s=0.05))
+        job = self.q.get(job_id)
+        self.assertEqual((job["status"], job["attempts"]), ("failed", 2))
+        self.assertIn("lease expired on attempt 2", job["error"])
+
+    def test_fail_backs_off_then_gives_up(self) -> None:
+        job_id = self.q.enqueue("finsetreport", "x", max_attempts=2)
+        self.q.claim("w")
+        self.assertTrue(self.q.fail(job_id, "w", "boom"))
+        job = self.q.get(job_id)
+        self.assertEqual(job["status"], "queued")
+        self.assertGreater(job["available_at"], time.time())  # 백오프 동안은 claim 안 됨
+        self.assertIsNone(self.q.claim("w"))
+        self.q._db.execute("UPDATE jobs SET available_at = 0 WHERE id = ?", (job_id,))
+        self.q.claim("w")
+        self.assertTrue(self.q.fail(job_id, "w", "boom again"))
+        self.assertEqual(self.q.failed()[0]["error"], "boom again")
+
+    def test_heartbeat_keeps_long_job_leased(self) -> None:
+        job_id = self.q.enqueue("finsetreport", "x")
+        self.q.claim("w1", lease_s=0.2)
+        with lease_heartbeat(self.db, job_id, "w1", 0.2, interval_s=0.05):
+            time.sleep(0.5)  # 리스보다 긴 작업
+            self.assertIsNone(self.q.claim("w2", lease_s=0.2))
+        self.assertTrue(self.q.complete(job_id, "w1", "out", {}))
+
+    def test_heartbeat_stops_after_lease_is_lost(self) -> None:
+        job_id = self.q.enqueue("finsetreport", "x")
+        self.q.claim("w1", lease_s=0.05)
+        time.sleep(0.1)
+        self.q.claim("w2", lease_s=5.0)
+        with lease_heartbeat(self.db, job_id, "w1", 5.0, interval_s=0.02):
+            time.sleep(0.1)
+        self.assertEqual(self.q.get(job_id)["lease_owner"], "w2")  # 늦은 w1 이 리스를 되찾지 않음
+
+
+if __name__ == "__main__":
+    unittest.main()
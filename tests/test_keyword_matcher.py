@@ -0,0 +1,86 @@
+# tests/test_keyword_matcher.py
+from __future__ import annotations
+
+import random
+import sys
+import unittest
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from core_engine.keyword_matcher import KeywordMatcher, normalize
+
+# keyword_matcher 를 예전 선형 스캔(라벨 순서대로 `kw in text`)과 비교
+#   python -m unittest discover -s tests -v
+
+
+def _linear_first(table: Dict[str, List[str]], text: str, default: Optional[str] = None) -> Optional[str]:
+    t = normalize(text)
+    for label, kws in table.items():
+        if any(normalize(kw) in t for kw in kws if kw):
+            return label
+    return default
+
+
+def _linear_all(table: Dict[str, List[str]], text: str) -> Set[Tuple[int, int, str]]:
+    t = normalize(text)
+    out = set()
+    for kws in table.values():
+        for kw in kws:
+            k = normalize(kw)
+            start = t.find(k)
+            while k and start >= 0:
+                out.add((start, start + len(k), k))
+                start = t.find(k, start + 1)
+    return out
+
+
+class KeywordMatcherTest(unittest.TestCase):
+    def test_label_order_is_priority_not_text_position(self) -> None:
+        table = {"report": ["보고서", "리포트"], "strategy": ["전략"]}
+        m = KeywordMatcher.compile(table)
+        self.assertEqual(m.first_label("전략 먼저, 그다음 월간 보고서"), "report")
+        self.assertEqual(m.first_label("전략만"), "strategy")
+        self.assertEqual(m.first_label("해당 없음", default="strategy"), "strategy")
+        self.assertEqual(m.matched_labels("전략 보고서"), ["report", "strategy"])
+
+    def test_overlapping_keywords_via_fail_links(self) -> None:
+        table = {"a": ["hers"], "b": ["she"], "c": ["he"]}
+        m = KeywordMatcher.compile(table)
+        text = "ushers"
+        self.assertEqual({(x.start, x.end, x.keyword) for x in m.find_all(text)}, _linear_all(table, text))
+        self.assertEqual(m.first_label(text), "a")
+
+    def test_normalization_matches_linear_scan(self) -> None:
+        table = {"kpi": ["KPI"], "loan": ["대출"]}
+        m = KeywordMatcher.compile(table)
+        for text in ("ＫＰＩ 점검", "kpi", "대출 한도", "대출 재검토"):  # 전각, 소문자, 분해된 한글
+            self.assertEqual(m.first_label(text), _linear_first(table, text), text)
+
+    def test_random_inputs_agree_with_linear_scan(self) -> None:
+        rng = random.Random(1234)
+        alphabet = "가나다라ab"
+        for _ in range(200):
+            table: Dict[str, List[str]] = {}
+            for li in range(rng.randint(1, 5)):
+                table[f"L{li}"] = ["".join(rng.choice(alphabet) for _ in range(rng.randint(1, 3)))
+                                   for _ in range(rng.randint(1, 4))]
+            text = "".join(rng.choice(alphabet + " ") for _ in range(rng.randint(0, 30)))
+            m = KeywordMatcher.compile(table)
+            self.assertEqual(m.first_label(text, default="none"), _linear_first(table, text, default="none"),
+                             (table, text))
+            self.assertEqual({(x.start, x.end, x.keyword) for x in m.find_all(text)}, _linear_all(table, text),
+                             (table, text))
+
+    def test_same_keyword_in_several_labels(self) -> None:
+        m = KeywordMatcher.compile({"first": ["리스크"], "second": ["리스크", "위험"]})
+        self.assertEqual(m.find_all("리스크")[0].labels, ("first", "second"))
+        self.assertEqual(m.first_label("위험과 리스크"), "first")
+        self.assertEqual(len(m), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,109 @@
+# tests/test_response_cache.py
+from __future__ import annotations
+
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from types import SimpleNamespace
+from unittest import mock
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from core_engine import response_cache
+from core_engine.response_cache import ResponseCache, cache_key
+
+# response_cache 메모리/디스크 단 TTL 과 디스크 정리 테스트 (시각은 가짜 시계)
+#   python -m unittest discover -s tests -v
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 1_700_000_000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _key(i: int) -> str:
+    return cache_key("p", "m", [{"role": "user", "content": str(i)}], 0.2)
+
+
+class ResponseCacheTest(unittest.TestCase):
+    def setUp(self) -> None:
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.dir = Path(tmp.name)
+        self.clock = _Clock()
+        patcher = mock.patch.object(response_cache, "time", SimpleNamespace(time=self.clock))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _cache(self, **kw) -> ResponseCache:
+        kw.setdefault("ttl_s", 100.0)
+        return ResponseCache(disk_dir=self.dir, **kw)
+
+    def _files(self) -> list:
+        return sorted(p.stem for p in self.dir.glob("*/*.json"))
+
+    def test_memory_entry_expires_after_ttl(self) -> None:
+        c = ResponseCache(ttl_s=100.0, disk_dir=None)
+        c.put(_key(1), "a")
+        self.clock.now += 99
+        self.assertEqual(c.get(_key(1)), "a")
+        self.clock.now += 2
+        self.assertIsNone(c.get(_key(1)))
+        self.assertEqual((c.stats()["expired"], c.stats()["entries"]), (1, 0))
+
+    def test_disk_tier_survives_restart_until_ttl(self) -> None:
+        self._cache().put(_key(1), "a")
+        fresh = self._cache()
+        self.assertEqual(fresh.get(_key(1)), "a")
+        self.assertEqual(fresh.stats()["disk_hits"], 1)
+        self.clock.now += 101
+        later = self._cache()
+        self.assertIsNone(later.get(_key(1)))
+        self.assertEqual(self._files(), [])  # 만료된 파일은 읽은 김에 지움
+
+    def test_lru_evicts_oldest_entry(self) -> None:
+        c = ResponseCache(max_entries=2, disk_dir=None)
+        c.put(_key(1), "a")
+        c.put(_key(2), "b")
+        c.get(_key(1))  # 1 을 최근으로
+        c.put(_key(3), "c")
+        self.assertEqual([c.get(_key(i)) for i in (1, 2, 3)], ["a", None, "c"])
+        self.assertEqual(c.stats()["evictions"], 1)
+
+    def test_prune_removes_expired_then_oldest_over_cap(self) -> None:
+        c = self._cache(max_disk_bytes=None)
+        for i in range(4):
+            c.put(_key(i), "x" * 100)
+        paths = {i: c._disk_path(_key(i)) for i in range(4)}
+        for i, age in ((0, 150), (1, 50), (2, 30), (3, 10)):  # 0 은 TTL(100) 지남
+            os.utime(paths[i], (self.clock.now - age, self.clock.now - age))
+        c.max_disk_bytes = 2 * paths[3].stat().st_size  # 두 파일만 남게
+        self.assertEqual(c.prune_disk(self.clock.now), 2)
+        self.assertEqual(self._files(), sorted([_key(2), _key(3)]))
+        self.assertEqual(c.stats()["pruned"], 2)
+
+    def test_first_put_prunes_leftovers_then_waits_interval(self) -> None:
+        old = self._cache()
+        old.put(_key(1), "a")
+        os.utime(old._disk_path(_key(1)), (self.clock.now - 200, self.clock.now - 200))  # 이전 실행이 남긴 만료 파일
+        c = self._cache()
+        c.put(_key(2), "b")
+        self.assertEqual(self._files(), [_key(2)])
+        os.utime(c._disk_path(_key(2)), (self.clock.now - 200, self.clock.now - 200))
+        self.clock.now += 1
+        c.put(_key(3), "c")  # PRUNE_INTERVAL 이 안 지남 → 정리 안 함
+        self.assertIn(_key(2), self._files())
+        self.clock.now += response_cache.PRUNE_INTERVAL
+        c.put(_key(4), "d")
+        self.assertNotIn(_key(2), self._files())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,97 @@
+# tests/test_service_stream.py
+from __future__ import annotations
+
+import http.client
+import json
+import sys
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+from unittest import mock
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from core_engine import service
+
+# 서비스 /run, /run/stream (NDJSON, SSE) 이벤트 순서 테스트 (mock provider, 임시 출력 폴더)
+#   python -m unittest discover -s tests -v
+
+BODY = {"domain": "finsetreport", "input": "온보딩 개선", "export": "md"}
+ORDER = ["qmand", "qgen", "stratos", "save", "export", "done"]
+
+
+class ServiceStreamTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.tmp = tempfile.TemporaryDirectory()
+        cls.patcher = mock.patch.object(service, "_request_out_dir",
+                                        lambda base_dir="output": tempfile.mkdtemp(dir=cls.tmp.name))
+        cls.patcher.start()
+        cls.server = service.make_server(port=0, quiet=True)
+        cls.thread = threading.Thread(target=cls.server.serve_forever, daemon=True)
+        cls.thread.start()
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        cls.server.shutdown()
+        cls.server.server_close()
+        cls.patcher.stop()
+        cls.tmp.cleanup()
+
+    def _post(self, path: str, body: Dict[str, Any], headers: Dict[str, str] | None = None) -> Tuple[int, str, str]:
+        conn = http.client.HTTPConnection("127.0.0.1", self.server.server_address[1], timeout=60)
+        try:
+            conn.request("POST", path, json.dumps(body).encode("utf-8"),
+                         {"Content-Type": "application/json", **(headers or {})})
+            resp = conn.getresponse()
+            return resp.status, resp.getheader("Content-Type") or "", resp.read().decode("utf-8")
+        finally:
+            conn.close()
+
+    def test_ndjson_events_in_stage_order(self) -> None:
+        status, ctype, text = self._post("/run/stream", BODY)
+        self.assertEqual(status, 200)
+        self.assertTrue(ctype.startswith("application/x-ndjson"))
+        events = [json.loads(line) for line in text.splitlines() if line]
+        self.assertEqual([e["event"] for e in events], ORDER)
+        elapsed = [e["elapsed_ms"] for e in events]
+        self.assertEqual(elapsed, sorted(elapsed))
+        self.assertEqual(events[4]["data"]["format"], "md")
+        self.assertTrue(Path(events[4]["data"]["path"]).is_file())
+        self.assertEqual(events[-1]["data"]["out_dir"], events[3]["data"]["out_dir"])
+
+    def test_sse_frames_match_ndjson_events(self) -> None:
+        for path, headers in (("/run/stream?format=sse", {}), ("/run/stream", {"Accept": "text/event-stream"})):
+            status, ctype, text = self._post(path, BODY, headers)
+            self.assertEqual(status, 200)
+            self.assertTrue(ctype.startswith("text/event-stream"))
+            names: List[str] = []
+            for frame in text.split("\n\n"):
+                if not frame.strip():
+                    continue
+                head, data = frame.split("\n", 1)
+                self.assertTrue(head.startswith("event: ") and data.startswith("data: "), frame)
+                payload = json.loads(data[len("data: "):])
+                self.assertEqual(head[len("event: "):], payload["event"])
+                names.append(payload["event"])
+            self.assertEqual(names, ORDER)
+
+    def test_run_collects_stream_into_one_response(self) -> None:
+        status, _, text = self._post("/run", BODY)
+        self.assertEqual(status, 200)
+        out = json.loads(text)
+        self.assertTrue({"qmand", "strategy", "evaluation", "out_dir", "exports"} <= set(out))
+        self.assertEqual(len(out["exports"]), 1)
+
+    def test_stream_bad_request_before_first_event(self) -> None:
+        status, ctype, text = self._post("/run/stream", {"input": "x"})
+        self.assertEqual(status, 400)
+        self.assertIn("domain", json.loads(text)["error"])
+
+
+if __name__ == "__main__":
+    unittest.main()
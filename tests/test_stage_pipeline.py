@@ -0,0 +1,95 @@
+# tests/test_stage_pipeline.py
+from __future__ import annotations
+
+import queue
+import sys
+import threading
+import time
+import unittest
+from pathlib import Path
+from typing import Any, Dict
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from core_engine.deadline import Deadline
+from core_engine.stage_pipeline import Stage, StagePipeline
+
+# stage_pipeline 실행기 테스트 (단계 함수는 가짜)
+#   python -m unittest discover -s tests -v
+
+
+def _new_fields_only(item: Dict[str, Any]) -> Dict[str, Any]:
+    """export_stage 처럼 새 필드만 돌려주는 단계 (프로세스 풀에서도 쓰려고 모듈 최상위)"""
+    return {"seen": sorted(item), "deadline_s": item.get("deadline_s")}
+
+
+def _double(item: Dict[str, Any]) -> Dict[str, Any]:
+    item["value"] = item["value"] * 2
+    return item
+
+
+class StagePipelineTest(unittest.TestCase):
+    def test_thread_stage_merges_returned_fields(self) -> None:
+        with StagePipeline([Stage("double", _double), Stage("export", _new_fields_only)]) as pipe:
+            out = pipe.submit({"index": 3, "value": 2}).result(timeout=5)
+        self.assertEqual((out["index"], out["value"]), (3, 4))  # 새 필드만 돌려줘도 항목이 남음
+        self.assertEqual(out["seen"], ["index", "stage_ms", "value"])
+        self.assertEqual(set(out["stage_ms"]), {"double", "export"})
+
+    def test_process_stage_merges_and_drops_local_keys(self) -> None:
+        stages = [Stage("export", _new_fields_only, processes=True)]
+        with StagePipeline(stages) as pipe:
+            out = pipe.submit({"index": 1, "cfg": {"big": True}, "deadline": Deadline(30.0)}).result(timeout=30)
+        self.assertEqual(out["seen"], ["deadline_s", "index"])  # cfg/Deadline 객체는 넘기지 않음
+        self.assertGreater(out["deadline_s"], 0)
+        self.assertEqual((out["index"], out["cfg"]), (1, {"big": True}))
+
+    def test_failed_item_skips_later_stages(self) -> None:
+        calls = []
+
+        def boom(item: Dict[str, Any]) -> Dict[str, Any]:
+            raise ValueError("bad")
+
+        with StagePipeline([Stage("a", boom), Stage("b", lambda it: calls.append(it) or it)]) as pipe:
+            out = pipe.submit({"index": 0}).result(timeout=5)
+            stats = pipe.stats()
+        self.assertEqual((out["error"], out["failed_stage"]), ("ValueError: bad", "a"))
+        self.assertEqual(calls, [])
+        self.assertEqual((stats["a"]["failed"], stats["b"]["processed"]), (1, 0))
+
+    def test_full_queue_blocks_submit(self) -> None:
+        gate = threading.Event()
+
+        def wait(item: Dict[str, Any]) -> Dict[str, Any]:
+            gate.wait(5)
+            return item
+
+        pipe = StagePipeline([Stage("slow", wait, workers=1, queue_size=1)]).start()
+        try:
+            first = pipe.submit({"index": 0})
+            time.sleep(0.05)  # 워커가 첫 항목을 잡음
+            second = pipe.submit({"index": 1}, timeout=0.1)  # 큐 한 칸
+            with self.assertRaises(queue.Full):
+                pipe.submit({"index": 2}, timeout=0.1)  # backpressure
+            self.assertEqual(pipe.stats()["slow"]["queued"], 1)
+            gate.set()
+            self.assertEqual([first.result(5)["index"], second.result(5)["index"]], [0, 1])
+        finally:
+            gate.set()
+            pipe.close()
+
+    def test_map_keeps_input_order(self) -> None:
+        def jitter(item: Dict[str, Any]) -> Dict[str, Any]:
+            time.sleep(0.02 * (5 - item["index"] % 5))
+            return item
+
+        with StagePipeline([Stage("jitter", jitter, workers=4), Stage("double", _double)]) as pipe:
+            out = list(pipe.map({"index": i, "value": i} for i in range(20)))
+        self.assertEqual([o["index"] for o in out], list(range(20)))
+        self.assertEqual([o["value"] for o in out], [2 * i for i in range(20)])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,93 @@
+import argparse, json, os, sys
+from datetime import datetime
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(ROOT)
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from core_engine.startup_profile import maybe_profile_startup
+maybe_profile_startup(__file__)  # --profile-startup
+
+from core_engine import config_history
+
+def _when(args):
+    return args.at if args.at else datetime.now().astimezone()
+
+def cmd_migrate(args):
+    added = config_history.migrate_legacy(args.domain, prune=args.prune)
+    print(f"[ok] migrated {len(added)} legacy snapshot(s) -> {config_history.history_dir(args.domain)}")
+
+def cmd_log(args):
+    for e in config_history.entries(args.domain)[-args.limit:]:
+        delta = ", ".join(f"{k}={v:.4f}" if v is not None else f"{k}=(deleted)"
+                          for k, v in e["weights_delta"].items()) or "-"
+        print(f"{e['ts']}  v{e['version']:<4} {e['hash'][:12]}  {delta}")
+
+def cmd_show(args):
+    if args.version is not None:
+        e = config_history.entry_at_version(args.domain, args.version)
+        cfg = {**config_history.load_blob(args.domain, e["hash"]), "config_version": e["version"]}
+    else:
+        cfg = config_history.config_at(args.domain, _when(args))
+    print(json.dumps(cfg, ensure_ascii=False, indent=2))
+
+def cmd_weights(args):
+    print(json.dumps(config_history.weights_at(args.domain, _when(args)), indent=2))
+
+def cmd_rescore(args):
+    """저장된 출력 폴더의 strategy.json 을 그때 가중치로 다시 평가 (evaluation.json 의 config_version, 없으면 폴더 시각)"""
+    from core_engine.stratos_evaluator import evaluate_strategy, normalized_weights
+
+    with open(os.path.join(args.out_dir, "strategy.json"), encoding="utf-8") as f:
+        strategy = json.load(f)
+    old = {}
+    ev_path = os.path.join(args.out_dir, "evaluation.json")
+    if os.path.exists(ev_path):
+        with open(ev_path, encoding="utf-8") as f:
+            old = json.load(f)
+    if old.get("config_version"):
+        e = config_history.entry_at_version(args.domain, old["config_version"])
+        cfg = {**config_history.load_blob(args.domain, e["hash"]), "config_version": e["version"]}
+    else:
+        stamp = os.path.basename(os.path.normpath(args.out_dir))[:15]  # save_strategy: 로컬 시각 YYYYmmdd_HHMMSS
+        cfg = config_history.config_at(args.domain, datetime.strptime(stamp, "%Y%m%d_%H%M%S").astimezone())
+    ev = evaluate_strategy(args.domain, strategy, cfg=cfg, weights=normalized_weights(cfg))
+    print(json.dumps({"out_dir": args.out_dir, "old_score": old.get("score"), "score": ev.score,
+                      "config_version": ev.config_version}, ensure_ascii=False, indent=2))
+
+def main():
+    ap = argparse.ArgumentParser(description="도메인 config 이력 (내용 주소 blob + 시간 인덱스)")
+    ap.add_argument("--domain", default="finsetreport")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+
+    p = sub.add_parser("migrate", help="예전 config_history/config_*.yaml 전체 복사본을 blob + 인덱스로 변환")
+    p.add_argument("--prune", action="store_true", help="변환한 원본 파일 삭제")
+    p.set_defaults(fn=cmd_migrate)
+
+    p = sub.add_parser("log", help="이력 목록")
+    p.add_argument("--limit", type=int, default=50)
+    p.set_defaults(fn=cmd_log)
+
+    p = sub.add_parser("show", help="특정 시각/버전의 config")
+    p.add_argument("--at", help="ISO 시각 (기본: 지금). 예: 2025-08-10T07:25:00Z")
+    p.add_argument("--version", type=int, default=None)
+    p.set_defaults(fn=cmd_show)
+
+    p = sub.add_parser("weights", help="특정 시각의 stratos_weights")
+    p.add_argument("--at", help="ISO 시각 (기본: 지금)")
+    p.set_defaults(fn=cmd_weights)
+
+    p = sub.add_parser("rescore", help="출력 폴더를 당시 가중치로 다시 평가")
+    p.add_argument("out_dir")
+    p.set_defaults(fn=cmd_rescore)
+
+    args = ap.parse_args()
+    try:
+        args.fn(args)
+    except LookupError as e:
+        print(f"[err] {e}")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,7 @@
 # tools/export_report.py
 # -*- coding: utf-8 -*-
 from __future__ import annotations
-import os, json, webbrowser
+import os, webbrowser
 from datetime import datetime
 from typing import Any, Dict, List
 
@@ -45,11 +45,24 @@ def _ts() -> str:
 def _ensure_dir(path: str) -> None:
     os.makedirs(path, exist_ok=True)
 
+# 요청 예산(deadline)이 이보다 적게 남았으면 PDF 렌더링은 건너뜀
+PDF_MIN_BUDGET_S = 1.0
+
+def _skip_for_deadline(kind: str, deadline: Any, margin_s: float = 0.0, quiet: bool = False) -> bool:
+    """deadline(core_engine.deadline.Deadline)이 남은 시간 margin_s 미만이면 True (빈 경로 반환용)"""
+    if deadline is None or deadline.remaining() > margin_s:
+        return False
+    if not quiet:
+        print(f"[export] {kind} skipped (deadline, remaining={deadline.remaining():.2f}s)")
+    return True
+
 # ========= Markdown =========
 def _md_escape(s: str) -> str:
     return s.replace("|", "\\|")
 
 def export_markdown_report(strategy: Any, evaluation: Any, output_dir: str, open_file: bool=False, **kwargs) -> str:
+    if _skip_for_deadline("Markdown", kwargs.get("deadline"), quiet=kwargs.get("quiet", False)):
+        return ""
     _ensure_dir(output_dir)
     S, E = _norm_strategy(strategy), _norm_eval(evaluation)
     meta = S["meta"] or {}
@@ -93,13 +106,16 @@ def export_markdown_report(strategy: Any, evaluation: Any, output_dir: str, open
     path = os.path.join(output_dir, f"report_domain_{_ts()}.md")
     with open(path, "w", encoding="utf-8") as f:
         f.write("\n".join(lines))
-    print(f"[export] Markdown -> {path}")
+    if not kwargs.get("quiet"):
+        print(f"[export] Markdown -> {path}")
     if open_file:
         webbrowser.open(f"file://{os.path.abspath(path)}")
     return path
 
 # ========= HTML =========
 def export_html_report(strategy: Any, evaluation: Any, output_dir: str, open_file: bool=False, **kwargs) -> str:
+    if _skip_for_deadline("HTML", kwargs.get("deadline"), quiet=kwargs.get("quiet", False)):
+        return ""
     _ensure_dir(output_dir)
     S, E = _norm_strategy(strategy), _norm_eval(evaluation)
     meta = S["meta"] or {}
@@ -157,194 +173,70 @@ small.muted{{color:#777}}
     path = os.path.join(output_dir, f"report_domain_{_ts()}.html")
     with open(path, "w", encoding="utf-8") as f:
         f.write(html)
-    print(f"[export] HTML -> {path}")
+    if not kwargs.get("quiet"):
+        print(f"[export] HTML -> {path}")
     if open_file:
         webbrowser.open(f"file://{os.path.abspath(path)}")
     return path
 
-# ========= PDF =========
-from reportlab.lib.pagesizes import A4
-from reportlab.pdfgen.canvas import Canvas
-from reportlab.lib import colors
-from reportlab.platypus import Table, TableStyle, Paragraph
-from reportlab.lib.styles import ParagraphStyle
-from reportlab.pdfbase import pdfmetrics
-from reportlab.pdfbase.ttfonts import TTFont
-
-# 레이아웃 상수(일괄 간격 통일)
-MARGIN_X = 50
-TOP_MARGIN = 60
-BOTTOM_MARGIN = 60
-SECTION_GAP = 16         # 섹션 간 기본 간격
-PARA_GAP = 10            # 단락 간 간격
-LIST_GAP = 6             # 리스트 아이템 간 간격
-TABLE_GAP = 16
-
-def _register_kr_font(prefer: str = "NotoSansKR") -> str:
-    candidates = [
-        ("NotoSansKR", "assets/fonts/NotoSansKR-Regular.ttf"),
-        ("NotoSansKR", "fonts/NotoSansKR-Regular.ttf"),
-        ("MalgunGothic", "C:/Windows/Fonts/malgun.ttf"),
-        ("MalgunGothic", "C:\\Windows\\Fonts\\malgun.ttf"),
-    ]
-    for name, path in candidates:
-        if prefer == name and os.path.exists(path):
-            try:
-                pdfmetrics.registerFont(TTFont(name, path))
-                return name
-            except Exception:
-                pass
-    for name, path in candidates:
-        if os.path.exists(path):
-            try:
-                pdfmetrics.registerFont(TTFont(name, path))
-                return name
-            except Exception:
-                continue
-    return "Helvetica"
-
-def _new_page_if_needed(c: Canvas, y: float, need: float, font_name: str) -> float:
-    if y - need < BOTTOM_MARGIN:
-        c.showPage()
-        c.setFont(font_name, 11)
-        return A4[1] - TOP_MARGIN
-    return y
-
-def _draw_badge_right(c: Canvas, y_baseline: float, text: str):
-    pad_x, pad_y = 8, 3
-    c.setFont(c._fontname, 10)
-    w = c.stringWidth(text, c._fontname, 10) + pad_x * 2
-    h = 14
-    x = A4[0] - MARGIN_X - w  # 오른쪽 끝 정렬
-    c.setFillColorRGB(0.10, 0.34, 0.86)
-    c.roundRect(x, y_baseline - h + 3, w, h, 6, stroke=0, fill=1)
-    c.setFillColor(colors.white)
-    c.drawString(x + pad_x, y_baseline - h + 6, text)
-    c.setFillColor(colors.black)
-
-def _h1(c: Canvas, y: float, text: str) -> float:
-    c.setFont(c._fontname, 16)
-    c.drawString(MARGIN_X, y, text)
-    return y - 26
-
-def _h2(c: Canvas, y: float, text: str) -> float:
-    c.setFont(c._fontname, 12)
-    y = _new_page_if_needed(c, y, 20, c._fontname)
-    c.drawString(MARGIN_X, y, text)
-    return y - SECTION_GAP
-
-def _paragraph(c: Canvas, y: float, text: str, width: float, style: ParagraphStyle) -> float:
-    p = Paragraph(text, style)
-    w, h = p.wrapOn(c, width, 0)
-    y = _new_page_if_needed(c, y, h, style.fontName)
-    p.drawOn(c, MARGIN_X, y - h)
-    return y - h - PARA_GAP
-
-def _list(c: Canvas, y: float, items: List[str], width: float, style: ParagraphStyle) -> float:
-    for it in items:
-        y = _paragraph(c, y, f"&bull; {it}", width, style)
-        y -= (LIST_GAP - 2)
-    return y + (LIST_GAP - 2)
-
-def _table(c: Canvas, y: float, data: List[List[str]], col_w: List[float], font_name: str) -> float:
-    tbl = Table(data, colWidths=col_w)
-    tbl.setStyle(TableStyle([
-        ("GRID", (0,0), (-1,-1), 0.5, colors.black),
-        ("BACKGROUND", (0,0), (-1,0), colors.whitesmoke),
-        ("FONTNAME", (0,0), (-1,-1), font_name),
-        ("FONTSIZE", (0,0), (-1,-1), 10),
-        ("VALIGN", (0,0), (-1,-1), "MIDDLE"),
-    ]))
-    w, h = tbl.wrapOn(c, A4[0] - MARGIN_X*2, 0)
-    y = _new_page_if_needed(c, y, h, font_name)
-    tbl.drawOn(c, MARGIN_X, y - h)
-    return y - h - TABLE_GAP
-
-def export_pdf_report(strategy: Any, evaluation: Any, output_dir: str,
-                      open_file: bool=False, font_name: str="NotoSansKR",
-                      logo_path: str|None=None, debug: bool=False, quiet: bool=False, **kwargs) -> str:
-    _ensure_dir(output_dir)
-    S, E = _norm_strategy(strategy), _norm_eval(evaluation)
-    meta = S["meta"] or {}
-
-    kr_font = _register_kr_font(font_name)
-    path = os.path.join(output_dir, f"report_domain_{_ts()}.pdf")
-    c = Canvas(path, pagesize=A4)
-    c.setFont(kr_font, 11)
-    c._fontname = kr_font  # keep for helpers
-
-    width, height = A4
-    y = height - TOP_MARGIN
-
-    # 제목 + 배지(우측 고정)
-    y_title_base = y
-    y = _h1(c, y, "전략 리포트")
-    _draw_badge_right(c, y_title_base, f"STRATOS {E['score']}")
-
-    # 메타 (제목 아래로 확실히 내림)
-    meta_line = f"생성 시각(UTC): {meta.get('timestamp','')} · 모델: {meta.get('model','')} · 버전: {meta.get('version','')}"
-    c.setFont(kr_font, 9); c.setFillColor(colors.grey)
-    c.drawString(MARGIN_X, y_title_base - 14, meta_line)
-    c.setFillColor(colors.black)
-    y = y - 8  # 제목과 다음 섹션 사이 추가 여백
-
-    # 로고(선택)
-    if logo_path and os.path.exists(logo_path):
-        try:
-            c.drawImage(logo_path, width - 140, height - 80, width=90, preserveAspectRatio=True, mask='auto')
-        except Exception:
-            pass
-
-    pstyle = ParagraphStyle("KR", fontName=kr_font, fontSize=11, leading=15)
-
-    # 제목 섹션
-    y = _h2(c, y, "제목")
-    y = _paragraph(c, y, S["title"], width - MARGIN_X*2, pstyle)
-
-    # 평가 요약
-    y = _h2(c, y, "평가 요약 (STRATOS)")
-    y = _list(c, y, [str(f) for f in E["findings"]], width - MARGIN_X*2, pstyle)
-    if E["recommendations"]:
-        y = _paragraph(c, y, "<b>권장 사항</b>", width - MARGIN_X*2, pstyle)
-        y = _list(c, y, E["recommendations"], width - MARGIN_X*2, pstyle)
-    y -= 4  # 리스트와 다음 섹션 사이 살짝 더 띄움
-
-    # 목표
-    y = _h2(c, y, "목표 (Objectives)")
-    if S["objectives"]:
-        y = _list(c, y, S["objectives"], width - MARGIN_X*2, pstyle)
-    y -= 4
-
-    # 모듈 구성
-    y = _h2(c, y, "모듈 구성")
-    data = [["모듈", "역할", "선행모듈"]]
-    for m in S["modules"]:
-        data.append([m.get("name",""), m.get("role",""), m.get("deps","")])
-    y = _table(c, y, data, [110, 280, 110], kr_font)
-
-    # 실행 흐름
-    y = _h2(c, y, "실행 흐름 (Flow)")
-    flow_text = " → ".join(S["flow"]) if S["flow"] else ""
-    y = _paragraph(c, y, flow_text, width - MARGIN_X*2, pstyle)
+# ========= PDF (지연 로드) =========
+def export_pdf_report(strategy: Any, evaluation: Any, output_dir: str, open_file: bool=False, **kwargs) -> str:
+    """호환용 래퍼: reportlab 은 첫 PDF 요청 때 tools.export_pdf 에서 로드"""
+    return get_exporter("pdf")(strategy, evaluation, output_dir, open_file=open_file, **kwargs)
+
+# ========= Exporter 레지스트리 =========
+# format -> 함수 또는 "module:attr" (첫 사용 시 import 후 캐시)
+# 서드파티 포맷 등록 방법:
+#   1) 코드에서 register_exporter("docx", "mypkg.docx:export_docx_report")
+#   2) 패키지 entry point 그룹 "kai.exporters" (name=format, value="module:attr")
+#   3) 환경변수 KAI_EXPORTERS="docx=mypkg.docx:export_docx_report,csv=..."
+# 모든 exporter 는 (strategy, evaluation, output_dir, open_file=False, **kwargs) -> path 형식.
+_EXPORTERS: Dict[str, Any] = {
+    "md": export_markdown_report,
+    "html": export_html_report,
+    "pdf": "tools.export_pdf:export_pdf_report",
+}
+BUILTIN_FORMATS = ["md", "html", "pdf"]
+_PLUGINS_LOADED = False
+
+def register_exporter(name: str, target: Any) -> None:
+    """target: callable 또는 "module:attr" 문자열 (지연 로드)"""
+    if not (callable(target) or (isinstance(target, str) and ":" in target)):
+        raise ValueError(f"exporter target must be callable or 'module:attr': {target!r}")
+    _EXPORTERS[name] = target
+
+def _load_plugins() -> None:
+    global _PLUGINS_LOADED
+    if _PLUGINS_LOADED:
+        return
+    _PLUGINS_LOADED = True
+    for part in (os.environ.get("KAI_EXPORTERS") or "").split(","):
+        name, _, target = part.strip().partition("=")
+        if name and target:
+            _EXPORTERS.setdefault(name, target)
+    try:
+        from importlib.metadata import entry_points
+        for ep in entry_points(group="kai.exporters"):
+            _EXPORTERS.setdefault(ep.name, ep.value)
+    except Exception:
+        pass
 
-    # 리스크
-    if S["risks"]:
-        y = _h2(c, y, "주요 리스크")
-        y = _list(c, y, S["risks"], width - MARGIN_X*2, pstyle)
-        y -= 6  # 리스크와 메타 사이 간격 확장
-
-    # 메타
-    y = _h2(c, y, "메타")
-    meta_items = [
-        f"version: {meta.get('version','')}",
-        f"model: {meta.get('model','')}",
-        f"timestamp: {meta.get('timestamp','')}",
-    ]
-    y = _list(c, y, meta_items, width - MARGIN_X*2, pstyle)
-
-    c.showPage(); c.save()
-    if not quiet:
-        print(f"[export] PDF -> {path}")
-    if open_file:
-        webbrowser.open(f"file://{os.path.abspath(path)}")
-    return path
\ No newline at end of file
+def _resolve(target: str) -> Any:
+    import importlib
+    mod_name, _, attr = target.partition(":")
+    return getattr(importlib.import_module(mod_name), attr)
+
+def get_exporter(name: str):
+    if name not in _EXPORTERS:
+        _load_plugins()
+    target = _EXPORTERS.get(name)
+    if target is None:
+        raise KeyError(f"unknown export format: {name} (available: {', '.join(available_formats())})")
+    if isinstance(target, str):
+        target = _resolve(target)
+        _EXPORTERS[name] = target
+    return target
+
+def available_formats() -> List[str]:
+    _load_plugins()
+    return list(_EXPORTERS)
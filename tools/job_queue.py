@@ -0,0 +1,93 @@
+# tools/job_queue.py
+from __future__ import annotations
+import argparse, json, os, sys
+from multiprocessing import Process
+ROOT = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(ROOT)
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from core_engine.startup_profile import maybe_profile_startup
+maybe_profile_startup(__file__)  # --profile-startup
+
+from core_engine.job_queue import JobQueue, work_loop, DEFAULT_DB
+
+class _ExportChoices:
+    """--export choices = pipeline.export_choices(). status/work 의 시작 비용을 지키려고 파싱할 때만 import"""
+    def _load(self):
+        from core_engine.pipeline import export_choices
+        return export_choices()
+    def __contains__(self, value):
+        return value in self._load()
+    def __iter__(self):
+        return iter(self._load())
+
+def cmd_enqueue(args) -> None:
+    q = JobQueue(args.db, journal_mode=args.journal)
+    if args.batch:
+        from core_engine.batch_runner import load_batch_inputs
+        n = q.enqueue_many(load_batch_inputs(args.batch, args.domain), export=args.export,
+                           max_attempts=args.max_attempts)
+        print(f"[enqueue] {n} jobs -> {args.db}")
+    elif args.input:
+        job_id = q.enqueue(args.domain, args.input, args.export, max_attempts=args.max_attempts)
+        print(f"[enqueue] job {job_id} -> {args.db}")
+    else:
+        print("[err] --input 또는 --batch 가 필요합니다")
+        sys.exit(2)
+    q.close()
+
+def cmd_work(args) -> None:
+    kwargs = dict(journal_mode=args.journal, lease_s=args.lease, poll_s=args.poll,
+                  drain=args.drain, deadline_s=args.deadline, quiet=args.quiet)
+    if args.workers <= 1:
+        n = work_loop(str(args.db), **kwargs)
+        print(f"[work] processed {n} jobs")
+        return
+    procs = [Process(target=work_loop, args=(str(args.db),), kwargs=kwargs) for _ in range(args.workers)]
+    for p in procs:
+        p.start()
+    try:
+        for p in procs:
+            p.join()
+    except KeyboardInterrupt:
+        for p in procs:
+            p.terminate()
+
+def cmd_status(args) -> None:
+    q = JobQueue(args.db, journal_mode=args.journal)
+    print(json.dumps({"db": str(args.db), "counts": q.counts(), "failed": q.failed()}, ensure_ascii=False, indent=2))
+    q.close()
+
+def main():
+    ap = argparse.ArgumentParser(description="Durable SQLite job queue for Kai pipeline runs.")
+    ap.add_argument("--db", default=str(DEFAULT_DB), help="큐 DB 경로 (기본: output/_queue/jobs.sqlite3)")
+    ap.add_argument("--journal", default="WAL", choices=["WAL", "DELETE"],
+                    help="SQLite 저널 모드. 여러 호스트가 네트워크 파일시스템을 공유하면 DELETE")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+
+    e = sub.add_parser("enqueue", help="작업 추가")
+    e.add_argument("--domain", default="finsetreport")
+    e.add_argument("--input", help="사용자 입력 1건")
+    e.add_argument("--batch", help="JSONL 파일 또는 *.txt 디렉터리")
+    e.add_argument("--export", choices=_ExportChoices(), metavar="FORMAT", help="리포트 내보내기 형식 (md/html/pdf/all + 플러그인 포맷)")
+    e.add_argument("--max-attempts", type=int, default=3)
+    e.set_defaults(fn=cmd_enqueue)
+
+    w = sub.add_parser("work", help="워커 실행")
+    w.add_argument("--workers", type=int, default=1, help="워커 프로세스 수")
+    w.add_argument("--lease", type=float, default=300.0, help="작업 리스 시간(초)")
+    w.add_argument("--poll", type=float, default=1.0, help="빈 큐 폴링 간격(초)")
+    w.add_argument("--drain", action="store_true", help="큐가 비면 종료")
+    w.add_argument("--deadline", type=float, default=None, help="작업당 시간 예산(초)")
+    w.add_argument("--quiet", action="store_true")
+    w.set_defaults(fn=cmd_work)
+
+    s = sub.add_parser("status", help="상태별 작업 수")
+    s.set_defaults(fn=cmd_status)
+
+    args = ap.parse_args()
+    args.fn(args)
+
+if __name__ == "__main__":
+    main()
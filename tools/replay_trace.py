@@ -7,6 +7,9 @@ ROOT = os.path.dirname(ROOT)                                # <project root>
 if ROOT not in sys.path:
     sys.path.insert(0, ROOT)
 
+from core_engine.startup_profile import maybe_profile_startup
+maybe_profile_startup(__file__)  # --profile-startup
+
 TRACE_DIR = os.path.join("output", "_trace")
 
 def _latest_qmand_start():
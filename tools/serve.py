@@ -0,0 +1,30 @@
+# tools/serve.py
+import argparse, os, sys
+ROOT = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(ROOT)
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from core_engine.startup_profile import maybe_profile_startup
+maybe_profile_startup(__file__)  # --profile-startup
+
+from core_engine.admission import parse_limits, DEFAULT_MAX_WAIT
+from core_engine.service import serve
+
+def main():
+    ap = argparse.ArgumentParser(description="Kai resident pipeline service (warm config/fonts, config hot-reload).")
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=8765)
+    ap.add_argument("--unix", default=None, help="Unix 소켓 경로 (지정 시 TCP 대신 사용)")
+    ap.add_argument("--quiet", action="store_true", help="요청 로그 숨김")
+    ap.add_argument("--limits", default="", help="단계별 동시성:대기열 (예: run=4:16,export=2:8)")
+    ap.add_argument("--max-wait", type=float, default=DEFAULT_MAX_WAIT, help="대기열 최대 대기 시간(초)")
+    ap.add_argument("--pipeline", nargs="?", const="", default=None, metavar="SPEC",
+                    help="/run 을 공유 단계 파이프라인으로 처리. 단계별 워커:큐 (예: qgen=4:8,export=2:4)")
+    args = ap.parse_args()
+    pipeline = parse_limits(args.pipeline) if args.pipeline is not None else None
+    serve(args.host, args.port, unix_socket=args.unix, quiet=args.quiet,
+          limits=parse_limits(args.limits), max_wait=args.max_wait, pipeline=pipeline)
+
+if __name__ == "__main__":
+    main()
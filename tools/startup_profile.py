@@ -0,0 +1,60 @@
+# tools/startup_profile.py
+from __future__ import annotations
+import argparse, json, os, sys
+ROOT = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(ROOT)
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from core_engine.startup_profile import (
+    profile_script, format_report, check_budget, load_budget, BUDGET_PATH,
+)
+
+def run_check(budget_path: str, top: int, verbose: bool) -> int:
+    budget = load_budget(budget_path)
+    failures = []
+    for entry in budget["entries"]:
+        rep = profile_script(entry["script"], entry.get("args") or [])
+        errs = check_budget(rep, entry)
+        status = "OK" if not errs else "FAIL"
+        line = f"[{status}] {entry['name']}: imports={rep['import_ms']}ms (budget {entry.get('max_import_ms')})"
+        if entry.get("max_first_stage_ms") is not None:
+            line += f", first_stage={rep['first_stage_ms']}ms (budget {entry['max_first_stage_ms']})"
+        print(line)
+        if errs or verbose:
+            print(format_report(rep, top))
+        failures += errs
+    if failures:
+        print("\n=== Startup budget violations ===")
+        for e in failures:
+            print(f"- {e}")
+        return 1
+    print("\n[startup] all entries within budget ✅")
+    return 0
+
+def main():
+    ap = argparse.ArgumentParser(description="Profile CLI cold start (per-module import cost, time to first stage).")
+    ap.add_argument("script", nargs="?", help="프로파일할 스크립트 (예: run_kai.py)")
+    ap.add_argument("args", nargs=argparse.REMAINDER, help="스크립트 인자 (-- 뒤에)")
+    ap.add_argument("--check", action="store_true", help="tools/startup_budget.json 의 예산 검사 (위반 시 exit 1)")
+    ap.add_argument("--budget", default=str(BUDGET_PATH))
+    ap.add_argument("--top", type=int, default=20)
+    ap.add_argument("--json", action="store_true", help="리포트를 JSON 으로 출력")
+    ap.add_argument("--verbose", action="store_true")
+    args = ap.parse_args()
+
+    if args.check:
+        sys.exit(run_check(args.budget, args.top, args.verbose))
+    if not args.script:
+        ap.error("script 또는 --check 가 필요합니다")
+
+    argv = args.args[1:] if args.args[:1] == ["--"] else args.args
+    rep = profile_script(args.script, argv)
+    if args.json:
+        print(json.dumps(rep, ensure_ascii=False, indent=2))
+    else:
+        print(format_report(rep, args.top))
+    sys.exit(rep["returncode"])
+
+if __name__ == "__main__":
+    main()
@@ -1,15 +1,39 @@
-import os, sys
+import argparse, os, sys
 ROOT = os.path.dirname(os.path.abspath(__file__))
 ROOT = os.path.dirname(ROOT)
 if ROOT not in sys.path:
     sys.path.insert(0, ROOT)
 
-from schemas.domain_config import load_and_validate_config
+from core_engine.startup_profile import maybe_profile_startup
+maybe_profile_startup(__file__)  # --profile-startup
+
+from core_engine import config_cache, config_snapshot, domain_registry
 
 def main():
-    path = os.path.join("domains", "finsetreport", "config.yaml")
-    cfg = load_and_validate_config(path)
-    print("[OK] config validated:", cfg.domain_name)
+    ap = argparse.ArgumentParser(description="domains/*/config.yaml 검증 (DomainConfig)")
+    ap.add_argument("domains", nargs="*", help="검증할 도메인 (기본: 전체)")
+    ap.add_argument("--no-snapshot", action="store_true", help="검증만 하고 바이너리 스냅샷은 쓰지 않음")
+    args = ap.parse_args()
+
+    names = args.domains or config_cache.list_domains()
+    failed = 0
+    for d in names:
+        try:
+            st = domain_registry.get(d)
+        except FileNotFoundError:
+            print(f"[FAIL] {d}: config not found ({config_cache.config_path(d)})")
+            failed += 1
+            continue
+        except RuntimeError as e:
+            print(f"[FAIL] {e}")
+            failed += 1
+            continue
+        if args.no_snapshot:
+            print("[OK] config validated:", st.config.domain_name)
+            continue
+        snap = config_snapshot.compile_domain(d, config_cache.config_path(d))
+        print(f"[OK] config validated: {st.config.domain_name} -> {os.path.relpath(snap, ROOT)}")
+    sys.exit(1 if failed else 0)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
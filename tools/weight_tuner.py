@@ -3,10 +3,14 @@ from __future__ import annotations
 import argparse
 import json
 from pathlib import Path
-from datetime import datetime, timezone
+import sys
 import yaml
 
 ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from core_engine.config_store import save_domain_config, config_version_of
 FB_PATH = ROOT / "output" / "_feedback" / "feedback.jsonl"
 DOMAIN = "finsetreport"
 CFG_PATH = ROOT / "domains" / DOMAIN / "config.yaml"
@@ -63,13 +67,14 @@ def load_config() -> dict:
     with CFG_PATH.open("r", encoding="utf-8") as f:
         return yaml.safe_load(f)
 
-def save_config(cfg: dict):
-    CFG_HIST_DIR.mkdir(parents=True, exist_ok=True)
-    stamp = datetime.now(timezone.utc).strftime("%Y%m%d_%H%M%S")
-    backup = CFG_HIST_DIR / f"config_{stamp}.yaml"
-    backup.write_text(yaml.safe_dump(cfg, allow_unicode=True, sort_keys=False), encoding="utf-8")
-    CFG_PATH.write_text(yaml.safe_dump(cfg, allow_unicode=True, sort_keys=False), encoding="utf-8")
-    return backup
+def save_config(cfg: dict, expected_version: int | None = None) -> int:
+    """
+    config.yaml 을 원자적으로 교체 (임시 파일 + rename, config_version +1, 스냅샷 갱신).
+    실행 중인 파이프라인은 잠금 없이 이전 또는 새 버전 전체를 읽는다.
+    이력은 config_history (내용 주소 blob + index.jsonl) 에 남는다.
+    expected_version 을 주면 그 사이 다른 writer 가 썼을 때 ConfigConflict.
+    """
+    return save_domain_config(DOMAIN, cfg, expected_version=expected_version)
 
 def normalize(weights: dict[str, float]) -> dict[str, float]:
     total = sum(max(0.0, v) for v in weights.values()) or 1.0
@@ -119,8 +124,8 @@ def main():
         return
 
     cfg["stratos_weights"] = new_w
-    backup = save_config(cfg)
-    print(f"[ok] weights updated & backed up -> {backup.relative_to(ROOT)}")
+    version = save_config(cfg, expected_version=config_version_of(cfg))
+    print(f"[ok] weights updated (config_version={version}), history -> {CFG_HIST_DIR.relative_to(ROOT)}/index.jsonl")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file